@@ -0,0 +1,67 @@
+"""maintain_rating_aggregates
+
+Revision ID: b3ee7ca29200
+Revises: 8aa6c14e277c
+Create Date: 2026-10-17 09:12:41.318204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b3ee7ca29200"
+down_revision: Union[str, Sequence[str], None] = "8aa6c14e277c"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Backfill the aggregates that were never written before listings
+    # started reading them.
+    op.execute(
+        """
+        UPDATE movies
+        SET average_rating = stats.average_rating,
+            rating_count = stats.rating_count
+        FROM (
+            SELECT m.id,
+                   COALESCE(AVG(r.score), 0) AS average_rating,
+                   COUNT(r.id) AS rating_count
+            FROM movies m
+            LEFT JOIN ratings r ON r.movie_id = m.id
+            GROUP BY m.id
+        ) AS stats
+        WHERE movies.id = stats.id
+        """
+    )
+
+    # Keyset pagination orders by (sort column, id), so the rating index
+    # carries the tie-breaker too.
+    op.drop_index("ix_movies_rating", table_name="movies", if_exists=True)
+    op.create_index(
+        "ix_movies_rating",
+        "movies",
+        ["average_rating", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_movies_title_id",
+        "movies",
+        ["title", "id"],
+        unique=False,
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_movies_title_id", table_name="movies")
+    op.drop_index("ix_movies_rating", table_name="movies")
+    op.create_index(
+        "ix_movies_rating",
+        "movies",
+        ["average_rating"],
+        unique=False,
+    )
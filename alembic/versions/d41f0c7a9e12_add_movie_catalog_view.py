@@ -0,0 +1,59 @@
+"""add_movie_catalog_view
+
+Revision ID: d41f0c7a9e12
+Revises: b3ee7ca29200
+Create Date: 2026-10-17 15:04:27.551930
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d41f0c7a9e12"
+down_revision: Union[str, Sequence[str], None] = "b3ee7ca29200"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE MATERIALIZED VIEW movie_catalog AS
+        SELECT m.id,
+               m.title,
+               m.slug,
+               m.description,
+               m.release_year,
+               m.video_url,
+               m.thumbnail_url,
+               m.is_published,
+               m.average_rating,
+               m.rating_count,
+               m.updated_at,
+               COALESCE(
+                   jsonb_agg(
+                       jsonb_build_object('id', g.id, 'name', g.name, 'slug', g.slug)
+                       ORDER BY g.id
+                   ) FILTER (WHERE g.id IS NOT NULL),
+                   '[]'::jsonb
+               ) AS genres
+        FROM movies m
+        LEFT JOIN movie_genres mg ON mg.movie_id = m.id
+        LEFT JOIN genres g ON g.id = mg.genre_id
+        GROUP BY m.id
+        """
+    )
+    # REFRESH ... CONCURRENTLY needs a unique index; the others mirror the
+    # (sort column, id) keysets of get_all_movies.
+    op.execute("CREATE UNIQUE INDEX ix_movie_catalog_id ON movie_catalog (id)")
+    op.execute(
+        "CREATE INDEX ix_movie_catalog_rating ON movie_catalog (average_rating, id)"
+    )
+    op.execute("CREATE INDEX ix_movie_catalog_title ON movie_catalog (title, id)")
+
+
+def downgrade() -> None:
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS movie_catalog")
@@ -0,0 +1,44 @@
+"""add_trigram_search_indexes
+
+Revision ID: e7b2c95d1f34
+Revises: d41f0c7a9e12
+Create Date: 2026-10-17 18:22:41.208114
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e7b2c95d1f34"
+down_revision: Union[str, Sequence[str], None] = "d41f0c7a9e12"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Trigram indexes let the substring fallback of Postgres search
+    # (ILIKE '%...%') use an index. pg_trgm ships with contrib but isn't
+    # always installed; without it the fallback still works, unindexed.
+    op.execute(
+        """
+        DO $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm') THEN
+                CREATE EXTENSION IF NOT EXISTS pg_trgm;
+                CREATE INDEX IF NOT EXISTS ix_movies_title_trgm
+                    ON movies USING gin (title gin_trgm_ops);
+                CREATE INDEX IF NOT EXISTS ix_movies_description_trgm
+                    ON movies USING gin (description gin_trgm_ops);
+            END IF;
+        END
+        $$;
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_movies_description_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_movies_title_trgm")
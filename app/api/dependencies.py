@@ -1,4 +1,4 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
 from pydantic import ValidationError
@@ -10,6 +10,7 @@ from app.core.config import settings
 from app.db.session import AsyncSessionLocal
 from app.models.user import UserModel
 from app.models.rbac import RoleModel
+from app.schemas.movie import MOVIE_FIELDS, MovieFilters
 from app.schemas.token import TokenPayload
 
 oauth2_scheme = OAuth2PasswordBearer(
@@ -26,6 +27,48 @@ async def get_db():
         yield db
 
 
+def get_movie_fields(
+    fields: str = Query(
+        None,
+        description="Comma-separated MovieResponse fields to return, "
+        "e.g. id,title,thumbnail_url,average_rating. `id` is always included.",
+    ),
+) -> frozenset[str] | None:
+    """
+    Parses a sparse fieldset. None means the full MovieResponse.
+    """
+    if not fields:
+        return None
+
+    requested = frozenset(name.strip() for name in fields.split(",") if name.strip())
+    unknown = requested - MOVIE_FIELDS
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}",
+        )
+    return requested | {"id"}
+
+
+def get_movie_filters(
+    genre: list[str] = Query(
+        None, description="Genre name to filter by; repeat for any of several."
+    ),
+    year_from: int = Query(None, ge=1888, le=2100),
+    year_to: int = Query(None, ge=1888, le=2100),
+) -> MovieFilters:
+    """
+    Parses the facet filters of a movie listing.
+    """
+    if year_from is not None and year_to is not None and year_from > year_to:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="year_from must not be after year_to",
+        )
+    genres = tuple(sorted({name.strip() for name in genre or () if name.strip()}))
+    return MovieFilters(genres=genres, year_from=year_from, year_to=year_to)
+
+
 async def get_current_user(
     db: AsyncSession = Depends(get_db), token: str = Depends(oauth2_scheme)
 ) -> UserModel:
@@ -1,11 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from slugify import slugify
 
+from app.core.cache import GENRES, bump_generations
 from app.models.movie import Genre
 from app.schemas.movie import GenreCreate, GenreResponse
 from app.api.dependencies import get_db, get_current_admin
+from app.services.genre_service import GENRES_CACHE_CONTROL, list_genres_service
 
 router = APIRouter()
 
@@ -26,12 +28,16 @@ async def create_genre(
     db.add(new_genre)
     await db.commit()
     await db.refresh(new_genre)
+    await bump_generations(GENRES)
     return new_genre
 
 
 @router.get("/", response_model=list[GenreResponse])
 async def list_genres(
-    skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_db)
+    request: Request,
+    skip: int = 0,
+    limit: int = 100,
+    db: AsyncSession = Depends(get_db),
 ):
-    result = await db.execute(select(Genre).offset(skip).limit(limit))
-    return result.scalars().all()
+    cached = await list_genres_service(db, skip, limit)
+    return cached.to_response(request, cache_control=GENRES_CACHE_CONTROL)
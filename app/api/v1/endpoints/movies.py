@@ -1,4 +1,3 @@
-import json
 from slugify import slugify
 from typing import Literal, List
 from fastapi import (
@@ -8,8 +7,9 @@ from fastapi import (
     Query,
     HTTPException,
     Request,
-    BackgroundTasks,
+    Response,
 )
+from fastapi.responses import ORJSONResponse
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -18,30 +18,46 @@ from sqlalchemy.orm import selectinload
 from app.api.dependencies import (
     get_db,
     get_current_active_user,
+    get_movie_fields,
+    get_movie_filters,
     PermissionChecker,
 )
 from app.core.limiter import limiter
-from app.core.redis import get_redis_client
 from app.models.user import UserModel
 from app.models.movie import Movie, Genre, CompareRequest
 from app.repositories.movie_repository import MovieRepository
-from app.schemas.movie import MovieResponse, MovieCreate, MovieUpdate
+from app.schemas.movie import (
+    MovieResponse,
+    MovieCreate,
+    MovieFilters,
+    MoviePage,
+    MovieSuggestion,
+    MovieUpdate,
+)
 from app.services.movie_service import (
+    CATALOG_CACHE_CONTROL,
+    TRENDING_CACHE_CONTROL,
     get_all_movies_service,
+    get_movie_detail_service,
+    get_similar_movies_service,
+    get_trending_movies_service,
+    after_movie_removal,
+    after_movie_write,
     rate_movie_service,
+    delete_rating_service,
     # get_recommendations_service,
 )
-from app.schemas.common import PageResponse
 from app.schemas.rating import RatingResponse, RatingCreate
 from app.services.ai_service import AIService
-from app.services.search_service import index_movie, remove_movie_from_index
+from app.services.autocomplete_service import autocomplete_service
+from app.services.hybrid_search_service import hybrid_search_service
 from app.services.watchlist_service import toggle_watchlist_service
 from app.tasks.notification_tasks import broadcast_notification_task
 
 router = APIRouter()
 
 
-@router.get("/", response_model=PageResponse[MovieResponse])
+@router.get("/", response_model=MoviePage[MovieResponse])
 @limiter.limit("10/minute")
 async def read_movies(
     request: Request,
@@ -52,48 +68,53 @@ async def read_movies(
     order: Literal["asc", "desc"] = "desc",
     min_rating: float = Query(None, ge=0, le=10),
     search_query: str = Query(None),
+    cursor: str = Query(
+        None,
+        description="Opaque next_cursor/prev_cursor from a previous page. "
+        "When set, `page` is ignored and the page is fetched by keyset.",
+    ),
+    include_total: bool = Query(
+        True, description="Set to false to skip counting; total/pages are null."
+    ),
+    include_facets: bool = Query(
+        False,
+        description="Add genre/year counts and the rating range of the "
+        "matching movies (`facets`), for a filter sidebar.",
+    ),
+    fields: frozenset[str] | None = Depends(get_movie_fields),
+    filters: MovieFilters = Depends(get_movie_filters),
 ):
-    return await get_all_movies_service(
-        db, page, size, search_query, sort_by, order, min_rating
+    cached = await get_all_movies_service(
+        db,
+        page,
+        size,
+        search_query,
+        sort_by,
+        order,
+        min_rating,
+        cursor,
+        include_total,
+        fields,
+        filters,
+        include_facets,
     )
+    return cached.to_response(request, cache_control=CATALOG_CACHE_CONTROL)
 
 
 @router.get("/trending", response_model=list[MovieResponse])
 @limiter.limit("5/minute")
-async def get_trending_movies(request: Request, db: AsyncSession = Depends(get_db)):
+async def get_trending_movies(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    fields: frozenset[str] | None = Depends(get_movie_fields),
+):
     """
-    Fetches the Top 5 Trending movies from the Redis Cache.
-    If cache is empty (e.g. first run), falls back to DB or returns empty.
+    Fetches the Top 5 Trending movies picked by the Celery trending job.
+    Served from the two-tier cache; empty until the job has run once.
     Rate Limit: 5 per minute per IP.
     """
-    redis = get_redis_client()
-    cached_data = await redis.get("trending_movies")
-
-    movie_ids = []
-
-    if cached_data:
-        data = json.loads(cached_data)
-        movie_ids = data.get("movie_ids", [])
-        print(f"⚡ Cache Hit! Serving IDs: {movie_ids}")
-    else:
-        print("⚠️ Cache Miss! (Worker hasn't run yet)")
-        return []
-
-    if movie_ids:
-        stmt = (
-            select(Movie)
-            .options(selectinload(Movie.genres))
-            .where(Movie.id.in_(movie_ids))
-        )
-        result = await db.execute(stmt)
-        movies = result.scalars().all()
-
-        movies_map = {m.id: m for m in movies}
-        ordered_movies = [movies_map[mid] for mid in movie_ids if mid in movies_map]
-
-        return ordered_movies
-
-    return []
+    cached = await get_trending_movies_service(db, fields)
+    return cached.to_response(request, cache_control=TRENDING_CACHE_CONTROL)
 
 
 @router.get("/semantic_search", response_model=list[MovieResponse])
@@ -108,6 +129,34 @@ async def semantic_search(
     return await repo.search_semantic(query, limit)
 
 
+@router.get("/search/hybrid", response_model=list[MovieResponse])
+async def hybrid_search(
+    query: str,
+    limit: int = Query(10, ge=1, le=50),
+    lexical_weight: float = Query(1.0, ge=0),
+    semantic_weight: float = Query(1.0, ge=0),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    🔀 Keyword and meaning-based search, fused.
+    Results found by both retrievers rank highest; the weights tilt the
+    blend towards exact keywords or towards semantic matches.
+    """
+    body = await hybrid_search_service(
+        db, query, limit, lexical_weight, semantic_weight
+    )
+    return Response(content=body, media_type="application/json")
+
+
+@router.get("/autocomplete", response_model=list[MovieSuggestion])
+async def autocomplete_movies(
+    prefix: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(8, ge=1, le=20),
+    db: AsyncSession = Depends(get_db),
+):
+    return ORJSONResponse(await autocomplete_service(db, prefix, limit))
+
+
 @router.post("/chat")
 async def chat_with_movies(question: str, db: AsyncSession = Depends(get_db)):
     """
@@ -150,13 +199,14 @@ async def compare_vectors(payload: CompareRequest):
 
 
 @router.get("/{movie_id}", response_model=MovieResponse)
-async def read_movie(movie_id: int, db: AsyncSession = Depends(get_db)):
-    stmt = select(Movie).options(selectinload(Movie.genres)).where(Movie.id == movie_id)
-    result = await db.execute(stmt)
-    movie = result.scalars().first()
-    if not movie:
-        raise HTTPException(status_code=404, detail="Movie not found")
-    return movie
+async def read_movie(
+    movie_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    fields: frozenset[str] | None = Depends(get_movie_fields),
+):
+    cached = await get_movie_detail_service(db, movie_id, fields)
+    return cached.to_response(request, cache_control=CATALOG_CACHE_CONTROL)
 
 
 @router.post(
@@ -167,7 +217,6 @@ async def read_movie(movie_id: int, db: AsyncSession = Depends(get_db)):
 )
 async def create_movie(
     movie_in: MovieCreate,
-    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
     current_user: UserModel = Depends(get_current_active_user),
 ):
@@ -202,7 +251,12 @@ async def create_movie(
     )
     result = await db.execute(stmt)
     fresh_movie = result.scalars().first()
-    background_tasks.add_task(index_movie, fresh_movie)
+    await after_movie_write(
+        fresh_movie.id,
+        fresh_movie.average_rating,
+        fresh_movie.title,
+        title_changed=True,
+    )
     broadcast_notification_task.delay(f"🎬 New Release: {fresh_movie.title}")
     return fresh_movie
 
@@ -215,7 +269,6 @@ async def create_movie(
 async def update_movie(
     movie_id: int,
     movie_in: MovieUpdate,
-    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
     current_user: UserModel = Depends(get_current_active_user),
 ):
@@ -240,7 +293,12 @@ async def update_movie(
 
     await db.commit()
     await db.refresh(movie)
-    background_tasks.add_task(index_movie, movie)
+    await after_movie_write(
+        movie_id,
+        movie.average_rating,
+        movie.title,
+        title_changed="title" in update_data,
+    )
     return movie
 
 
@@ -251,7 +309,6 @@ async def update_movie(
 )
 async def delete_movie(
     movie_id: int,
-    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
     current_user: UserModel = Depends(get_current_active_user),
 ):
@@ -264,7 +321,7 @@ async def delete_movie(
 
     await db.delete(movie)
     await db.commit()
-    background_tasks.add_task(remove_movie_from_index, movie_id)
+    await after_movie_removal(movie_id)
     return None
 
 
@@ -278,6 +335,16 @@ async def rate_movie(
     return await rate_movie_service(movie_id, rating_data, current_user.id, db)
 
 
+@router.delete("/{movie_id}/rate", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_rating(
+    movie_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserModel = Depends(get_current_active_user),
+):
+    await delete_rating_service(movie_id, current_user.id, db)
+    return None
+
+
 @router.post("/{movie_id}/watchlist")
 async def toggle_watchlist(
     movie_id: int,
@@ -303,10 +370,5 @@ async def recommend_movies(
     🍿 "More Like This"
     Returns movies semantically similar to the given movie_id.
     """
-    repo = MovieRepository(db)
-    recommendations = await repo.get_similar_movies(movie_id, limit)
-
-    if not recommendations:
-        return []
-
-    return recommendations
+    body = await get_similar_movies_service(movie_id, limit, db)
+    return Response(content=body, media_type="application/json")
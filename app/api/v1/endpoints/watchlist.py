@@ -1,7 +1,7 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-from app.api.dependencies import get_db, get_current_user
+from app.api.dependencies import get_db, get_current_user, get_movie_fields
 from app.models.user import UserModel
 from app.schemas.movie import MovieResponse
 from app.services.watchlist_service import get_user_watchlist_service
@@ -15,8 +15,10 @@ async def read_watchlist(
     size: int = Query(10, ge=1, le=100),
     db: AsyncSession = Depends(get_db),
     current_user: UserModel = Depends(get_current_user),
+    fields: frozenset[str] | None = Depends(get_movie_fields),
 ):
     """
     Get the current user's watchlist.
     """
-    return await get_user_watchlist_service(current_user.id, page, size, db)
+    body = await get_user_watchlist_service(current_user.id, page, size, db, fields)
+    return Response(content=body, media_type="application/json")
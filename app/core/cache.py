@@ -0,0 +1,626 @@
+import asyncio
+import hashlib
+import math
+import random
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from email.utils import formatdate, parsedate_to_datetime
+from functools import cached_property
+
+import brotli
+import msgpack
+import orjson
+from fastapi import Request, Response
+from prometheus_client import Counter
+
+from app.core.config import settings
+from app.core.middleware import negotiate_encoding, weak_etag
+from app.core.redis import get_redis_binary_client, get_redis_client
+from app.db.session import AsyncSessionLocal
+
+GENERATION_PREFIX = "movies:gen:"
+INVALIDATION_CHANNEL = "cache-invalidation"
+
+# Cache namespaces. Every cached entry folds the generation counters of the
+# namespaces it depends on into its key; bumping a counter makes those keys
+# unreachable and the old entries simply age out via their TTL.
+CATALOG = "catalog"  # any movie create/update/delete
+RATING_SORT = "sort:rating"  # pages ordered by rating
+MIN_RATING_FILTER = "filter:min_rating"  # pages/counts filtered by rating
+TRENDING = "trending"  # refreshed by the Celery trending job
+GENRES = "genres"  # genre list
+SEARCH = "search"  # search result IDs; bumped by search index writes
+
+# A rating write only reorders rating-sorted pages and changes which
+# movies pass a min_rating filter; title/id pages keep their entries.
+RATING_NAMESPACES = (RATING_SORT, MIN_RATING_FILTER)
+
+
+CACHE_REQUESTS = Counter(
+    "fastflix_cache_requests_total",
+    "Cache lookups by tier (local, redis) and result (hit, stale, miss).",
+    ["tier", "result"],
+)
+
+
+# ---------------- IN-PROCESS TIER ----------------
+
+_MISSING = object()
+
+
+class LocalCache:
+    """
+    Per-worker LRU with a TTL per entry. Sits in front of Redis so hot keys
+    cost a dict lookup instead of a network round trip. Not shared between
+    Gunicorn workers; see `subscribe_to_cache_invalidations`.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, object]] = OrderedDict()
+
+    def get(self, key: str):
+        entry = self._entries.get(key)
+        if entry is None:
+            return _MISSING
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return _MISSING
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value, ttl: float = None) -> None:
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            return
+
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+local_cache = LocalCache(settings.LOCAL_CACHE_MAXSIZE, settings.LOCAL_CACHE_TTL)
+local_generations = LocalCache(256, settings.LOCAL_CACHE_TTL)
+
+
+def listing_namespaces(sort_by: str = None, min_rating: float = None) -> list[str]:
+    """
+    Namespaces a movie listing (or its count) depends on.
+    """
+    namespaces = [CATALOG]
+    if sort_by:
+        namespaces.append(f"sort:{sort_by}")
+    if min_rating is not None:
+        namespaces.append(MIN_RATING_FILTER)
+    return namespaces
+
+
+async def get_generation(redis, namespaces: list[str]) -> str:
+    """
+    Reads the current generation of each namespace. Generations known to
+    this worker come from the local tier; the rest are fetched in one MGET.
+    """
+    values = [local_generations.get(ns) for ns in namespaces]
+    missing = [ns for ns, value in zip(namespaces, values) if value is _MISSING]
+
+    if missing:
+        fetched = await redis.mget([GENERATION_PREFIX + ns for ns in missing])
+        fetched = dict(zip(missing, (value or "0" for value in fetched)))
+        for namespace, value in fetched.items():
+            local_generations.set(namespace, value)
+        values = [
+            fetched[ns] if value is _MISSING else value
+            for ns, value in zip(namespaces, values)
+        ]
+
+    return ".".join(values)
+
+
+async def versioned_key(redis, prefix: str, namespaces: list[str], *parts) -> str:
+    """
+    Builds a cache key that is only valid for the current generation
+    of `namespaces`, e.g. movies:list:4.0.2:1:10:...
+    """
+    generation = await get_generation(redis, namespaces)
+    return ":".join([prefix, generation, *(str(part) for part in parts)])
+
+
+def fallback_key(prefix: str, *parts) -> str:
+    """
+    Generation-less twin of a versioned key. It keeps the last good value
+    across invalidations so it can be served if recomputing fails.
+    """
+    return ":".join([prefix, "last", *(str(part) for part in parts)])
+
+
+async def bump_generations(*namespaces: str) -> None:
+    """
+    Invalidates every entry in the given namespaces with one INCR each,
+    sent as a single pipeline round trip. Other workers are told to drop
+    their local copy of these generations via Pub/Sub.
+    """
+    async with get_redis_client() as redis:
+        async with redis.pipeline(transaction=False) as pipe:
+            for namespace in namespaces:
+                pipe.incr(GENERATION_PREFIX + namespace)
+            pipe.publish(
+                INVALIDATION_CHANNEL, orjson.dumps({"namespaces": list(namespaces)})
+            )
+            await pipe.execute()
+
+    local_generations.delete(*namespaces)
+
+
+async def invalidate_keys(*keys: str) -> None:
+    """
+    Drops individual entries (e.g. one movie) everywhere: Redis, this
+    worker's local tier and, via Pub/Sub, every other worker's local tier.
+    Use it for entities; use `bump_generations` for anything derived from
+    many rows.
+    """
+    async with get_redis_client() as redis:
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.delete(*keys)
+            pipe.publish(INVALIDATION_CHANNEL, orjson.dumps({"keys": list(keys)}))
+            await pipe.execute()
+
+    local_cache.delete(*keys)
+
+
+async def subscribe_to_cache_invalidations():
+    """
+    Background Task:
+    Listens to the Redis 'cache-invalidation' channel and drops the named
+    generations and keys from this worker's local tier, so a write handled
+    by one Gunicorn worker (or a Celery job) is seen by all of them.
+    """
+    redis = get_redis_client()
+    pubsub = redis.pubsub()
+    await pubsub.subscribe(INVALIDATION_CHANNEL)
+
+    # Anything cached before we were listening may have missed a message.
+    local_generations.clear()
+    local_cache.clear()
+    print("🎧 Cache Invalidation Listener Started")
+
+    try:
+        async for message in pubsub.listen():
+            if message["type"] != "message":
+                continue
+
+            try:
+                data = orjson.loads(message["data"])
+                local_generations.delete(*data.get("namespaces", []))
+                local_cache.delete(*data.get("keys", []))
+            except Exception as e:
+                print(f"⚠️ Cache invalidation message error: {e}")
+
+    except asyncio.CancelledError:
+        print("🛑 Cache Invalidation Listener Stopping...")
+    finally:
+        await pubsub.unsubscribe(INVALIDATION_CHANNEL)
+        await pubsub.close()
+        await redis.close()
+
+
+# ---------------- READ-THROUGH WITH STAMPEDE PROTECTION ----------------
+
+LOCK_TTL_MS = 10_000
+LOCK_WAIT_SECONDS = 2.0
+LOCK_POLL_SECONDS = 0.05
+STALE_TTL = 300
+XFETCH_BETA = 1.0
+
+# Bodies above this size are stored Brotli-compressed. Quality 5 keeps
+# compression cheap on the miss path while still shrinking JSON ~5-8x.
+COMPRESS_MIN_BYTES = 4096
+BROTLI_QUALITY = 5
+
+_RELEASE_LOCK = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+# Strong references so refresh tasks aren't garbage-collected mid-flight.
+_background_refreshes: set[asyncio.Task] = set()
+
+
+@dataclass(frozen=True)
+class CachedBody:
+    """
+    A fully encoded response body as stored in the cache.
+    `content` is Brotli-compressed when `encoding` is "br".
+    `etag` is a strong validator of the uncompressed body and
+    `last_modified` a Unix time: the `updated_at` of the data when the
+    loader supplied one, otherwise when this exact body was first built.
+    """
+
+    content: bytes
+    encoding: str | None
+    etag: str
+    last_modified: float
+
+    @cached_property
+    def body(self) -> bytes:
+        if self.encoding == "br":
+            return brotli.decompress(self.content)
+        return self.content
+
+    def derive(self, body: bytes) -> "CachedBody":
+        """
+        A variant of this body (e.g. a sparse fieldset of it) with its own
+        strong ETag and the same Last-Modified.
+        """
+        return CachedBody(body, None, _etag(body), self.last_modified)
+
+    def not_modified(self, request: Request) -> bool:
+        """
+        Evaluates the request's conditional headers against this body.
+        If-None-Match wins over If-Modified-Since, as in RFC 9110.
+        """
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+            return "*" in tags or self.etag in tags
+
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since:
+            try:
+                since = parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return int(self.last_modified) <= since
+
+        return False
+
+    def to_response(
+        self,
+        request: Request = None,
+        media_type: str = "application/json",
+        cache_control: str = None,
+    ) -> Response:
+        """
+        Returns the bytes as they are: no model construction, no validation
+        and no re-serialization on the hit path. A request whose validators
+        still match gets an empty 304 instead.
+
+        Brotli-stored bodies go out still compressed to clients that accept
+        br, so `CompressionMiddleware` never recompresses a cache hit.
+        """
+        headers = {
+            "ETag": self.etag,
+            "Last-Modified": formatdate(self.last_modified, usegmt=True),
+        }
+        if cache_control:
+            headers["Cache-Control"] = cache_control
+
+        if request is None:
+            return Response(content=self.body, media_type=media_type, headers=headers)
+        if self.not_modified(request):
+            return Response(status_code=304, headers=headers)
+
+        accepted = negotiate_encoding(request.headers.get("accept-encoding"))
+        if self.encoding is not None and accepted == self.encoding:
+            headers["ETag"] = weak_etag(self.etag)
+            headers["Content-Encoding"] = self.encoding
+            headers["Vary"] = "Accept-Encoding"
+            return Response(
+                content=self.content, media_type=media_type, headers=headers
+            )
+        return Response(content=self.body, media_type=media_type, headers=headers)
+
+
+def _etag(body: bytes) -> str:
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def _split_loaded(loaded) -> tuple[bytes | None, float | None]:
+    """Loaders return a body, or (body, last-modified Unix time)."""
+    if isinstance(loaded, tuple):
+        return loaded
+    return loaded, None
+
+
+async def _previous_last_modified(redis, keys: list[str], etag: str) -> float | None:
+    """
+    Last-Modified of an earlier entry holding this exact body, so a rebuild
+    that produces the same bytes (TTL expiry, generation bump) keeps it and
+    If-Modified-Since revalidation keeps answering 304.
+    """
+    for raw in await redis.mget(keys):
+        if raw:
+            _, cached = _unpack(raw)
+            if cached is not None and cached.etag == etag:
+                return cached.last_modified
+    return None
+
+
+def _pack(
+    body: bytes | None, ttl: int, delta: float, last_modified: float | None = None
+) -> tuple[bytes, CachedBody | None]:
+    if body is None:
+        envelope = msgpack.packb({"c": None, "exp": time.time() + ttl, "d": delta})
+        return envelope, None
+
+    etag, built_at = _etag(body), time.time()
+    if last_modified is None:
+        last_modified = built_at
+
+    encoding = None
+    if len(body) >= COMPRESS_MIN_BYTES:
+        body, encoding = brotli.compress(body, quality=BROTLI_QUALITY), "br"
+
+    envelope = msgpack.packb(
+        {
+            "c": body,
+            "e": encoding,
+            "t": etag,
+            "m": last_modified,
+            "exp": built_at + ttl,
+            "d": delta,
+        },
+        use_bin_type=True,
+    )
+    return envelope, CachedBody(body, encoding, etag, last_modified)
+
+
+def _unpack(raw: bytes) -> tuple[dict, CachedBody | None]:
+    entry = msgpack.unpackb(raw, raw=False)
+    if entry["c"] is None:
+        return entry, None
+    return entry, CachedBody(entry["c"], entry["e"], entry["t"], entry["m"])
+
+
+def _should_refresh(entry: dict, now: float, beta: float) -> bool:
+    """
+    Probabilistic early expiration (XFetch): the closer an entry is to its
+    expiry and the longer it took to compute, the likelier one request
+    refreshes it early, so expiries don't line up into a stampede.
+    """
+    # 1 - random() is in (0, 1]: random() itself can return 0.0, and log(0)
+    # would turn a cache hit into an error.
+    gap = entry["d"] * beta * math.log(1.0 - random.random())
+    return now - gap >= entry["exp"]
+
+
+async def _acquire_lock(redis, key: str) -> str | None:
+    token = uuid.uuid4().hex
+    if await redis.set(f"lock:{key}", token, nx=True, px=LOCK_TTL_MS):
+        return token
+    return None
+
+
+async def _release_lock(redis, key: str, token: str) -> None:
+    await redis.eval(_RELEASE_LOCK, 1, f"lock:{key}", token)
+
+
+async def _load_and_store(
+    redis,
+    key: str,
+    loader,
+    db,
+    ttl: int,
+    fallback_key: str | None,
+    negative_ttl: int | None,
+) -> CachedBody | None:
+    started = time.monotonic()
+    body, last_modified = _split_loaded(await loader(db))
+    delta = time.monotonic() - started
+
+    if body is None:
+        # Cached absence: short-lived, no stale window, no fallback copy.
+        if negative_ttl:
+            envelope, _ = _pack(None, negative_ttl, delta)
+            await redis.set(key, envelope, ex=negative_ttl)
+            local_cache.set(key, None, ttl=negative_ttl)
+        return None
+
+    if last_modified is None:
+        last_modified = await _previous_last_modified(
+            redis, [key, fallback_key] if fallback_key else [key], _etag(body)
+        )
+    envelope, cached = _pack(body, ttl, delta, last_modified)
+    async with redis.pipeline(transaction=False) as pipe:
+        pipe.set(key, envelope, ex=ttl + STALE_TTL)
+        if fallback_key:
+            pipe.set(fallback_key, envelope, ex=ttl + STALE_TTL)
+        await pipe.execute()
+
+    local_cache.set(key, cached, ttl=ttl)
+    return cached
+
+
+async def _refresh_in_background(
+    key: str,
+    loader,
+    ttl: int,
+    fallback_key: str | None,
+    negative_ttl: int | None,
+    token: str,
+) -> None:
+    """
+    Recomputes an entry with its own DB session (the request's session is
+    gone by the time this runs). Failures keep the stale entry in place.
+    """
+    async with get_redis_binary_client() as redis:
+        try:
+            async with AsyncSessionLocal() as db:
+                await _load_and_store(
+                    redis, key, loader, db, ttl, fallback_key, negative_ttl
+                )
+        except Exception as e:
+            print(f"⚠️ Background refresh failed for {key}, keeping stale: {e}")
+        finally:
+            await _release_lock(redis, key, token)
+
+
+def _spawn_refresh(*args) -> None:
+    task = asyncio.create_task(_refresh_in_background(*args))
+    _background_refreshes.add(task)
+    task.add_done_callback(_background_refreshes.discard)
+
+
+async def get_or_load(
+    key: str,
+    loader,
+    db,
+    ttl: int,
+    fallback_key: str | None = None,
+    beta: float = XFETCH_BETA,
+    negative_ttl: int | None = None,
+) -> CachedBody | None:
+    """
+    Two-tier read-through cache for encoded response bodies: the worker's
+    LocalCache first, then Redis, then `loader(db)`, which must return the
+    final response bytes, or (bytes, last-modified Unix time) when the data
+    has an `updated_at` to serve as Last-Modified.
+
+    - Fresh hit: returned as is.
+    - Stale (or picked for early refresh): the cached body is served
+      immediately and ONE request per key recomputes it in the background
+      (stale-while-revalidate).
+    - Miss: one request per key holds a Redis lock and runs `loader(db)`;
+      concurrent requests wait briefly for its result instead of all
+      hitting Postgres at once (single-flight).
+    - Loader error: the last good body (same key, or `fallback_key`,
+      which survives generation bumps) is served instead of a 500
+      (stale-if-error).
+    - Loader returns None (nothing exists): with `negative_ttl` set, that
+      answer is cached for `negative_ttl` seconds and None is returned, so
+      lookups of unknown ids don't all reach the database.
+    """
+    cached = local_cache.get(key)
+    if cached is not _MISSING:
+        CACHE_REQUESTS.labels("local", "hit").inc()
+        return cached
+    CACHE_REQUESTS.labels("local", "miss").inc()
+
+    async with get_redis_binary_client() as redis:
+        raw = await redis.get(key)
+        if raw:
+            entry, cached = _unpack(raw)
+            if _should_refresh(entry, time.time(), beta):
+                CACHE_REQUESTS.labels("redis", "stale").inc()
+                token = await _acquire_lock(redis, key)
+                if token:
+                    _spawn_refresh(key, loader, ttl, fallback_key, negative_ttl, token)
+            else:
+                CACHE_REQUESTS.labels("redis", "hit").inc()
+                local_cache.set(key, cached, ttl=entry["exp"] - time.time())
+            return cached
+        CACHE_REQUESTS.labels("redis", "miss").inc()
+
+        token = await _acquire_lock(redis, key)
+        if not token:
+            deadline = time.monotonic() + LOCK_WAIT_SECONDS
+            while time.monotonic() < deadline:
+                await asyncio.sleep(LOCK_POLL_SECONDS)
+                raw = await redis.get(key)
+                if raw:
+                    return _unpack(raw)[1]
+
+        try:
+            return await _load_and_store(
+                redis, key, loader, db, ttl, fallback_key, negative_ttl
+            )
+        except Exception:
+            stale = await redis.get(fallback_key) if fallback_key else None
+            if stale:
+                print(f"⚠️ Serving stale {fallback_key} after load failure")
+                return _unpack(stale)[1]
+            raise
+        finally:
+            if token:
+                await _release_lock(redis, key, token)
+
+
+async def prime(key: str, loader, db, ttl: int) -> CachedBody | None:
+    """
+    Runs `loader(db)` and stores the result under `key` whether or not a
+    fresh entry exists. For warmers that run outside the request path.
+    """
+    async with get_redis_binary_client() as redis:
+        return await _load_and_store(redis, key, loader, db, ttl, None, None)
+
+
+async def get_many_or_load(
+    keys: list[str],
+    loader,
+    db,
+    ttl: int,
+    negative_ttl: int | None = None,
+) -> list[CachedBody | None]:
+    """
+    Batched read-through for entity keys, in the order given: the local
+    tier first, then ONE Redis MGET for the rest, then ONE
+    `loader(db, missing_keys)` call for whatever is still missing. The
+    loader returns {key: body bytes or (bytes, last-modified)}; keys it
+    leaves out don't exist and
+    are cached as missing when `negative_ttl` is set. Loaded bodies are
+    written back in a single pipeline.
+
+    Stale entries count as misses here: a batch is reloaded with one query
+    anyway, so there is no stampede to protect against.
+    """
+    found: dict[str, CachedBody | None] = {}
+    for key in keys:
+        cached = local_cache.get(key)
+        if cached is not _MISSING:
+            found[key] = cached
+    CACHE_REQUESTS.labels("local", "hit").inc(len(found))
+
+    remote = [key for key in dict.fromkeys(keys) if key not in found]
+    CACHE_REQUESTS.labels("local", "miss").inc(len(remote))
+    if not remote:
+        return [found[key] for key in keys]
+
+    async with get_redis_binary_client() as redis:
+        now = time.time()
+        missing = []
+        for key, raw in zip(remote, await redis.mget(remote)):
+            entry, cached = _unpack(raw) if raw else (None, None)
+            if entry is None or entry["exp"] <= now:
+                missing.append(key)
+                continue
+            found[key] = cached
+            local_cache.set(key, cached, ttl=entry["exp"] - now)
+        CACHE_REQUESTS.labels("redis", "hit").inc(len(remote) - len(missing))
+        CACHE_REQUESTS.labels("redis", "miss").inc(len(missing))
+
+        if missing:
+            started = time.monotonic()
+            bodies = await loader(db, missing)
+            delta = time.monotonic() - started
+
+            async with redis.pipeline(transaction=False) as pipe:
+                for key in missing:
+                    body, last_modified = _split_loaded(bodies.get(key))
+                    if body is None and not negative_ttl:
+                        found[key] = None
+                        continue
+
+                    entry_ttl = ttl if body is not None else negative_ttl
+                    envelope, cached = _pack(body, entry_ttl, delta, last_modified)
+                    stale_ttl = STALE_TTL if body is not None else 0
+                    pipe.set(key, envelope, ex=entry_ttl + stale_ttl)
+                    local_cache.set(key, cached, ttl=entry_ttl)
+                    found[key] = cached
+                await pipe.execute()
+
+    return [found[key] for key in keys]
@@ -26,5 +26,29 @@ celery_app.conf.beat_schedule = {
         "task": "refresh_trending_cache",
         "schedule": crontab(day_of_week=1, hour=0, minute=0),
     },
+    "reconcile-rating-aggregates-nightly": {
+        "task": "reconcile_rating_aggregates",
+        "schedule": crontab(hour=3, minute=0),
+    },
+    "refresh-movie-catalog-every-minute": {
+        "task": "refresh_movie_catalog",
+        "schedule": crontab(minute="*"),
+    },
+    "rebuild-ordering-indexes": {
+        "task": "rebuild_ordering_indexes",
+        "schedule": crontab(minute="*/10"),
+    },
+    "flush-search-index-every-minute": {
+        "task": "flush_search_index",
+        "schedule": crontab(minute="*"),
+    },
+    "warm-popular-searches-every-minute": {
+        "task": "warm_popular_searches",
+        "schedule": crontab(minute="*"),
+    },
+    "check-search-index-nightly": {
+        "task": "check_search_index",
+        "schedule": crontab(hour=4, minute=0),
+    },
 }
 celery_app.conf.timezone = "UTC"
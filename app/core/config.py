@@ -31,6 +31,17 @@ class Settings(BaseSettings):
     REDIS_DB: int = 0
     REDIS_URL: str | None = None
 
+    # --- CACHING ---
+    # Unfiltered listings switch from count(*) to the planner estimate
+    # once the catalog has at least this many rows.
+    COUNT_ESTIMATE_THRESHOLD: int = 50_000
+    # Per-worker in-memory tier in front of Redis.
+    LOCAL_CACHE_MAXSIZE: int = 2048
+    LOCAL_CACHE_TTL: float = 5.0
+    # Read Postgres listing pages from the movie_catalog materialized view
+    # (refreshed every minute) instead of movies + a genre query per page.
+    LISTINGS_FROM_CATALOG_VIEW: bool = False
+
     # --- EXTERNAL SERVICES ---
     TMDB_API_KEY: str | None = None
     ADMIN_EMAIL: str
@@ -63,6 +74,14 @@ class Settings(BaseSettings):
     GOOGLE_CLIENT_SECRET: str | None = None
     MEILI_HOST: str | None = None
     MEILI_MASTER_KEY: str | None = None
+    # Per-request timeout (seconds), retries on connection errors/5xx, and
+    # the keep-alive pool size of the async search client.
+    MEILI_TIMEOUT: float = 2.0
+    MEILI_RETRIES: int = 2
+    MEILI_MAX_CONNECTIONS: int = 20
+    # Hybrid search: a retriever slower than this is left out of the fusion.
+    HYBRID_LEXICAL_TIMEOUT: float = 1.0
+    HYBRID_SEMANTIC_TIMEOUT: float = 1.5
     ANTHROPIC_API_KEY: str | None = None
 
     @property
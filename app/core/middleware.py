@@ -1,5 +1,10 @@
+import zlib
+
+import brotli
 from fastapi import Request, Response
+from starlette.datastructures import Headers, MutableHeaders
 from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 
 class SecurityHeadersMiddleware(BaseHTTPMiddleware):
@@ -22,3 +27,200 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
         response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
 
         return response
+
+
+# ---------------- COMPRESSION ----------------
+
+# On-the-fly settings: cheaper than the cache's stored bodies, which are
+# compressed once and then served as they are.
+BROTLI_QUALITY = 4
+GZIP_LEVEL = 6
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+    "text/",
+)
+# Compressors buffer; an event stream must reach the client event by event.
+STREAMING_TYPES = ("text/event-stream",)
+
+
+def negotiate_encoding(accept_encoding: str | None) -> str | None:
+    """
+    Picks the coding to answer with from an Accept-Encoding header:
+    "br" over "gzip", honouring q=0 and "*". None means identity.
+    """
+    if not accept_encoding:
+        return None
+
+    accepted = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        quality = 1.0
+        params = params.strip().replace(" ", "")
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip().lower()] = quality
+
+    for coding in ("br", "gzip"):
+        if accepted.get(coding, accepted.get("*", 0.0)) > 0:
+            return coding
+    return None
+
+
+def weak_etag(etag: str) -> str:
+    """
+    Compressed bytes differ from the identity body, so a strong ETag
+    can't be shared between them; the compressed variant gets the weak
+    form, which still matches in `CachedBody.not_modified`.
+    """
+    return etag if etag.startswith("W/") else f"W/{etag}"
+
+
+class _Encoder:
+    def __init__(self, coding: str):
+        self.coding = coding
+        if coding == "br":
+            self._brotli = brotli.Compressor(quality=BROTLI_QUALITY)
+        else:
+            self._gzip = zlib.compressobj(
+                GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS
+            )
+
+    def compress(self, chunk: bytes, final: bool) -> bytes:
+        """Compresses a chunk; non-final chunks are flushed so they go out now."""
+        if self.coding == "br":
+            data = self._brotli.process(chunk)
+            return data + (self._brotli.finish() if final else self._brotli.flush())
+        data = self._gzip.compress(chunk)
+        return data + self._gzip.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class CompressionMiddleware:
+    """
+    Brotli/gzip for HTTP responses, negotiated from Accept-Encoding.
+
+    Left untouched: bodies under `minimum_size`, non-text content types,
+    event streams, responses that already carry a Content-Encoding (the
+    precompressed cache path in `CachedBody.to_response`) and responses
+    that opt out with `Cache-Control: no-transform`. WebSockets pass
+    straight through.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        coding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"))
+        if coding is None:
+            await self.app(scope, receive, send)
+            return
+
+        await self.app(
+            scope, receive, _CompressingSend(send, coding, self.minimum_size)
+        )
+
+
+class _CompressingSend:
+    """
+    Responses that can't be compressed (see `_compressible`) are forwarded
+    as they come, so event streams are never held back. For the rest,
+    http.response.start waits until `minimum_size` bytes of body (or the
+    whole body) have arrived, which is when we know whether it is worth
+    compressing. Bodies re-streamed in small chunks (BaseHTTPMiddleware
+    does that to every response) are judged by their total size.
+    """
+
+    def __init__(self, send: Send, coding: str, minimum_size: int):
+        self.send = send
+        self.coding = coding
+        self.minimum_size = minimum_size
+        self.start: Message | None = None
+        self.pending: list[bytes] = []
+        self.encoder: _Encoder | None = None
+
+    async def __call__(self, message: Message):
+        if message["type"] == "http.response.start":
+            if self._compressible(Headers(raw=message["headers"])):
+                self.start = message
+            else:
+                await self.send(message)
+            return
+
+        if self.start is None or message["type"] != "http.response.body":
+            await self._release()
+            await self._send_body(message)
+            return
+
+        self.pending.append(message.get("body", b""))
+        more_body = message.get("more_body", False)
+        body = b"".join(self.pending)
+        if more_body and len(body) < self.minimum_size:
+            return
+
+        start, self.start, self.pending = self.start, None, []
+        headers = MutableHeaders(raw=start["headers"])
+
+        if len(body) < self.minimum_size:
+            await self.send(start)
+            await self.send(
+                {"type": "http.response.body", "body": body, "more_body": more_body}
+            )
+            return
+
+        self.encoder = _Encoder(self.coding)
+        headers["Content-Encoding"] = self.coding
+        headers.add_vary_header("Accept-Encoding")
+        if "etag" in headers:
+            headers["ETag"] = weak_etag(headers["etag"])
+        if "content-length" in headers:
+            del headers["Content-Length"]
+
+        compressed = self.encoder.compress(body, final=not more_body)
+        if not more_body:
+            headers["Content-Length"] = str(len(compressed))
+        await self.send(start)
+        await self.send(
+            {"type": "http.response.body", "body": compressed, "more_body": more_body}
+        )
+
+    async def _release(self):
+        """Sends whatever was held back as is."""
+        if self.start is None:
+            return
+        await self.send(self.start)
+        if self.pending:
+            body = b"".join(self.pending)
+            await self.send(
+                {"type": "http.response.body", "body": body, "more_body": True}
+            )
+        self.start, self.pending = None, []
+
+    async def _send_body(self, message: Message):
+        if self.encoder is None or message["type"] != "http.response.body":
+            await self.send(message)
+            return
+        more_body = message.get("more_body", False)
+        body = self.encoder.compress(message.get("body", b""), final=not more_body)
+        await self.send({**message, "body": body})
+
+    @staticmethod
+    def _compressible(headers: Headers) -> bool:
+        if "content-encoding" in headers:
+            return False
+        if "no-transform" in headers.get("cache-control", ""):
+            return False
+        content_type = headers.get("content-type", "").split(";")[0].strip().lower()
+        if content_type in STREAMING_TYPES:
+            return False
+        return content_type.startswith(COMPRESSIBLE_TYPES)
@@ -0,0 +1,48 @@
+import base64
+
+import orjson
+from fastapi import HTTPException, status
+
+
+def encode_cursor(
+    sort_by: str, order: str, value, movie_id: int, direction: str = "next"
+) -> str:
+    """
+    Packs a keyset position into an opaque, URL-safe token.
+    `value` is the sort column of the boundary row, `movie_id` the tie-breaker.
+    """
+    payload = {"s": sort_by, "o": order, "v": value, "i": movie_id, "d": direction}
+    raw = orjson.dumps(payload)
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_by: str, order: str) -> dict:
+    """
+    Unpacks a cursor produced by `encode_cursor`.
+    Rejects tokens that are malformed or were issued for another sort order.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = orjson.loads(base64.urlsafe_b64decode(padded.encode()))
+        position = {
+            "value": payload["v"],
+            "id": int(payload["i"]),
+            "direction": payload["d"],
+        }
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+
+    if payload.get("s") != sort_by or payload.get("o") != order:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor does not match the requested sort order",
+        )
+
+    if position["direction"] not in ("next", "prev"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+
+    return position
@@ -1,20 +1,26 @@
 import redis.asyncio as redis
 from app.core.config import settings
 
-if settings.REDIS_URL:
-    redis_pool = redis.ConnectionPool.from_url(
-        settings.REDIS_URL, encoding="utf-8", decode_responses=True
-    )
-else:
-    redis_pool = redis.ConnectionPool(
+
+def create_pool(decode_responses: bool = True) -> redis.ConnectionPool:
+    if settings.REDIS_URL:
+        return redis.ConnectionPool.from_url(
+            settings.REDIS_URL, encoding="utf-8", decode_responses=decode_responses
+        )
+    return redis.ConnectionPool(
         host=settings.REDIS_HOST,
         port=settings.REDIS_PORT,
         db=settings.REDIS_DB,
         encoding="utf-8",
-        decode_responses=True,
+        decode_responses=decode_responses,
     )
 
 
+redis_pool = create_pool()
+# Separate pool for raw bytes (compressed / msgpack cache entries).
+binary_redis_pool = create_pool(decode_responses=False)
+
+
 def get_redis_client():
     """
     Returns a NEW client instance using the shared pool.
@@ -23,6 +29,13 @@ def get_redis_client():
     return redis.Redis(connection_pool=redis_pool)
 
 
+def get_redis_binary_client():
+    """
+    Like get_redis_client(), but values come back as bytes.
+    """
+    return redis.Redis(connection_pool=binary_redis_pool)
+
+
 async def get_redis():
     """Dependency for FastAPI routes"""
     client = get_redis_client()
@@ -1,30 +1,158 @@
-import meilisearch
+import asyncio
+
+import httpx
+
 from app.core.config import settings
 
+# Responses worth another attempt: Meili restarting or behind a proxy that
+# lost it. Everything else (bad filter, missing index...) fails right away.
+RETRY_STATUSES = {502, 503, 504}
+RETRY_BACKOFF_SECONDS = 0.1
+
+
+class SearchError(Exception):
+    """MeiliSearch could not be reached or rejected the request."""
+
 
 class SearchClient:
+    """
+    Async client for the few MeiliSearch endpoints we use, on a pooled
+    keep-alive httpx connection so a search never blocks the event loop.
+
+    Timeouts come from MEILI_TIMEOUT. Connection errors, timeouts and
+    502/503/504 are retried MEILI_RETRIES times with a short backoff; every
+    call we make is idempotent (searches, upserts and deletes by ID).
+    """
+
     _client = None
 
+    def __init__(self, host: str, api_key: str | None):
+        headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+        self._loop = asyncio.get_running_loop()
+        self._http = httpx.AsyncClient(
+            base_url=host,
+            headers=headers,
+            timeout=httpx.Timeout(settings.MEILI_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=settings.MEILI_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.MEILI_MAX_CONNECTIONS,
+            ),
+        )
+
     @classmethod
-    def get_client(cls):
-        if cls._client is None:
-            try:
-                cls._client = meilisearch.Client(
-                    settings.MEILI_HOST, settings.MEILI_MASTER_KEY
-                )
-            except Exception as e:
-                print(f"⚠️ Search Engine Connection Failed: {e}")
-                return None
+    def get_client(cls) -> "SearchClient | None":
+        """
+        The client for the running event loop, or None when search isn't
+        configured. httpx connections belong to one loop, so a Celery task
+        (a fresh `asyncio.run` each time) gets a fresh client, and must
+        `await SearchClient.close()` before its loop ends. A client left
+        from a loop that is gone can no longer be closed from this one.
+        """
+        if not search_enabled():
+            return None
+        if cls._client is None or cls._client._loop is not asyncio.get_running_loop():
+            cls._client = cls(settings.MEILI_HOST, settings.MEILI_MASTER_KEY)
         return cls._client
 
     @classmethod
-    def check_health(cls):
+    async def close(cls):
+        if cls._client is not None:
+            await cls._client._http.aclose()
+            cls._client = None
+
+    async def _request(self, method: str, path: str, **kwargs) -> dict:
+        for attempt in range(settings.MEILI_RETRIES + 1):
+            try:
+                response = await self._http.request(method, path, **kwargs)
+            except httpx.TransportError as e:
+                error = SearchError(f"{method} {path}: {e!r}")
+            else:
+                if response.status_code not in RETRY_STATUSES:
+                    if response.is_error:
+                        raise SearchError(
+                            f"{method} {path}: {response.status_code} {response.text}"
+                        )
+                    return response.json() if response.content else {}
+                error = SearchError(f"{method} {path}: {response.status_code}")
+
+            if attempt < settings.MEILI_RETRIES:
+                await asyncio.sleep(RETRY_BACKOFF_SECONDS * 2**attempt)
+        raise error
+
+    async def search(self, index: str, query: str, params: dict) -> dict:
+        return await self._request(
+            "POST", f"/indexes/{index}/search", json={"q": query, **params}
+        )
+
+    async def add_documents(self, index: str, documents: list[dict]) -> dict:
+        """Upserts documents by primary key. Returns the enqueued task."""
+        return await self._request(
+            "POST", f"/indexes/{index}/documents", json=documents
+        )
+
+    async def create_index(self, index: str, primary_key: str = "id") -> dict:
+        return await self._request(
+            "POST", "/indexes", json={"uid": index, "primaryKey": primary_key}
+        )
+
+    async def delete_index(self, index: str) -> dict:
+        return await self._request("DELETE", f"/indexes/{index}")
+
+    async def swap_indexes(self, first: str, second: str) -> dict:
+        """Atomically exchanges the documents and settings of two indexes."""
+        return await self._request(
+            "POST", "/swap-indexes", json=[{"indexes": [first, second]}]
+        )
+
+    async def delete_documents(self, index: str, document_ids: list[int]) -> dict:
+        return await self._request(
+            "POST", f"/indexes/{index}/documents/delete-batch", json=document_ids
+        )
+
+    async def fetch_documents(self, index: str, params: dict) -> dict:
+        """Documents by filter, e.g. only some fields of an id range."""
+        return await self._request(
+            "POST", f"/indexes/{index}/documents/fetch", json=params
+        )
+
+    async def update_settings(self, index: str, index_settings: dict) -> dict:
+        return await self._request(
+            "PATCH", f"/indexes/{index}/settings", json=index_settings
+        )
+
+    async def wait_for_task(
+        self, task_uid: int, timeout: float, poll: float = 0.5
+    ) -> dict:
+        """
+        Waits for an enqueued task (settings, documents...) to finish.
+        Raises SearchError if it fails or is still running after `timeout`.
+        """
+        deadline = self._loop.time() + timeout
+        while True:
+            task = await self._request("GET", f"/tasks/{task_uid}")
+            if task.get("status") == "succeeded":
+                return task
+            if task.get("status") in ("failed", "canceled"):
+                raise SearchError(f"Task {task_uid} {task['status']}: {task}")
+            if self._loop.time() >= deadline:
+                raise SearchError(f"Task {task_uid} still {task.get('status')}")
+            await asyncio.sleep(poll)
+
+    async def health(self) -> bool:
         """Returns True if MeiliSearch is responsive"""
-        client = cls.get_client()
-        if client:
-            return client.health().get("status") == "available"
-        return False
+        try:
+            return (await self._request("GET", "/health")).get("status") == "available"
+        except SearchError:
+            return False
+
+
+def search_enabled() -> bool:
+    """
+    Whether MeiliSearch is configured. Unlike `get_search_client`, this
+    never opens a client, so write paths can check it from any loop.
+    """
+    return bool(settings.MEILI_HOST)
 
 
-def get_search_client():
+def get_search_client() -> SearchClient | None:
     return SearchClient.get_client()
@@ -1,6 +1,6 @@
 import asyncio
-import json
 import os
+import orjson
 import sentry_sdk
 from contextlib import asynccontextmanager
 
@@ -11,7 +11,7 @@ from fastapi import (
     Request,
 )
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi_limiter import FastAPILimiter
 
@@ -25,14 +25,20 @@ from prometheus_fastapi_instrumentator import Instrumentator
 from sqlalchemy import text
 
 from app.api.v1.router import api_router
+from app.core.cache import subscribe_to_cache_invalidations
 from app.core.config import settings
 from app.core.exceptions import MovieNotFoundException, NotAuthorizedException
 from app.core.redis import get_redis_client
 from app.core.limiter import limiter
+from app.core.search import SearchClient, get_search_client
 from app.core.logging import setup_logging
-from app.core.middleware import SecurityHeadersMiddleware
+from app.core.middleware import CompressionMiddleware, SecurityHeadersMiddleware
 from app.core.websockets import manager
 from app.db.session import AsyncSessionLocal
+from app.services.autocomplete_service import (
+    load_title_index,
+    subscribe_to_title_changes,
+)
 
 os.makedirs("static/exports", exist_ok=True)
 
@@ -55,7 +61,7 @@ async def subscribe_to_notifications():
                 continue
 
             try:
-                data = json.loads(message["data"])
+                data = orjson.loads(message["data"])
                 user_id = data.get("user_id")
                 msg_text = data.get("message")
 
@@ -82,16 +88,24 @@ async def lifespan(app: FastAPI):
     redis = get_redis_client()
     await FastAPILimiter.init(redis)
 
-    task = asyncio.create_task(subscribe_to_notifications())
+    tasks = [
+        asyncio.create_task(subscribe_to_notifications()),
+        asyncio.create_task(subscribe_to_cache_invalidations()),
+        asyncio.create_task(subscribe_to_title_changes()),
+        asyncio.create_task(load_title_index()),
+    ]
 
     yield
 
-    task.cancel()
-    try:
-        await task
-    except asyncio.CancelledError:
-        pass
+    for task in tasks:
+        task.cancel()
+    for task in tasks:
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
 
+    await SearchClient.close()
     await redis.close()
 
 
@@ -111,6 +125,7 @@ def create_application() -> FastAPI:
         openapi_url=f"{settings.API_V1_STR}/openapi.json",
         docs_url="/docs",
         redoc_url="/redoc",
+        default_response_class=ORJSONResponse,
         lifespan=lifespan,
     )
 
@@ -146,6 +161,11 @@ def create_application() -> FastAPI:
     # ---------------- SECURITY HEADERS ----------------
     app.add_middleware(SecurityHeadersMiddleware)
 
+    # ---------------- COMPRESSION ----------------
+    # Outermost, so it sees final headers. SSE and precompressed cache
+    # hits pass through; see CompressionMiddleware.
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
     # ---------------- STATIC FILES ----------------
     app.mount("/static", StaticFiles(directory="static"), name="static")
 
@@ -184,6 +204,7 @@ async def health_check():
         "status": "online",
         "database": "unknown",
         "redis": "unknown",
+        "search": "disabled",
     }
 
     try:
@@ -204,6 +225,13 @@ async def health_check():
         health_status["redis"] = "offline"
         health_status["status"] = "offline"
 
+    # Search is optional: listings fall back to Postgres without it, so a
+    # Meili outage is reported here but doesn't fail the check.
+    search_client = get_search_client()
+    if search_client:
+        online = await search_client.health()
+        health_status["search"] = "online" if online else "offline"
+
     if health_status["status"] == "offline":
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -215,7 +243,7 @@ async def health_check():
 
 @app.exception_handler(MovieNotFoundException)
 async def movie_not_found_handler(request: Request, exc: MovieNotFoundException):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=404,
         content={"error": "Not Found", "detail": exc.message},
     )
@@ -223,7 +251,7 @@ async def movie_not_found_handler(request: Request, exc: MovieNotFoundException)
 
 @app.exception_handler(NotAuthorizedException)
 async def not_authorized_handler(request: Request, exc: NotAuthorizedException):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=403,
         content={"error": "Forbidden", "detail": exc.message},
     )
@@ -0,0 +1,49 @@
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+# Denormalized read model for catalog listings: one row per movie with its
+# rating aggregates and genres already joined in, so a listing page is a
+# single index scan. It is a materialized view (created by migration
+# d41f0c7a9e12, refreshed by the `refresh_movie_catalog` task), so it lives
+# on its own MetaData and create_all/autogenerate never treat it as a table.
+MOVIE_CATALOG_SELECT = """
+    SELECT m.id,
+           m.title,
+           m.slug,
+           m.description,
+           m.release_year,
+           m.video_url,
+           m.thumbnail_url,
+           m.is_published,
+           m.average_rating,
+           m.rating_count,
+           m.updated_at,
+           COALESCE(
+               jsonb_agg(
+                   jsonb_build_object('id', g.id, 'name', g.name, 'slug', g.slug)
+                   ORDER BY g.id
+               ) FILTER (WHERE g.id IS NOT NULL),
+               '[]'::jsonb
+           ) AS genres
+    FROM movies m
+    LEFT JOIN movie_genres mg ON mg.movie_id = m.id
+    LEFT JOIN genres g ON g.id = mg.genre_id
+    GROUP BY m.id
+"""
+
+movie_catalog = sa.Table(
+    "movie_catalog",
+    sa.MetaData(),
+    sa.Column("id", sa.Integer, primary_key=True),
+    sa.Column("title", sa.String),
+    sa.Column("slug", sa.String),
+    sa.Column("description", sa.Text),
+    sa.Column("release_year", sa.Integer),
+    sa.Column("video_url", sa.String),
+    sa.Column("thumbnail_url", sa.String),
+    sa.Column("is_published", sa.Boolean),
+    sa.Column("average_rating", sa.Float),
+    sa.Column("rating_count", sa.Integer),
+    sa.Column("updated_at", sa.DateTime(timezone=True)),
+    sa.Column("genres", JSONB),
+)
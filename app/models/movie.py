@@ -52,7 +52,11 @@ class Movie(Base, TimestampMixin):
         ),
     )
 
-    embedding: Mapped[list[float]] = mapped_column(Vector(384), nullable=True)
+    # Only the vector search paths need this (~4KB per row as text over
+    # asyncpg), and they select it explicitly; everything else skips it.
+    embedding: Mapped[list[float]] = mapped_column(
+        Vector(384), nullable=True, deferred=True, deferred_group="vector"
+    )
 
     genres = relationship("Genre", secondary=movie_genres_link, back_populates="movies")
     ratings = relationship(
@@ -64,6 +68,8 @@ class Movie(Base, TimestampMixin):
 
     __table_args__ = (
         sa.Index("ix_movies_search_vector", "search_vector", postgresql_using="gin"),
+        sa.Index("ix_movies_rating", "average_rating", "id"),
+        sa.Index("ix_movies_title_id", "title", "id"),
     )
 
 
@@ -1,12 +1,41 @@
+from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, desc, asc, case, nullslast, or_, text
-from sqlalchemy.orm import aliased, selectinload
-from app.models.movie import Movie
+from sqlalchemy import select, func, desc, asc, or_, text, tuple_
+from sqlalchemy.orm import aliased, load_only, selectinload
+from app.core.pagination import decode_cursor, encode_cursor
+from app.models.catalog import movie_catalog
+from app.models.movie import Genre, Movie, movie_genres_link
 from app.models.rating import RatingModel
-from app.schemas.movie import MovieCreate, MovieUpdate
+from app.schemas.movie import (
+    FacetStats,
+    MovieCreate,
+    MovieFacets,
+    MovieFilters,
+    MovieUpdate,
+)
 from app.services.ai_service import get_embedding
 
 
+# Highlighted excerpt of the description for full-text search hits.
+SNIPPET_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxWords=30, MinWords=10"
+
+
+def movie_load_options(fields: frozenset[str] | None, *required) -> list:
+    """
+    Loader options for a sparse fieldset: only the requested columns (plus
+    `required`, e.g. the sort column a cursor needs) are selected, and
+    genres are only fetched when asked for. None loads everything.
+    """
+    if not fields:
+        return [selectinload(Movie.genres)]
+
+    columns = {getattr(Movie, name) for name in fields if name != "genres"}
+    options = [load_only(Movie.id, *columns, *required)]
+    if "genres" in fields:
+        options.append(selectinload(Movie.genres))
+    return options
+
+
 class MovieRepository:
     """
     Abstractions for database interactions.
@@ -38,74 +67,247 @@ class MovieRepository:
         order: str = "asc",
         min_rating: float = None,
         search_query: str = None,
+        cursor: str = None,
+        from_catalog: bool = False,
+        fields: frozenset[str] | None = None,
+        filters: MovieFilters | None = None,
     ):
-        avg_rating = func.avg(RatingModel.score).label("average_score")
-        rating_sort = case((avg_rating > 0, avg_rating), else_=None)
+        """
+        Returns one page of movies plus the cursors around it.
+        Totals are resolved separately (see `count_service`).
 
-        query = (
-            select(Movie, avg_rating)
-            .options(selectinload(Movie.genres))
-            .outerjoin(RatingModel, Movie.id == RatingModel.movie_id)
-            .group_by(Movie.id)
-        )
+        Without a cursor the page is addressed by OFFSET (legacy page/size mode).
+        With a cursor the page is addressed by keyset: rows strictly after (or
+        before) the boundary row, using Movie.id as a stable tie-breaker, so deep
+        pages cost the same as the first one.
 
-        if search_query:
-            search_pattern = f"%{search_query}%"
-            query = query.where(
-                or_(
-                    Movie.title.ilike(search_pattern),
-                    Movie.description.ilike(search_pattern),
-                )
-            )
+        Ratings come from the maintained `average_rating` column, so the
+        ratings table is never touched here.
 
-        if min_rating is not None:
-            query = query.having(avg_rating >= min_rating)
+        With `from_catalog` the page is read from the `movie_catalog`
+        materialized view instead: rows already carry their genres, so the
+        page is one index scan with no genre query. Rows are returned
+        instead of Movie objects and are as fresh as the last refresh.
 
-        if sort_by == "rating":
-            sort_column = rating_sort
-        elif sort_by == "title":
-            sort_column = Movie.title
+        `fields` narrows the projection to a sparse fieldset; the sort
+        column is always loaded so cursors can be built.
+        """
+        if from_catalog:
+            source = movie_catalog.c
+            sort_column = self._sort_column(sort_by, source)
+            if fields:
+                columns = [source.id, sort_column, *(source[f] for f in sorted(fields))]
+                query = select(*dict.fromkeys(columns))
+            else:
+                query = select(movie_catalog)
         else:
-            sort_column = Movie.id
-
-        query = query.order_by(
-            nullslast(desc(sort_column))
-            if order == "desc"
-            else nullslast(asc(sort_column))
+            source = Movie
+            sort_column = self._sort_column(sort_by, source)
+            query = select(Movie).options(*movie_load_options(fields, sort_column))
+        query = query.where(
+            *self._listing_filters(min_rating, search_query, source, filters)
         )
 
-        paginated_query = query.offset(skip).limit(limit)
-        result = await self.session.execute(paginated_query)
-        rows = result.all()
+        descending = order == "desc"
+        forward = True
+        position = None
 
-        movies = []
-        for movie, avg_score in rows:
-            movie.rating = round(avg_score, 1) if avg_score else 0.0
-            movies.append(movie)
+        if cursor:
+            position = decode_cursor(cursor, sort_by, order)
+            forward = position["direction"] == "next"
+            boundary = tuple_(
+                self._coerce_sort_value(sort_by, position["value"]), position["id"]
+            )
+            keyset = tuple_(sort_column, source.id)
+            # Rows after the boundary in display order, or before it when
+            # walking back from a prev_cursor.
+            if forward != descending:
+                query = query.where(keyset > boundary)
+            else:
+                query = query.where(keyset < boundary)
+
+        direction = desc if descending == forward else asc
+        query = query.order_by(direction(sort_column), direction(source.id))
+
+        if not position:
+            query = query.offset(skip)
+
+        result = await self.session.execute(query.limit(limit + 1))
+        movies = list(result.all() if from_catalog else result.scalars().all())
+
+        has_more = len(movies) > limit
+        movies = movies[:limit]
+        if not forward:
+            movies.reverse()
+
+        # Walking forward we know whether more rows follow; walking backward we
+        # know whether more rows precede. The other side always exists.
+        has_next = has_more if forward else True
+        has_prev = (position is not None or skip > 0) if forward else has_more
+
+        next_cursor = prev_cursor = None
+        if movies:
+            if has_next:
+                next_cursor = encode_cursor(
+                    sort_by,
+                    order,
+                    self._sort_value(sort_by, movies[-1]),
+                    movies[-1].id,
+                    "next",
+                )
+            if has_prev:
+                prev_cursor = encode_cursor(
+                    sort_by,
+                    order,
+                    self._sort_value(sort_by, movies[0]),
+                    movies[0].id,
+                    "prev",
+                )
 
-        subquery_stmt = (
-            select(Movie.id)
-            .outerjoin(RatingModel, Movie.id == RatingModel.movie_id)
-            .group_by(Movie.id)
+        return movies, next_cursor, prev_cursor
+
+    async def count_movies(
+        self,
+        min_rating: float = None,
+        search_query: str = None,
+        filters: MovieFilters | None = None,
+    ) -> int:
+        """
+        Exact number of movies matching the listing filters.
+        """
+        return await self.session.scalar(
+            select(func.count())
+            .select_from(Movie)
+            .where(*self._listing_filters(min_rating, search_query, filters=filters))
         )
 
-        if min_rating is not None:
-            subquery_stmt = subquery_stmt.having(avg_rating >= min_rating)
+    async def facet_counts(
+        self, min_rating: float = None, filters: MovieFilters | None = None
+    ) -> MovieFacets:
+        """
+        Genre and release year counts plus the rating range of the movies
+        matching the listing filters: three GROUP BY / aggregate queries.
+        """
+        conditions = self._listing_filters(min_rating, filters=filters)
+
+        genre_stmt = (
+            select(Genre.name, func.count(Movie.id))
+            .select_from(Movie)
+            .join(movie_genres_link, movie_genres_link.c.movie_id == Movie.id)
+            .join(Genre, Genre.id == movie_genres_link.c.genre_id)
+            .where(*conditions)
+            .group_by(Genre.name)
+        )
+        year_stmt = (
+            select(Movie.release_year, func.count(Movie.id))
+            .where(*conditions)
+            .group_by(Movie.release_year)
+        )
+        rating_stmt = select(
+            func.min(Movie.average_rating), func.max(Movie.average_rating)
+        ).where(*conditions)
+
+        genres = (await self.session.execute(genre_stmt)).all()
+        years = (await self.session.execute(year_stmt)).all()
+        low, high = (await self.session.execute(rating_stmt)).one()
+
+        return MovieFacets(
+            genres=dict(genres),
+            release_year={str(year): count for year, count in years},
+            rating=FacetStats(min=low, max=high) if low is not None else None,
+        )
+
+    async def refresh_catalog_view(self) -> None:
+        """
+        Rebuilds `movie_catalog` without blocking readers (CONCURRENTLY
+        diffs against the old contents using its unique id index).
+        """
+        await self.session.execute(
+            text("REFRESH MATERIALIZED VIEW CONCURRENTLY movie_catalog")
+        )
+        await self.session.commit()
+
+    async def estimate_movie_count(self) -> int | None:
+        """
+        Planner's row estimate for the movies table (kept fresh by autovacuum).
+        Returns None when the table has never been analyzed.
+        """
+        sql = "SELECT reltuples::bigint FROM pg_class WHERE oid = 'movies'::regclass"
+        estimate = await self.session.scalar(text(sql))
+        if estimate is None or estimate < 0:
+            return None
+        return estimate
+
+    @staticmethod
+    def _listing_filters(
+        min_rating: float = None,
+        search_query: str = None,
+        source=Movie,
+        filters: MovieFilters | None = None,
+    ) -> list:
+        conditions = []
 
         if search_query:
-            subquery_stmt = subquery_stmt.where(
+            search_pattern = f"%{search_query}%"
+            conditions.append(
                 or_(
-                    Movie.title.ilike(search_pattern),
-                    Movie.description.ilike(search_pattern),
+                    source.title.ilike(search_pattern),
+                    source.description.ilike(search_pattern),
                 )
             )
 
-        subquery = subquery_stmt.subquery()
-        count_query = select(func.count()).select_from(subquery)
+        if min_rating is not None:
+            conditions.append(source.average_rating >= min_rating)
+
+        if filters and filters.genres:
+            if source is Movie:
+                conditions.append(Movie.genres.any(Genre.name.in_(filters.genres)))
+            else:
+                # movie_catalog carries genres as a JSONB array of objects.
+                conditions.append(
+                    or_(
+                        *(
+                            source.genres.contains([{"name": name}])
+                            for name in filters.genres
+                        )
+                    )
+                )
+        if filters and filters.year_from is not None:
+            conditions.append(source.release_year >= filters.year_from)
+        if filters and filters.year_to is not None:
+            conditions.append(source.release_year <= filters.year_to)
 
-        total = await self.session.scalar(count_query)
+        return conditions
 
-        return movies, total
+    @staticmethod
+    def _sort_column(sort_by: str, source=Movie):
+        if sort_by == "rating":
+            return source.average_rating
+        if sort_by == "title":
+            return source.title
+        return source.id
+
+    @staticmethod
+    def _sort_value(sort_by: str, movie: Movie):
+        if sort_by == "rating":
+            return movie.average_rating
+        if sort_by == "title":
+            return movie.title
+        return movie.id
+
+    @staticmethod
+    def _coerce_sort_value(sort_by: str, value):
+        """Restores the Python type of a sort value that went through JSON."""
+        try:
+            if sort_by in ("rating", "relevance"):
+                return float(value)
+            if sort_by == "title":
+                return str(value)
+            return int(value)
+        except (TypeError, ValueError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+            )
 
     async def get_by_id(self, movie_id: int) -> Movie | None:
         """
@@ -135,28 +337,154 @@ class MovieRepository:
         await self.session.delete(movie)
         await self.session.commit()
 
-    async def search_movies(self, query_str: str) -> list[Movie]:
-        search_vector = func.to_tsvector(
-            "english",
-            func.coalesce(Movie.title, "") + " " + func.coalesce(Movie.description, ""),
+    async def search_movies(
+        self,
+        query_str: str,
+        limit: int,
+        skip: int = 0,
+        after: dict | None = None,
+        min_rating: float = None,
+        filters: MovieFilters | None = None,
+    ) -> list[tuple[Movie, float, str]]:
+        """
+        Ranked full-text search on the persisted `search_vector` column, so
+        matching is answered by its GIN index. Returns (movie, rank, snippet)
+        rows, best match first; `after` is a decoded relevance cursor.
+
+        ts_headline is the expensive part, so it only runs for the rows of
+        the page, in the outer query.
+        """
+        tsquery = func.websearch_to_tsquery("english", query_str)
+        rank = func.ts_rank_cd(Movie.search_vector, tsquery)
+
+        conditions = [
+            Movie.search_vector.op("@@")(tsquery),
+            *self._listing_filters(min_rating, filters=filters),
+        ]
+        if after:
+            value = self._coerce_sort_value("relevance", after["value"])
+            conditions.append(tuple_(rank, Movie.id) < tuple_(value, after["id"]))
+
+        page = (
+            select(Movie.id, rank.label("rank"))
+            .where(*conditions)
+            .order_by(rank.desc(), Movie.id.desc())
+            .offset(skip)
+            .limit(limit)
+            .subquery()
+        )
+        snippet = func.ts_headline(
+            "english", Movie.description, tsquery, SNIPPET_OPTIONS
+        )
+        stmt = (
+            select(Movie, page.c.rank, snippet)
+            .join(page, Movie.id == page.c.id)
+            .options(selectinload(Movie.genres))
+            .order_by(page.c.rank.desc(), Movie.id.desc())
         )
+        result = await self.session.execute(stmt)
+        return [tuple(row) for row in result.all()]
 
-        search_query = func.websearch_to_tsquery("english", query_str)
+    async def search_movie_ids(self, query_str: str, limit: int) -> list[int]:
+        """Full-text matches by rank, IDs only (no snippets, no genres)."""
+        tsquery = func.websearch_to_tsquery("english", query_str)
+        rank = func.ts_rank_cd(Movie.search_vector, tsquery)
+        stmt = (
+            select(Movie.id)
+            .where(Movie.search_vector.op("@@")(tsquery))
+            .order_by(rank.desc(), Movie.id.desc())
+            .limit(limit)
+        )
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
 
-        statement = select(Movie).where(search_vector.op("@@")(search_query))
+    async def has_text_matches(
+        self,
+        query_str: str,
+        min_rating: float = None,
+        filters: MovieFilters | None = None,
+    ) -> bool:
+        tsquery = func.websearch_to_tsquery("english", query_str)
+        stmt = select(Movie.id).where(
+            Movie.search_vector.op("@@")(tsquery),
+            *self._listing_filters(min_rating, filters=filters),
+        )
+        return await self.session.scalar(stmt.exists().select()) or False
 
-        result = await self.session.execute(statement)
-        return result.scalars().all()
+    async def count_text_matches(
+        self,
+        query_str: str,
+        min_rating: float = None,
+        filters: MovieFilters | None = None,
+    ) -> int:
+        tsquery = func.websearch_to_tsquery("english", query_str)
+        stmt = select(func.count(Movie.id)).where(
+            Movie.search_vector.op("@@")(tsquery),
+            *self._listing_filters(min_rating, filters=filters),
+        )
+        return await self.session.scalar(stmt)
 
-    async def get_recommendations(self, movie_id: int, limit: int = 5):
+    async def search_movies_by_substring(
+        self,
+        query_str: str,
+        limit: int,
+        skip: int = 0,
+        min_rating: float = None,
+        filters: MovieFilters | None = None,
+    ) -> list[Movie]:
+        """
+        Fallback for queries full-text search can't match (partial words,
+        "matr"): ILIKE on title and description, best rated first. The
+        pg_trgm GIN indexes from the migrations make these lookups indexed.
+        """
+        stmt = (
+            select(Movie)
+            .options(selectinload(Movie.genres))
+            .where(*self._listing_filters(min_rating, query_str, filters=filters))
+            .order_by(Movie.average_rating.desc(), Movie.id.desc())
+            .offset(skip)
+            .limit(limit)
+        )
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
+
+    async def count_substring_matches(
+        self,
+        query_str: str,
+        min_rating: float = None,
+        filters: MovieFilters | None = None,
+    ) -> int:
+        stmt = select(func.count(Movie.id)).where(
+            *self._listing_filters(min_rating, query_str, filters=filters)
+        )
+        return await self.session.scalar(stmt)
+
+    async def autocomplete_titles(self, prefix: str, limit: int) -> list[dict]:
+        """
+        Cold-start fallback for autocomplete while a worker's in-memory
+        title index is loading: titles starting with `prefix`, alphabetical.
+        The trigram index on title serves the ILIKE.
+        """
+        escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        stmt = (
+            select(Movie.id, Movie.title)
+            .where(Movie.title.ilike(f"{escaped}%", escape="\\"))
+            .order_by(func.lower(Movie.title), Movie.id)
+            .limit(limit)
+        )
+        result = await self.session.execute(stmt)
+        return [{"id": movie_id, "title": title} for movie_id, title in result.all()]
+
+    async def get_recommendations(self, movie_id: int, limit: int = 5) -> list[int]:
         """
         Recommend movies based on 'Users who liked this also liked...'
+        Returns movie IDs, best match first.
         """
         Rating1 = aliased(RatingModel)
         Rating2 = aliased(RatingModel)
 
         query = (
-            select(Movie)
+            select(Movie.id)
             .join(Rating2, Movie.id == Rating2.movie_id)
             .join(Rating1, Rating1.user_id == Rating2.user_id)
             .where(
@@ -171,7 +499,7 @@ class MovieRepository:
         )
 
         result = await self.session.execute(query)
-        return result.scalars().all()
+        return list(result.scalars().all())
 
     async def search_semantic(self, query: str, limit: int = 5):
         query_vector = get_embedding(query)
@@ -186,28 +514,41 @@ class MovieRepository:
         result = await self.session.execute(stmt)
         return result.scalars().all()
 
-    async def get_similar_movies(self, movie_id: int, limit: int = 5):
+    async def get_semantic_ids(
+        self, query_vector: list[float], limit: int
+    ) -> list[int]:
+        """Movies closest to an embedding, IDs only, closest first."""
+        stmt = (
+            select(Movie.id)
+            .where(Movie.embedding.is_not(None))
+            .order_by(Movie.embedding.cosine_distance(query_vector))
+            .limit(limit)
+        )
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
+
+    async def get_similar_movie_ids(self, movie_id: int, limit: int = 5) -> list[int]:
         """
         Finds movies semantically similar to a specific movie ID.
+        Returns movie IDs, closest first; callers hydrate them.
         """
-        stmt = select(Movie).where(Movie.id == movie_id)
-        result = await self.session.execute(stmt)
-        source_movie = result.scalars().first()
+        source_embedding = await self.session.scalar(
+            select(Movie.embedding).where(Movie.id == movie_id)
+        )
 
-        if not source_movie or source_movie.embedding is None:
+        if source_embedding is None:
             return []
 
         stmt = (
-            select(Movie)
-            .options(selectinload(Movie.genres))
+            select(Movie.id)
             .where(Movie.id != movie_id)
             .where(Movie.embedding.is_not(None))
-            .order_by(Movie.embedding.cosine_distance(source_movie.embedding))
+            .order_by(Movie.embedding.cosine_distance(source_embedding))
             .limit(limit)
         )
 
         result = await self.session.execute(stmt)
-        return result.scalars().all()
+        return list(result.scalars().all())
 
     async def get_genre_statistics(self):
         """
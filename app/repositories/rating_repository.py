@@ -1,9 +1,16 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update, case, func, text
+from app.models.movie import Movie
 from app.models.rating import RatingModel
 
 
 class RatingRepository:
+    """
+    Ratings are the source of truth; `Movie.average_rating` and
+    `Movie.rating_count` are kept in step with them inside the same
+    transaction, so catalog reads never have to aggregate the ratings table.
+    """
+
     def __init__(self, session: AsyncSession):
         self.session = session
 
@@ -19,12 +26,98 @@ class RatingRepository:
     ) -> RatingModel:
         rating = RatingModel(user_id=user_id, movie_id=movie_id, score=score)
         self.session.add(rating)
+        await self._apply_to_aggregates(
+            movie_id,
+            rating_count=Movie.rating_count + 1,
+            average_rating=(Movie.average_rating * Movie.rating_count + float(score))
+            / (Movie.rating_count + 1),
+        )
         await self.session.commit()
         await self.session.refresh(rating)
         return rating
 
     async def update_rating(self, rating: RatingModel, new_score: int) -> RatingModel:
+        delta = float(new_score - rating.score)
         rating.score = new_score
+        await self._apply_to_aggregates(
+            rating.movie_id,
+            average_rating=case(
+                (
+                    Movie.rating_count > 0,
+                    Movie.average_rating + delta / Movie.rating_count,
+                ),
+                else_=float(new_score),
+            ),
+        )
         await self.session.commit()
         await self.session.refresh(rating)
         return rating
+
+    async def delete_rating(self, rating: RatingModel) -> None:
+        score = float(rating.score)
+        await self.session.delete(rating)
+        await self._apply_to_aggregates(
+            rating.movie_id,
+            rating_count=func.greatest(Movie.rating_count - 1, 0),
+            average_rating=case(
+                (
+                    Movie.rating_count > 1,
+                    (Movie.average_rating * Movie.rating_count - score)
+                    / (Movie.rating_count - 1),
+                ),
+                else_=0.0,
+            ),
+        )
+        await self.session.commit()
+
+    async def _apply_to_aggregates(self, movie_id: int, **values) -> None:
+        """
+        Applies an incremental change to the movie's rating aggregates.
+        The UPDATE reads the current row values under its row lock, so
+        concurrent raters can't lose each other's increments.
+        """
+        await self.session.execute(
+            update(Movie)
+            .where(Movie.id == movie_id)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+
+        # A Movie already loaded in this session still holds the old numbers;
+        # expire them so the next access reads what the UPDATE wrote.
+        movie = self.session.identity_map.get(
+            self.session.identity_key(Movie, movie_id)
+        )
+        if movie is not None:
+            self.session.expire(movie, ["average_rating", "rating_count"])
+
+    async def reconcile_aggregates(self) -> list[tuple[int, float]]:
+        """
+        Recomputes the aggregates from the ratings table and repairs every
+        movie whose stored values drifted (float rounding, manual SQL, ...).
+        Returns `(movie_id, average_rating)` for each repaired movie, so the
+        caller can invalidate their caches and move them in the orderings.
+        """
+        sql = """
+            WITH stats AS (
+                SELECT m.id,
+                       COALESCE(AVG(r.score), 0) AS average_rating,
+                       COUNT(r.id) AS rating_count
+                FROM movies m
+                LEFT JOIN ratings r ON r.movie_id = m.id
+                GROUP BY m.id
+            )
+            UPDATE movies
+            SET average_rating = stats.average_rating,
+                rating_count = stats.rating_count,
+                updated_at = now()
+            FROM stats
+            WHERE movies.id = stats.id
+              AND (movies.rating_count <> stats.rating_count
+                   OR ABS(movies.average_rating - stats.average_rating) > 1e-6)
+            RETURNING movies.id, movies.average_rating;
+        """
+        result = await self.session.execute(text(sql))
+        repaired = [(movie_id, rating) for movie_id, rating in result.all()]
+        await self.session.commit()
+        return repaired
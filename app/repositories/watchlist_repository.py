@@ -2,6 +2,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, delete
 from app.models.watchlist import WatchlistModel
 from app.models.movie import Movie
+from app.repositories.movie_repository import movie_load_options
 from sqlalchemy import desc
 
 
@@ -30,12 +31,16 @@ class WatchlistRepository:
         await self.session.execute(query)
         await self.session.commit()
 
-    async def get_user_watchlist(self, user_id: int, skip: int, limit: int):
+    async def get_user_watchlist(
+        self, user_id: int, skip: int, limit: int, fields: frozenset[str] = None
+    ):
         """
         Get all movies in the user's watchlist, ordered by most recently added.
+        `fields` narrows the loaded columns to a sparse fieldset.
         """
         query = (
             select(Movie)
+            .options(*movie_load_options(fields))
             .join(WatchlistModel, Movie.id == WatchlistModel.movie_id)
             .where(WatchlistModel.user_id == user_id)
             .order_by(desc(WatchlistModel.added_at))
@@ -1,4 +1,4 @@
-from typing import Generic, TypeVar, List
+from typing import Generic, TypeVar, List, Literal
 from pydantic import BaseModel
 
 T = TypeVar("T")
@@ -10,7 +10,10 @@ class PageResponse(BaseModel, Generic[T]):
     """
 
     items: List[T]
-    total: int
+    total: int | None
     page: int
     size: int
-    pages: int
+    pages: int | None
+    total_strategy: Literal["exact", "cached", "estimated", "none"] = "exact"
+    next_cursor: str | None = None
+    prev_cursor: str | None = None
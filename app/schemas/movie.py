@@ -1,5 +1,8 @@
-from pydantic import BaseModel, ConfigDict, Field
-from typing import List
+from functools import lru_cache
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, create_model
+from typing import Generic, List
+
+from app.schemas.common import PageResponse, T
 
 
 class GenreBase(BaseModel):
@@ -49,6 +52,85 @@ class MovieResponse(MovieBase):
         from_attributes = True
 
 
+class MovieSearchHit(MovieResponse):
+    """A movie found by the Postgres full-text fallback, with its match."""
+
+    snippet: str | None = None
+
+
+class MovieSuggestion(BaseModel):
+    """One autocomplete entry: just enough to show and link a title."""
+
+    id: int
+    title: str
+
+
+class MovieFilters(BaseModel):
+    """
+    Facet filters of a listing. Genres match by name (the values facet
+    counts are keyed by) and any of them will do; years are inclusive.
+    """
+
+    genres: tuple[str, ...] = ()
+    year_from: int | None = None
+    year_to: int | None = None
+
+    model_config = ConfigDict(frozen=True)
+
+    def __bool__(self) -> bool:
+        return (
+            bool(self.genres) or self.year_from is not None or self.year_to is not None
+        )
+
+
+class FacetStats(BaseModel):
+    min: float
+    max: float
+
+
+class MovieFacets(BaseModel):
+    """Counts for a filter sidebar, over the movies matching the request."""
+
+    genres: dict[str, int] = {}
+    release_year: dict[str, int] = {}
+    rating: FacetStats | None = None
+
+
+class MoviePage(PageResponse[T], Generic[T]):
+    """A movie listing page; `facets` is set when include_facets=true."""
+
+    facets: MovieFacets | None = None
+
+
+MOVIE_FIELDS = frozenset(MovieResponse.model_fields)
+
+
+@lru_cache(maxsize=128)
+def movie_projection(fields: frozenset[str] | None = None) -> type[BaseModel]:
+    """
+    `MovieResponse` narrowed to `fields` (a ?fields= sparse fieldset).
+    Validating from ORM objects only reads those attributes, and validating
+    from a full cached body drops everything else.
+    """
+    if not fields:
+        return MovieResponse
+    return create_model(
+        "MovieProjection",
+        __config__=ConfigDict(from_attributes=True),
+        **{
+            name: (info.annotation, info)
+            for name, info in MovieResponse.model_fields.items()
+            if name in fields
+        },
+    )
+
+
+@lru_cache(maxsize=128)
+def movie_list_adapter(fields: frozenset[str] | None = None) -> TypeAdapter:
+    """Encodes a JSON array of `movie_projection(fields)` models."""
+    return TypeAdapter(list[movie_projection(fields)])
+
+
 class MovieUpdate(BaseModel):
     title: str | None = Field(None, min_length=1, max_length=255)
     description: str | None = Field(None, max_length=1000)
@@ -10,3 +10,4 @@ class MovieSearchDoc(BaseModel):
     thumbnail_url: str | None = None
     slug: str
     genres: list[str] = []
+    content_hash: str = ""
@@ -0,0 +1,175 @@
+import asyncio
+from bisect import bisect_left, insort
+
+import orjson
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.redis import get_redis_client
+from app.db.session import AsyncSessionLocal
+from app.models.movie import Movie
+from app.repositories.movie_repository import MovieRepository
+from app.services.search_service import normalize_query
+
+TITLE_EVENTS_CHANNEL = "movie-titles"
+LOAD_BATCH_SIZE = 10_000
+
+# Titles are also reachable without their leading article, so "matr"
+# finds "The Matrix".
+ARTICLES = ("the ", "a ", "an ")
+
+
+def _title_keys(title: str) -> set[str]:
+    key = normalize_query(title)
+    keys = {key}
+    for article in ARTICLES:
+        if key.startswith(article) and len(key) > len(article):
+            keys.add(key[len(article) :])
+    return keys
+
+
+class TitleIndex:
+    """
+    Per-worker prefix index over movie titles: a sorted array of
+    (normalized title, movie id) pairs. A lookup is one bisect to the first
+    key >= the prefix and a forward read while keys still match, so it
+    costs O(log n + limit) however many titles share the prefix.
+
+    Built once at startup (`load_title_index`) and kept current by title
+    events from every worker (`subscribe_to_title_changes`). Until it is
+    ready, callers use the Postgres fallback.
+    """
+
+    def __init__(self):
+        self._entries: list[tuple[str, int]] = []
+        self._titles: dict[int, str] = {}
+        self._pending: list[tuple[int, str | None]] | None = None
+        self.ready = False
+
+    def __len__(self) -> int:
+        return len(self._titles)
+
+    def build(self, rows) -> None:
+        """Replaces the contents with `rows` of (movie id, title)."""
+        titles = dict(rows)
+        entries = sorted(
+            (key, movie_id)
+            for movie_id, title in titles.items()
+            for key in _title_keys(title)
+        )
+        self._entries, self._titles = entries, titles
+
+    def begin_load(self) -> None:
+        """Events that arrive while a load is running are kept for replay."""
+        self._pending = []
+
+    def finish_load(self) -> None:
+        pending, self._pending = self._pending or [], None
+        for movie_id, title in pending:
+            self.apply(movie_id, title)
+        self.ready = True
+
+    def apply(self, movie_id: int, title: str | None) -> None:
+        """Adds, renames or (title None) removes one movie."""
+        if self._pending is not None:
+            self._pending.append((movie_id, title))
+            return
+
+        old_title = self._titles.pop(movie_id, None)
+        if old_title is not None:
+            for key in _title_keys(old_title):
+                position = bisect_left(self._entries, (key, movie_id))
+                if self._entries[position : position + 1] == [(key, movie_id)]:
+                    del self._entries[position]
+
+        if title is not None:
+            self._titles[movie_id] = title
+            for key in _title_keys(title):
+                insort(self._entries, (key, movie_id))
+
+    def lookup(self, prefix: str, limit: int) -> list[dict]:
+        prefix = normalize_query(prefix)
+        if not prefix:
+            return []
+
+        matches, seen = [], set()
+        position = bisect_left(self._entries, (prefix,))
+        while position < len(self._entries) and len(matches) < limit:
+            key, movie_id = self._entries[position]
+            if not key.startswith(prefix):
+                break
+            if movie_id not in seen:
+                seen.add(movie_id)
+                matches.append({"id": movie_id, "title": self._titles[movie_id]})
+            position += 1
+        return matches
+
+
+title_index = TitleIndex()
+
+
+async def load_title_index():
+    """Streams every title from Postgres into this worker's index."""
+    title_index.begin_load()
+    stmt = select(Movie.id, Movie.title).execution_options(yield_per=LOAD_BATCH_SIZE)
+    rows = []
+    try:
+        async with AsyncSessionLocal() as session:
+            result = await session.stream(stmt)
+            async for partition in result.partitions():
+                rows.extend(partition)
+    except Exception as e:
+        print(f"⚠️ Autocomplete index load failed: {e}")
+        title_index._pending = None
+        return
+
+    # Sorting a large catalog takes seconds of CPU; off the event loop,
+    # requests keep being served (from Postgres) meanwhile.
+    await asyncio.to_thread(title_index.build, rows)
+    title_index.finish_load()
+    print(f"🔤 Autocomplete index ready: {len(title_index)} titles")
+
+
+async def autocomplete_service(db: AsyncSession, prefix: str, limit: int) -> list[dict]:
+    """Titles starting with `prefix`: from memory once the index is loaded."""
+    if title_index.ready:
+        return title_index.lookup(prefix, limit)
+    return await MovieRepository(db).autocomplete_titles(prefix.strip(), limit)
+
+
+async def publish_title_change(movie_id: int, title: str | None):
+    """Tells every worker's index about a created, renamed or deleted movie."""
+    async with get_redis_client() as redis:
+        await redis.publish(
+            TITLE_EVENTS_CHANNEL, orjson.dumps({"id": movie_id, "title": title})
+        )
+
+
+async def subscribe_to_title_changes():
+    """
+    Background Task:
+    Applies title events published by any worker to the local index.
+    """
+    redis = get_redis_client()
+    pubsub = redis.pubsub()
+    await pubsub.subscribe(TITLE_EVENTS_CHANNEL)
+
+    print("🎧 Autocomplete Title Listener Started")
+
+    try:
+        async for message in pubsub.listen():
+            if message["type"] != "message":
+                continue
+
+            try:
+                data = orjson.loads(message["data"])
+                title_index.apply(int(data["id"]), data.get("title"))
+            except Exception as e:
+                print(f"⚠️ Title event error: {e}")
+
+    except asyncio.CancelledError:
+        print("🛑 Autocomplete Title Listener Stopping...")
+    finally:
+        await pubsub.unsubscribe(TITLE_EVENTS_CHANNEL)
+        await pubsub.close()
+        await redis.close()
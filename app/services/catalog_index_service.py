@@ -0,0 +1,162 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.redis import get_redis_client
+from app.models.movie import Movie
+
+INDEX_PREFIX = "movies:idx:"
+INDEXED_SORTS = ("id", "rating", "title")
+
+# min_rating thresholds offered by the clients. Each gets its own copy of
+# every ordering; other thresholds are answered by Postgres.
+RATING_BANDS = (5.0, 7.0, 8.0, 9.0)
+
+REBUILD_BATCH_SIZE = 5000
+
+
+def index_key(sort_by: str, band: float = None) -> str:
+    key = INDEX_PREFIX + sort_by
+    return f"{key}:min{band:g}" if band is not None else key
+
+
+def ready_key(sort_by: str) -> str:
+    return f"{INDEX_PREFIX}ready:{sort_by}"
+
+
+def _member(movie_id: int) -> str:
+    # Zero-padded so that ties (same rating) order by id, like the SQL
+    # keyset does: Redis breaks score ties by comparing members as bytes.
+    return f"{movie_id:012d}"
+
+
+def _all_keys(sort_by: str) -> list[str]:
+    return [index_key(sort_by)] + [index_key(sort_by, band) for band in RATING_BANDS]
+
+
+async def get_indexed_page(
+    sort_by: str, order: str, min_rating: float, offset: int, limit: int
+) -> tuple[list[int], int] | None:
+    """
+    Answers an unfiltered (or band-filtered) listing page from the sorted
+    sets: ZRANGE by rank is O(log n + page) however deep the page is.
+
+    Returns (movie IDs in display order, total matching), or None when the
+    index can't answer (not built yet, title order stale, odd threshold),
+    in which case the caller falls back to Postgres.
+    """
+    if sort_by not in INDEXED_SORTS:
+        return None
+    if min_rating is not None and min_rating not in RATING_BANDS:
+        return None
+
+    key = index_key(sort_by, min_rating)
+    async with get_redis_client() as redis:
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.exists(ready_key(sort_by))
+            pipe.zcard(key)
+            pipe.zrange(key, offset, offset + limit - 1, desc=order == "desc")
+            ready, total, members = await pipe.execute()
+
+    if not ready:
+        return None
+    return [int(member) for member in members], total
+
+
+async def update_ordering_indexes(
+    movie_id: int, rating: float, title_changed: bool = False
+):
+    """
+    Puts one movie at its current position in the numeric orderings and
+    rating bands. Call it after a movie is created or rated.
+
+    Title order follows Postgres collation, which Redis can't reproduce,
+    so title positions are only assigned by the rebuild; a new or renamed
+    title marks the title index stale until then.
+    """
+    member = _member(movie_id)
+
+    async with get_redis_client() as redis:
+        title_score = await redis.zscore(index_key("title"), member)
+
+        async with redis.pipeline(transaction=False) as pipe:
+            if title_changed:
+                pipe.delete(ready_key("title"))
+
+            scores = {"id": movie_id, "rating": rating}
+            if title_score is not None and not title_changed:
+                scores["title"] = title_score
+
+            for sort_by, score in scores.items():
+                pipe.zadd(index_key(sort_by), {member: score})
+                for band in RATING_BANDS:
+                    if rating >= band:
+                        pipe.zadd(index_key(sort_by, band), {member: score})
+                    else:
+                        pipe.zrem(index_key(sort_by, band), member)
+
+            await pipe.execute()
+
+
+async def remove_from_ordering_indexes(movie_id: int):
+    """
+    Drops a deleted movie from every ordering. Removing a member never
+    breaks the order of the others, so this is safe for titles too.
+    """
+    member = _member(movie_id)
+    async with get_redis_client() as redis:
+        async with redis.pipeline(transaction=False) as pipe:
+            for sort_by in INDEXED_SORTS:
+                for key in _all_keys(sort_by):
+                    pipe.zrem(key, member)
+            await pipe.execute()
+
+
+async def rebuild_ordering_indexes(db: AsyncSession) -> int:
+    """
+    Rebuilds every ordering from Postgres in one streamed pass (title
+    order, so title ranks come out of the same scan) and swaps the new
+    sets in atomically with RENAME. Returns the number of movies indexed.
+    Incremental updates that land during the scan are lost to the swap and
+    picked up by the next rebuild.
+    """
+    stmt = (
+        select(Movie.id, Movie.average_rating)
+        .order_by(Movie.title, Movie.id)
+        .execution_options(yield_per=REBUILD_BATCH_SIZE)
+    )
+    live_keys = [key for sort_by in INDEXED_SORTS for key in _all_keys(sort_by)]
+    filled: set[str] = set()
+    count = 0
+
+    async with get_redis_client() as redis:
+        await redis.delete(*(f"{key}:build" for key in live_keys))
+
+        result = await db.stream(stmt)
+        async for partition in result.partitions():
+            async with redis.pipeline(transaction=False) as pipe:
+                for movie_id, rating in partition:
+                    member = _member(movie_id)
+                    scores = {"id": movie_id, "rating": rating, "title": count}
+                    for sort_by, score in scores.items():
+                        keys = [index_key(sort_by)] + [
+                            index_key(sort_by, band)
+                            for band in RATING_BANDS
+                            if rating >= band
+                        ]
+                        for key in keys:
+                            pipe.zadd(f"{key}:build", {member: score})
+                            filled.add(key)
+                    count += 1
+                await pipe.execute()
+
+        async with redis.pipeline(transaction=True) as pipe:
+            for key in live_keys:
+                if key in filled:
+                    pipe.rename(f"{key}:build", key)
+                else:
+                    pipe.delete(key)
+            for sort_by in INDEXED_SORTS:
+                pipe.set(ready_key(sort_by), count)
+            await pipe.execute()
+
+    return count
@@ -0,0 +1,107 @@
+import hashlib
+
+import orjson
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import (
+    CATALOG,
+    RATING_NAMESPACES,
+    listing_namespaces,
+    versioned_key,
+)
+from app.core.config import settings
+from app.core.redis import get_redis_client
+from app.repositories.movie_repository import MovieRepository
+from app.schemas.movie import MovieFacets, MovieFilters
+
+COUNT_CACHE_TTL = 300
+FACET_CACHE_TTL = 300
+
+
+def filters_key(filters: MovieFilters | None) -> str:
+    """
+    Cache key part for a set of facet filters. Genre names are free text,
+    so the filters are hashed as JSON rather than joined with separators
+    ("A,B" and "A" + "B" must not share a key).
+    """
+    if not filters:
+        return "nofilter"
+    encoded = orjson.dumps((sorted(filters.genres), filters.year_from, filters.year_to))
+    return hashlib.blake2b(encoded, digest_size=12).hexdigest()
+
+
+async def get_movie_total(
+    db: AsyncSession,
+    include_total: bool = True,
+    min_rating: float = None,
+    search_query: str = None,
+    filters: MovieFilters | None = None,
+) -> tuple[int | None, str]:
+    """
+    Resolves `PageResponse.total` as cheaply as the request allows.
+    Returns (total, strategy), where strategy is one of:
+    - "none":      the client opted out with include_total=false.
+    - "estimated": planner estimate from pg_class, for unfiltered listings
+                   on catalogs large enough that count(*) hurts.
+    - "cached":    an exact count computed earlier for the same filters.
+    - "exact":     freshly counted (and cached for the next request).
+    """
+    if not include_total:
+        return None, "none"
+
+    repo = MovieRepository(db)
+
+    if min_rating is None and not search_query and not filters:
+        estimate = await repo.estimate_movie_count()
+        if estimate is not None and estimate >= settings.COUNT_ESTIMATE_THRESHOLD:
+            return estimate, "estimated"
+
+    async with get_redis_client() as redis:
+        cache_key = await versioned_key(
+            redis,
+            "movies:count",
+            listing_namespaces(min_rating=min_rating),
+            min_rating if min_rating is not None else "all",
+            search_query or "all",
+            filters_key(filters),
+        )
+        cached_total = await redis.get(cache_key)
+        if cached_total is not None:
+            return int(cached_total), "cached"
+
+    total = await repo.count_movies(
+        min_rating=min_rating, search_query=search_query, filters=filters
+    )
+
+    async with get_redis_client() as redis:
+        await redis.set(cache_key, total, ex=COUNT_CACHE_TTL)
+
+    return total, "exact"
+
+
+async def get_movie_facets(
+    db: AsyncSession, min_rating: float = None, filters: MovieFilters | None = None
+) -> MovieFacets:
+    """
+    Facet counts for browsing (no text query): SQL aggregates over the
+    movies matching the filters, cached per filter combination. Rating
+    writes change the rating range, so entries follow rating namespaces too.
+    """
+    async with get_redis_client() as redis:
+        cache_key = await versioned_key(
+            redis,
+            "movies:facets",
+            [CATALOG, *RATING_NAMESPACES],
+            min_rating if min_rating is not None else "all",
+            filters_key(filters),
+        )
+        cached = await redis.get(cache_key)
+        if cached is not None:
+            return MovieFacets.model_validate_json(cached)
+
+    facets = await MovieRepository(db).facet_counts(min_rating, filters)
+
+    async with get_redis_client() as redis:
+        await redis.set(cache_key, facets.model_dump_json(), ex=FACET_CACHE_TTL)
+
+    return facets
@@ -0,0 +1,34 @@
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import GENRES, CachedBody, get_or_load, versioned_key
+from app.core.redis import get_redis_client
+from app.models.movie import Genre
+from app.schemas.movie import GenreResponse
+
+GENRES_TTL = 3600
+
+# Genres are created by admins a few times a year; a short shared max-age
+# is plenty and keeps the list off the origin.
+GENRES_CACHE_CONTROL = "public, max-age=300, must-revalidate"
+
+genre_list_adapter = TypeAdapter(list[GenreResponse])
+
+
+async def list_genres_service(db: AsyncSession, skip: int, limit: int) -> CachedBody:
+    """
+    Returns the encoded genre list. Creating a genre bumps GENRES.
+    """
+    async with get_redis_client() as redis:
+        cache_key = await versioned_key(redis, "genres:list", [GENRES], skip, limit)
+
+    async def load(session: AsyncSession) -> bytes:
+        result = await session.execute(
+            select(Genre).order_by(Genre.id).offset(skip).limit(limit)
+        )
+        return genre_list_adapter.dump_json(
+            [GenreResponse.model_validate(genre) for genre in result.scalars().all()]
+        )
+
+    return await get_or_load(cache_key, load, db, ttl=GENRES_TTL)
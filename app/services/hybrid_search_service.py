@@ -0,0 +1,93 @@
+import asyncio
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.repositories.movie_repository import MovieRepository
+from app.services.ai_service import get_embedding
+from app.services.hydration_service import encode_movie_list, hydrate_movies
+from app.services.search_service import search_movies_in_meili
+
+# Standard RRF damping constant: keeps the top ranks of one retriever from
+# drowning out documents both retrievers agree on.
+RRF_K = 60
+# How many candidates each retriever contributes to the fusion.
+HYBRID_CANDIDATES = 50
+
+
+def reciprocal_rank_fusion(
+    rankings: list[tuple[list[int], float]], k: int = RRF_K
+) -> list[int]:
+    """
+    Fuses ranked ID lists, given as (ids, weight) pairs, by
+    score(id) = sum(weight / (k + rank)), rank starting at 1. Only ranks are
+    used, so BM25-style and cosine scores never need to be comparable.
+    Ties keep the order in which IDs were first seen.
+    """
+    scores: dict[int, float] = {}
+    for ids, weight in rankings:
+        for rank, movie_id in enumerate(ids, start=1):
+            scores[movie_id] = scores.get(movie_id, 0.0) + weight / (k + rank)
+    return sorted(scores, key=scores.get, reverse=True)
+
+
+async def _lexical_ids(query: str, limit: int) -> list[int]:
+    """
+    MeiliSearch, or Postgres full-text search while Meili is unavailable.
+    Not recorded as a popular search: the warmer only replays listing pages.
+    """
+    result = await search_movies_in_meili(query, limit=limit, record=False)
+    if result is not None:
+        return result["ids"]
+    async with AsyncSessionLocal() as session:
+        return await MovieRepository(session).search_movie_ids(query, limit)
+
+
+async def _semantic_ids(query: str, limit: int) -> list[int]:
+    # Encoding is CPU-bound; keep it off the event loop.
+    query_vector = await asyncio.to_thread(get_embedding, query)
+    async with AsyncSessionLocal() as session:
+        return await MovieRepository(session).get_semantic_ids(query_vector, limit)
+
+
+async def _run_leg(name: str, leg, timeout: float) -> list[int]:
+    try:
+        return await asyncio.wait_for(leg, timeout)
+    except asyncio.TimeoutError:
+        print(f"⚠️ Hybrid search: {name} retriever timed out after {timeout}s")
+    except Exception as e:
+        print(f"⚠️ Hybrid search: {name} retriever failed: {e}")
+    return []
+
+
+async def hybrid_search_service(
+    db: AsyncSession,
+    query: str,
+    limit: int,
+    lexical_weight: float = 1.0,
+    semantic_weight: float = 1.0,
+) -> bytes:
+    """
+    Encoded `list[MovieResponse]` for a query answered by keyword and
+    vector search at once. Both retrievers run concurrently, each on its
+    own session and with its own timeout; a leg that times out or fails is
+    dropped and the other one's ranking is returned. The fused IDs are
+    hydrated in one batch from the entity cache.
+    """
+    lexical, semantic = await asyncio.gather(
+        _run_leg(
+            "lexical",
+            _lexical_ids(query, HYBRID_CANDIDATES),
+            settings.HYBRID_LEXICAL_TIMEOUT,
+        ),
+        _run_leg(
+            "semantic",
+            _semantic_ids(query, HYBRID_CANDIDATES),
+            settings.HYBRID_SEMANTIC_TIMEOUT,
+        ),
+    )
+    fused = reciprocal_rank_fusion(
+        [(lexical, lexical_weight), (semantic, semantic_weight)]
+    )
+    return encode_movie_list(await hydrate_movies(db, fused[:limit]))
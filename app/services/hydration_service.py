@@ -0,0 +1,79 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.core.cache import CachedBody, get_many_or_load
+from app.models.movie import Movie
+from app.schemas.movie import MovieResponse, movie_projection
+
+MOVIE_DETAIL_TTL = 300
+MOVIE_NOT_FOUND_TTL = 30
+
+
+def movie_entity_key(movie_id: int) -> str:
+    return f"movies:entity:{movie_id}"
+
+
+def encode_movie(movie: Movie) -> bytes:
+    """The one encoding of a movie that every entity cache entry holds."""
+    return MovieResponse.model_validate(movie).model_dump_json().encode()
+
+
+def movie_entity(movie: Movie) -> tuple[bytes, float]:
+    """An entity cache value: the encoded movie, last modified at updated_at."""
+    return encode_movie(movie), movie.updated_at.timestamp()
+
+
+def project_movie(body: bytes, fields: frozenset[str] | None) -> bytes:
+    """Narrows an encoded movie to a sparse fieldset."""
+    if not fields:
+        return body
+    return movie_projection(fields).model_validate_json(body).model_dump_json().encode()
+
+
+def encode_movie_list(
+    movies: list[CachedBody], fields: frozenset[str] | None = None
+) -> bytes:
+    """
+    Joins encoded movies into a JSON array. Full bodies are joined as they
+    are; a sparse fieldset narrows each one first.
+    """
+    return (
+        b"[" + b",".join(project_movie(movie.body, fields) for movie in movies) + b"]"
+    )
+
+
+async def hydrate_movies(db: AsyncSession, movie_ids: list[int]) -> list[CachedBody]:
+    """
+    Turns an ordered list of movie IDs (from Meili, the trending job, a
+    similarity query...) into encoded movies in the same order.
+
+    Steady state is a single Redis MGET. Misses are loaded from Postgres in
+    one batched query and written back to the entity cache; IDs that no
+    longer exist are dropped from the result.
+    """
+    keys = {movie_entity_key(movie_id): movie_id for movie_id in movie_ids}
+
+    async def load(
+        session: AsyncSession, missing: list[str]
+    ) -> dict[str, tuple[bytes, float]]:
+        stmt = (
+            select(Movie)
+            .options(selectinload(Movie.genres))
+            .where(Movie.id.in_([keys[key] for key in missing]))
+        )
+        result = await session.execute(stmt)
+        return {
+            movie_entity_key(movie.id): movie_entity(movie)
+            for movie in result.scalars().all()
+        }
+
+    cached = await get_many_or_load(
+        list(keys),
+        load,
+        db,
+        ttl=MOVIE_DETAIL_TTL,
+        negative_ttl=MOVIE_NOT_FOUND_TTL,
+    )
+    found = dict(zip(keys.values(), cached))
+    return [found[movie_id] for movie_id in movie_ids if found[movie_id] is not None]
@@ -1,30 +1,121 @@
-import json
 import math
 
+import orjson
 from fastapi import HTTPException
-from fastapi.encoders import jsonable_encoder
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.core.cache import (
+    CATALOG,
+    MIN_RATING_FILTER,
+    RATING_NAMESPACES,
+    CachedBody,
+    TRENDING,
+    bump_generations,
+    fallback_key,
+    get_or_load,
+    invalidate_keys,
+    listing_namespaces,
+    versioned_key,
+)
+from app.core.config import settings
+from app.core.pagination import decode_cursor, encode_cursor
 from app.core.exceptions import MovieNotFoundException, NotAuthorizedException
 from app.core.redis import get_redis_client
 from app.repositories.movie_repository import MovieRepository
 from app.repositories.rating_repository import RatingRepository
 from app.models.movie import Movie
-from app.schemas.common import PageResponse
-from app.schemas.movie import MovieResponse, MovieCreate, MovieUpdate
+from app.schemas.movie import (
+    MovieResponse,
+    MovieCreate,
+    MovieFacets,
+    MovieFilters,
+    MoviePage,
+    MovieSearchHit,
+    MovieUpdate,
+    movie_projection,
+)
 from app.schemas.rating import RatingCreate
-from app.services.search_service import search_movies_in_meili
+from app.services.catalog_index_service import (
+    get_indexed_page,
+    remove_from_ordering_indexes,
+    update_ordering_indexes,
+)
+from app.services.count_service import filters_key, get_movie_facets, get_movie_total
+from app.services.hydration_service import (
+    MOVIE_DETAIL_TTL,
+    MOVIE_NOT_FOUND_TTL,
+    encode_movie_list,
+    hydrate_movies,
+    movie_entity,
+    movie_entity_key,
+    project_movie,
+)
+from app.services.autocomplete_service import publish_title_change
+from app.services.search_service import (
+    queue_index_removal,
+    queue_index_update,
+    search_filter,
+    search_movies_in_meili,
+)
+
+
+async def invalidate_movie_cache(*namespaces: str):
+    """
+    Invalidates cached movie data by bumping namespace generations.
+    Defaults to the whole catalog; rating writes pass RATING_NAMESPACES.
+    """
+    namespaces = namespaces or (CATALOG,)
+    await bump_generations(*namespaces)
+    print(f"🧹 Invalidated movie cache namespaces: {', '.join(namespaces)}")
+
+
+async def invalidate_movie_entities(*movie_ids: int):
+    """
+    Drops the cached detail body of exactly these movies. Call it after any
+    write that changes what `MovieResponse` shows for a movie (fields,
+    genres, rating aggregates) and after creating one, since its id may
+    have been cached as missing.
+    """
+    await invalidate_keys(*(movie_entity_key(movie_id) for movie_id in movie_ids))
+
+
+async def after_movie_write(
+    movie_id: int, average_rating: float, title: str, title_changed: bool = False
+):
+    """
+    Everything a created or edited movie has to reach once it is
+    committed: page caches, its entity entry, the ordering indexes, the
+    search index and (for a new or renamed title) every worker's
+    autocomplete index. Both the services and the endpoints call this, so
+    the list lives in one place.
+    """
+    await invalidate_movie_cache()
+    await invalidate_movie_entities(movie_id)
+    await update_ordering_indexes(movie_id, average_rating, title_changed=title_changed)
+    await queue_index_update(movie_id)
+    if title_changed:
+        await publish_title_change(movie_id, title)
 
 
-async def invalidate_movie_cache():
-    """Helper to clear all movie-related cache keys."""
-    async with get_redis_client() as redis:
-        keys = [key async for key in redis.scan_iter("movies:*")]
-        if keys:
-            await redis.delete(*keys)
-            print(f"🧹 Invalidated {len(keys)} movie cache keys.")
+async def after_movie_removal(movie_id: int):
+    """The `after_movie_write` counterpart for a deleted movie."""
+    await invalidate_movie_cache()
+    await invalidate_movie_entities(movie_id)
+    await remove_from_ordering_indexes(movie_id)
+    await queue_index_removal(movie_id)
+    await publish_title_change(movie_id, None)
+
+
+MOVIES_PAGE_TTL = 60
+TRENDING_TTL = 300
+
+# Writes invalidate our own cache instantly but can't purge the CDN, so
+# shared caches must revalidate catalog bodies on every request (a cheap
+# 304 while the ETag matches). Trending only changes when the job runs.
+CATALOG_CACHE_CONTROL = "public, max-age=0, must-revalidate"
+TRENDING_CACHE_CONTROL = "public, max-age=60, must-revalidate"
 
 
 async def get_all_movies_service(
@@ -35,70 +126,354 @@ async def get_all_movies_service(
     sort_by: str = "id",
     order: str = "asc",
     min_rating: float = None,
-) -> PageResponse[MovieResponse]:
-    cache_key = f"movies:{page}:{size}:{search_query or 'all'}:{sort_by}:{order}:{min_rating or 'none'}"
+    cursor: str = None,
+    include_total: bool = True,
+    fields: frozenset[str] | None = None,
+    filters: MovieFilters | None = None,
+    include_facets: bool = False,
+) -> CachedBody:
+    """
+    Returns the encoded `MoviePage[MovieResponse]` body for a listing,
+    narrowed to `fields` when a sparse fieldset is requested.
+    Cache hits never build Pydantic models; see `CachedBody.to_response`.
+    """
+    key_parts = (
+        page,
+        size,
+        search_query or "all",
+        sort_by,
+        order,
+        min_rating if min_rating is not None else "none",
+        cursor or "offset",
+        int(include_total),
+        _fields_key(fields),
+        filters_key(filters),
+        int(include_facets),
+    )
+
+    namespaces = listing_namespaces(sort_by, min_rating)
+    if include_facets:
+        namespaces.append(MIN_RATING_FILTER)  # the facets' rating range
 
     async with get_redis_client() as redis:
-        cached_data = await redis.get(cache_key)
-        if cached_data:
-            print(f"⚡ Cache HIT for {cache_key}")
-            return PageResponse(**json.loads(cached_data))
+        cache_key = await versioned_key(redis, "movies:list", namespaces, *key_parts)
+
+    async def load(session: AsyncSession) -> bytes:
+        response = await _load_movies_page(
+            session,
+            page,
+            size,
+            search_query,
+            sort_by,
+            order,
+            min_rating,
+            cursor,
+            include_total,
+            fields,
+            filters,
+            include_facets,
+        )
+        print(f"🐢 Cache MISS for {cache_key} - Loaded from Source")
+        return response.model_dump_json().encode()
+
+    return await get_or_load(
+        cache_key,
+        load,
+        db,
+        ttl=MOVIES_PAGE_TTL,
+        fallback_key=fallback_key("movies:list", *key_parts),
+    )
+
 
+async def _load_movies_page(
+    db: AsyncSession,
+    page: int,
+    size: int,
+    search_query: str,
+    sort_by: str,
+    order: str,
+    min_rating: float,
+    cursor: str,
+    include_total: bool,
+    fields: frozenset[str] | None = None,
+    filters: MovieFilters | None = None,
+    include_facets: bool = False,
+) -> MoviePage[MovieResponse]:
+    model = movie_projection(fields)
     items_data = []
     total = 0
+    total_strategy = "exact"
+    next_cursor = prev_cursor = None
+    facets = None
+
+    # The Redis ordering indexes only know rating bands, not facet filters.
+    indexed = None
+    if not search_query and not cursor and not filters:
+        indexed = await _load_indexed_page(
+            db, page, size, sort_by, order, min_rating, include_total, fields
+        )
 
-    if search_query:
-        offset = (page - 1) * size
-
+    search_result = None
+    if search_query and not cursor:
         search_result = await search_movies_in_meili(
-            search_query, limit=size, offset=offset
+            search_query,
+            limit=size,
+            offset=(page - 1) * size,
+            filters=search_filter(min_rating, filters),
+            facets=include_facets,
         )
+
+    if search_result is not None:
         movie_ids = search_result["ids"]
-        total = search_result["total"]
+        total = search_result["total"] if include_total else None
+        total_strategy = "estimated" if include_total else "none"
+        if include_facets:
+            facets = MovieFacets.model_validate(search_result["facets"])
 
         if movie_ids:
-            stmt = (
-                select(Movie)
-                .options(selectinload(Movie.genres))
-                .where(Movie.id.in_(movie_ids))
-            )
-            result = await db.execute(stmt)
-            movies = result.scalars().all()
-
-            movies_map = {m.id: m for m in movies}
-            ordered_movies = [movies_map[mid] for mid in movie_ids if mid in movies_map]
+            items_data = [
+                model.model_validate_json(movie.body)
+                for movie in await hydrate_movies(db, movie_ids)
+            ]
+
+    elif search_query:
+        items_data, total, total_strategy, next_cursor = await _search_in_postgres(
+            db,
+            search_query,
+            page,
+            size,
+            cursor,
+            min_rating,
+            include_total,
+            fields,
+            filters,
+        )
 
-            items_data = [MovieResponse.model_validate(item) for item in ordered_movies]
+    elif indexed:
+        items_data, total, total_strategy, next_cursor, prev_cursor = indexed
 
     else:
         repo = MovieRepository(db)
         skip = (page - 1) * size
 
-        items, total = await repo.get_all_movies(
+        items, next_cursor, prev_cursor = await repo.get_all_movies(
             skip=skip,
             limit=size,
             sort_by=sort_by,
             order=order,
             min_rating=min_rating,
             search_query=None,
+            cursor=cursor,
+            from_catalog=settings.LISTINGS_FROM_CATALOG_VIEW,
+            fields=fields,
+            filters=filters,
+        )
+        items_data = [model.model_validate(item) for item in items]
+
+        total, total_strategy = await get_movie_total(
+            db, include_total=include_total, min_rating=min_rating, filters=filters
         )
-        items_data = [MovieResponse.model_validate(item) for item in items]
 
-    total_pages = math.ceil(total / size) if size > 0 else 0
+    if include_facets and not search_query:
+        facets = await get_movie_facets(db, min_rating, filters)
+
+    total_pages = None
+    if total is not None:
+        total_pages = math.ceil(total / size) if size > 0 else 0
+
+    return MoviePage(
+        items=items_data,
+        total=total,
+        page=page,
+        size=size,
+        pages=total_pages,
+        total_strategy=total_strategy,
+        next_cursor=next_cursor,
+        prev_cursor=prev_cursor,
+        facets=facets,
+    )
+
+
+async def _search_in_postgres(
+    db: AsyncSession,
+    search_query: str,
+    page: int,
+    size: int,
+    cursor: str,
+    min_rating: float,
+    include_total: bool,
+    fields: frozenset[str] | None = None,
+    filters: MovieFilters | None = None,
+):
+    """
+    Degraded mode for searches while MeiliSearch is unavailable (or not
+    configured): ranked Postgres full-text search with highlighted
+    snippets, walked by relevance cursors. Queries with no full-text match
+    at all (partial words) fall back to substring matching. Facet counts
+    are left out here; they come back with Meili.
+    """
+    print("⚠️ Search engine unavailable - searching in Postgres")
+    repo = MovieRepository(db)
+    after = decode_cursor(cursor, "relevance", "desc") if cursor else None
+    skip = 0 if after else (page - 1) * size
+    next_cursor = None
 
-    response = PageResponse(
-        items=items_data, total=total, page=page, size=size, pages=total_pages
+    if after or await repo.has_text_matches(search_query, min_rating, filters):
+        rows = await repo.search_movies(
+            search_query, size + 1, skip, after, min_rating, filters
+        )
+        if len(rows) > size:
+            rows = rows[:size]
+            last, rank, _ = rows[-1]
+            next_cursor = encode_cursor("relevance", "desc", rank, last.id)
+
+        items = []
+        for movie, _, snippet in rows:
+            hit = MovieSearchHit.model_validate(movie)
+            hit.snippet = snippet
+            items.append(hit)
+        count = repo.count_text_matches
+    else:
+        movies = await repo.search_movies_by_substring(
+            search_query, size, skip, min_rating, filters
+        )
+        items = [MovieSearchHit.model_validate(movie) for movie in movies]
+        count = repo.count_substring_matches
+
+    if fields:
+        model = movie_projection(fields)
+        items = [model.model_validate(item) for item in items]
+
+    if not include_total:
+        return items, None, "none", next_cursor
+    total = await count(search_query, min_rating, filters)
+    return items, total, "exact", next_cursor
+
+
+async def get_movie_detail_service(
+    db: AsyncSession, movie_id: int, fields: frozenset[str] | None = None
+) -> CachedBody:
+    """
+    Returns the encoded `MovieResponse` body for one movie from the entity
+    cache. Entries are dropped one by one by `invalidate_movie_entities`;
+    unknown ids are remembered for MOVIE_NOT_FOUND_TTL seconds.
+
+    The entity cache only holds full bodies, so one invalidation covers
+    every fieldset; a sparse fieldset is cut from it per request.
+    """
+
+    async def load(session: AsyncSession) -> tuple[bytes, float] | None:
+        stmt = (
+            select(Movie)
+            .options(selectinload(Movie.genres))
+            .where(Movie.id == movie_id)
+        )
+        result = await session.execute(stmt)
+        movie = result.scalars().first()
+        if not movie:
+            return None
+        return movie_entity(movie)
+
+    cached = await get_or_load(
+        movie_entity_key(movie_id),
+        load,
+        db,
+        ttl=MOVIE_DETAIL_TTL,
+        negative_ttl=MOVIE_NOT_FOUND_TTL,
     )
+    if cached is None:
+        raise HTTPException(status_code=404, detail="Movie not found")
+    if fields:
+        return cached.derive(project_movie(cached.body, fields))
+    return cached
+
+
+async def _load_indexed_page(
+    db: AsyncSession,
+    page: int,
+    size: int,
+    sort_by: str,
+    order: str,
+    min_rating: float,
+    include_total: bool,
+    fields: frozenset[str] | None = None,
+):
+    """
+    Offset page served from the Redis ordering indexes plus hydration,
+    so Postgres only sees the entity-cache misses. Returns None when the
+    indexes can't answer this combination.
+    """
+    skip = (page - 1) * size
+    indexed = await get_indexed_page(sort_by, order, min_rating, skip, size)
+    if indexed is None:
+        return None
+
+    movie_ids, total = indexed
+    items = [
+        MovieResponse.model_validate_json(movie.body)
+        for movie in await hydrate_movies(db, movie_ids)
+    ]
+
+    # Same cursors the keyset path would hand out, so clients can switch
+    # to cursor paging from any offset page.
+    next_cursor = prev_cursor = None
+    if items:
+        if skip + size < total:
+            last = items[-1]
+            next_cursor = encode_cursor(
+                sort_by, order, _sort_value(sort_by, last), last.id, "next"
+            )
+        if skip > 0:
+            first = items[0]
+            prev_cursor = encode_cursor(
+                sort_by, order, _sort_value(sort_by, first), first.id, "prev"
+            )
+
+    if fields:
+        model = movie_projection(fields)
+        items = [model.model_validate(item) for item in items]
+
+    if not include_total:
+        return items, None, "none", next_cursor, prev_cursor
+    return items, total, "exact", next_cursor, prev_cursor
+
+
+def _fields_key(fields: frozenset[str] | None) -> str:
+    return ",".join(sorted(fields)) if fields else "all"
 
+
+def _sort_value(sort_by: str, movie: MovieResponse):
+    if sort_by == "rating":
+        return movie.average_rating
+    if sort_by == "title":
+        return movie.title
+    return movie.id
+
+
+async def get_trending_movies_service(
+    db: AsyncSession, fields: frozenset[str] | None = None
+) -> CachedBody:
+    """
+    Top trending movies, in the order picked by the Celery trending job.
+    The job bumps the TRENDING namespace whenever it publishes new IDs.
+    """
     async with get_redis_client() as redis:
-        await redis.set(
-            cache_key,
-            json.dumps(jsonable_encoder(response)),
-            ex=60,
+        cache_key = await versioned_key(
+            redis, "movies:trending", [CATALOG, TRENDING], _fields_key(fields)
         )
-        print(f"🐢 Cache MISS for {cache_key} - Loaded from Source")
 
-    return response
+    async def load(session: AsyncSession) -> bytes:
+        async with get_redis_client() as redis:
+            cached_data = await redis.get("trending_movies")
+
+        if not cached_data:
+            print("⚠️ Cache Miss! (Worker hasn't run yet)")
+            return b"[]"
+
+        movie_ids = orjson.loads(cached_data).get("movie_ids", [])
+        return encode_movie_list(await hydrate_movies(session, movie_ids), fields)
+
+    return await get_or_load(cache_key, load, db, ttl=TRENDING_TTL)
 
 
 async def create_movie_service(
@@ -107,7 +482,9 @@ async def create_movie_service(
     repo = MovieRepository(db)
     new_movie = await repo.create_movie(movie, user_id)
 
-    await invalidate_movie_cache()
+    await after_movie_write(
+        new_movie.id, new_movie.average_rating, new_movie.title, title_changed=True
+    )
 
     return new_movie
 
@@ -134,7 +511,12 @@ async def update_movie_service(
 
     updated_movie = await repo.update_movie(movie, update_data)
 
-    await invalidate_movie_cache()
+    await after_movie_write(
+        movie_id,
+        updated_movie.average_rating,
+        updated_movie.title,
+        title_changed=update_data.title is not None,
+    )
 
     return updated_movie
 
@@ -151,7 +533,7 @@ async def delete_movie_service(movie_id: int, user_id: int, db: AsyncSession) ->
 
     await repo.delete_movie(movie)
 
-    await invalidate_movie_cache()
+    await after_movie_removal(movie_id)
 
 
 async def rate_movie_service(
@@ -166,21 +548,78 @@ async def rate_movie_service(
     existing_rating = await rating_repo.get_rating(user_id, movie_id)
 
     if existing_rating:
-        updated_rating = await rating_repo.update_rating(
-            existing_rating, rating_data.score
-        )
-        return updated_rating
+        rating = await rating_repo.update_rating(existing_rating, rating_data.score)
     else:
-        new_rating = await rating_repo.create_rating(
-            user_id, movie_id, rating_data.score
-        )
-        return new_rating
+        rating = await rating_repo.create_rating(user_id, movie_id, rating_data.score)
+
+    await invalidate_movie_cache(*RATING_NAMESPACES)
+    await invalidate_movie_entities(movie_id)
+    await _reindex_rating(db, movie_id)
+
+    return rating
+
+
+async def delete_rating_service(movie_id: int, user_id: int, db: AsyncSession) -> None:
+    rating_repo = RatingRepository(db)
+    rating = await rating_repo.get_rating(user_id, movie_id)
+    if not rating:
+        raise HTTPException(status_code=404, detail="Rating not found")
+
+    await rating_repo.delete_rating(rating)
 
+    await invalidate_movie_cache(*RATING_NAMESPACES)
+    await invalidate_movie_entities(movie_id)
+    await _reindex_rating(db, movie_id)
 
-async def get_recommendations_service(movie_id: int, db: AsyncSession):
+
+async def _reindex_rating(db: AsyncSession, movie_id: int) -> None:
+    """
+    Moves a movie to its new place in the rating orderings and bands, and
+    queues its search document (which carries the rating) for reindexing.
+    """
+    average_rating = await db.scalar(
+        select(Movie.average_rating).where(Movie.id == movie_id)
+    )
+    if average_rating is not None:
+        await update_ordering_indexes(movie_id, average_rating)
+        await queue_index_update(movie_id)
+
+
+async def reconcile_rating_aggregates_service(db: AsyncSession) -> int:
+    """
+    Repairs drifted rating aggregates, then applies the same side effects
+    as a rating write to every repaired movie. Returns how many were fixed.
+    """
+    repaired = await RatingRepository(db).reconcile_aggregates()
+    if not repaired:
+        return 0
+
+    await invalidate_movie_cache(*RATING_NAMESPACES)
+    await invalidate_movie_entities(*(movie_id for movie_id, _ in repaired))
+    for movie_id, average_rating in repaired:
+        await update_ordering_indexes(movie_id, average_rating)
+        await queue_index_update(movie_id)
+    return len(repaired)
+
+
+async def get_recommendations_service(movie_id: int, db: AsyncSession) -> bytes:
     repo = MovieRepository(db)
     movie = await repo.get_by_id(movie_id)
     if not movie:
         raise HTTPException(status_code=404, detail="Movie not found")
 
-    return await repo.get_recommendations(movie_id)
+    movie_ids = await repo.get_recommendations(movie_id)
+    return encode_movie_list(await hydrate_movies(db, movie_ids))
+
+
+async def get_similar_movies_service(
+    movie_id: int, limit: int, db: AsyncSession
+) -> bytes:
+    """
+    Encoded `list[MovieResponse]` of the movies closest to `movie_id` by
+    embedding. Only the IDs come from the vector query; the bodies come
+    from the entity cache.
+    """
+    repo = MovieRepository(db)
+    movie_ids = await repo.get_similar_movie_ids(movie_id, limit)
+    return encode_movie_list(await hydrate_movies(db, movie_ids))
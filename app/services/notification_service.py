@@ -1,4 +1,4 @@
-import json
+import orjson
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.models.notification import NotificationModel
@@ -17,7 +17,7 @@ class NotificationService:
             redis_client = get_redis_client()
 
             payload = {"user_id": user_id, "message": message}
-            await redis_client.publish("notifications", json.dumps(payload))
+            await redis_client.publish("notifications", orjson.dumps(payload))
 
             await redis_client.close()
 
@@ -1,123 +1,508 @@
-from app.core.search import get_search_client
+import hashlib
+import re
+import time
+from datetime import UTC, datetime, timedelta
+
+import orjson
+from prometheus_client import Gauge
+from redis.exceptions import ResponseError
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.core.cache import SEARCH, bump_generations, get_or_load, prime, versioned_key
+from app.core.celery_app import celery_app
+from app.core.redis import get_redis_client
+from app.core.search import SearchError, get_search_client, search_enabled
 from app.models.movie import Movie
+from app.schemas.movie import MovieFilters
 from app.schemas.search import MovieSearchDoc
 
 INDEX_NAME = "movies"
 
+# Search results are cached briefly: index writes bump the SEARCH
+# namespace, but Meili applies them asynchronously, so the TTL bounds how
+# long a result can trail the index.
+SEARCH_TTL = 60
+
+# First-page searches are counted here (member "<limit>:<query>") and the
+# warmer keeps the top ones cached. Scores decay on every warmer run, so
+# the ranking follows what is being searched now.
+POPULAR_SEARCHES_KEY = "search:popular"
+POPULAR_SEARCHES_WARMED = 20
+POPULAR_SEARCHES_KEPT = 500
+POPULAR_SEARCHES_DECAY = 0.9
+
+# Index writes from the API are buffered in a hash (movie id -> "upsert" or
+# "delete"), so repeated edits of one movie collapse into one entry, and
+# drained by the flush_search_index task a few seconds later.
+PENDING_INDEX_KEY = "search:pending"
+FLUSHING_INDEX_KEY = "search:pending:flushing"
+FLUSH_SCHEDULED_KEY = "search:pending:scheduled"
+FLUSH_DELAY_SECONDS = 2
+FLUSH_SCHEDULED_TTL = 60
+INDEX_BATCH_SIZE = 500
+
+# Reindexing. The watermark is the database time the last run started;
+# the overlap re-sends rows committed by transactions that were still open
+# then (their updated_at predates the watermark). Upserts are idempotent.
+REINDEX_BATCH_SIZE = 1000
+REINDEX_WATERMARK_KEY = "search:reindex:watermark"
+REINDEX_WATERMARK_OVERLAP = timedelta(minutes=5)
+SHADOW_INDEX_NAME = f"{INDEX_NAME}_rebuild"
+
+# Facet counts asked of Meili for a filter sidebar. Only the stats
+# (min/max) of the numeric rating are used, not its distribution.
+FACET_ATTRIBUTES = ["genres", "release_year", "rating"]
+
+# Consistency check: Postgres and Meili are compared in id windows of this
+# many movies; the last report is kept in Redis for whoever runs it last.
+CONSISTENCY_BATCH_SIZE = 1000
+CONSISTENCY_REPORT_KEY = "search:consistency:last"
+# Making `id` filterable on an existing index rebuilds its filter data.
+CONSISTENCY_SETTINGS_TIMEOUT = 600
+
+SEARCH_DRIFT = Gauge(
+    "fastflix_search_drift_documents",
+    "Search documents found out of sync with Postgres by the last check.",
+    ["kind"],
+)
+
+_PUNCTUATION = re.compile(r"[^\w\s]+")
+
+
+def _search_document(movie: Movie) -> dict:
+    document = MovieSearchDoc(
+        id=movie.id,
+        title=movie.title,
+        description=movie.description,
+        release_year=movie.release_year,
+        rating=movie.average_rating or 0.0,
+        thumbnail_url=movie.thumbnail_url,
+        slug=movie.slug,
+        genres=[g.name for g in movie.genres],
+    ).model_dump(exclude={"content_hash"})
+    document["content_hash"] = content_hash(document)
+    return document
+
 
-async def configure_search_index():
+def content_hash(document: dict) -> str:
     """
-    Sets up the index settings:
+    Fingerprint of a search document's content, stored in the document so
+    the consistency check can compare both sides without the bodies.
+    """
+    fields = {key: value for key, value in document.items() if key != "content_hash"}
+    return hashlib.blake2b(
+        orjson.dumps(fields, option=orjson.OPT_SORT_KEYS), digest_size=16
+    ).hexdigest()
+
+
+async def configure_search_index(index: str = INDEX_NAME) -> dict | None:
+    """
+    Sets up the index settings (returns the enqueued Meili task):
     - Searchable: Fields to match against (Title, Description).
-    - Filterable: Fields to filter by (Year, Genre).
+    - Filterable: Fields to filter and facet by (Genre, Year, Rating), and
+      the ID, which the consistency check pages by.
     - Sortable: Fields to sort by (Rating, Year).
     """
     client = get_search_client()
     if not client:
-        return
-
-    index = client.index(INDEX_NAME)
+        return None
 
-    index.update_filterable_attributes(["genres", "release_year", "rating"])
+    task = await client.update_settings(
+        index,
+        {
+            "filterableAttributes": ["id", "genres", "release_year", "rating"],
+            "sortableAttributes": ["rating", "release_year"],
+        },
+    )
 
-    index.update_sortable_attributes(["rating", "release_year"])
+    print(f"✅ MeiliSearch Index '{index}' configured.")
+    return task
 
-    print(f"✅ MeiliSearch Index '{INDEX_NAME}' configured.")
 
-
-async def add_movies_to_search(movies: list[Movie]):
+async def reindex_movies(db: AsyncSession, full: bool = False) -> int:
     """
-    Transforms SQL Movie models into Search Documents and uploads them.
+    Streams movies from Postgres into MeiliSearch in REINDEX_BATCH_SIZE
+    batches through a server-side cursor, so memory stays flat however big
+    the catalog is. Returns the number of documents sent.
+
+    Incremental (default): only movies whose updated_at is past the stored
+    watermark, less a small overlap. Full: everything, built into a shadow
+    index that is then swapped with the live one, so searches never see a
+    half-built index. Meili runs its tasks in the order they are enqueued,
+    so the swap happens after the last batch is indexed.
     """
     client = get_search_client()
     if not client:
-        return
+        print("⚠️ Search is not configured; nothing to reindex.")
+        return 0
 
-    documents = []
-    for movie in movies:
-        doc = MovieSearchDoc(
-            id=movie.id,
-            title=movie.title,
-            description=movie.description,
-            release_year=movie.release_year,
-            rating=movie.average_rating or 0.0,
-            thumbnail_url=movie.thumbnail_url,
-            slug=movie.slug,
-            genres=[g.name for g in movie.genres],
-        )
-        documents.append(doc.model_dump())
+    started_at = await db.scalar(select(func.now()))
+    stmt = (
+        select(Movie)
+        .options(selectinload(Movie.genres))
+        .order_by(Movie.id)
+        .execution_options(yield_per=REINDEX_BATCH_SIZE)
+    )
 
-    if documents:
-        task = client.index(INDEX_NAME).add_documents(documents)
-        print(
-            f"🚀 Sent {len(documents)} movies to search engine (Task UID: {task.task_uid})"
-        )
+    target = INDEX_NAME
+    if full:
+        target = SHADOW_INDEX_NAME
+        await client.delete_index(target)  # leftovers of an interrupted rebuild
+        await client.create_index(target)
+        await configure_search_index(target)
+    else:
+        async with get_redis_client() as redis:
+            watermark = await redis.get(REINDEX_WATERMARK_KEY)
+        if watermark:
+            since = datetime.fromisoformat(watermark) - REINDEX_WATERMARK_OVERLAP
+            stmt = stmt.where(Movie.updated_at > since)
+            print(f"🔖 Reindexing movies updated since {since.isoformat()}")
+
+    sent, clock = 0, time.monotonic()
+    result = await db.stream(stmt)
+    async for movies in result.scalars().partitions():
+        await client.add_documents(target, [_search_document(m) for m in movies])
+        sent += len(movies)
+        rate = sent / max(time.monotonic() - clock, 1e-6)
+        print(f"📦 {sent} movies sent to '{target}' ({rate:,.0f} docs/sec)")
+
+    if full:
+        await client.create_index(INDEX_NAME)  # a swap needs both sides to exist
+        await client.swap_indexes(INDEX_NAME, SHADOW_INDEX_NAME)
+        await client.delete_index(SHADOW_INDEX_NAME)
+        print(f"🔀 Swapped '{SHADOW_INDEX_NAME}' into '{INDEX_NAME}'")
 
+    async with get_redis_client() as redis:
+        await redis.set(REINDEX_WATERMARK_KEY, started_at.isoformat())
+    if sent or full:
+        await bump_generations(SEARCH)
+    return sent
 
-async def search_movies_in_meili(query: str, limit: int = 10, offset: int = 0):
+
+def normalize_query(query: str) -> str:
     """
-    Searches MeiliSearch and returns a dictionary with IDs and Total count.
+    Folds case, punctuation and runs of whitespace, so "The Matrix!" and
+    "  the matrix" share one cache entry (and one Meili query).
     """
-    client = get_search_client()
-    if not client:
-        return {"ids": [], "total": 0}
+    return " ".join(_PUNCTUATION.sub(" ", query.casefold()).split())
+
+
+def search_filter(
+    min_rating: float = None, filters: MovieFilters | None = None
+) -> str | None:
+    """
+    The Meili filter expression for listing filters, e.g.
+    `genres IN ["Drama", "Noir"] AND release_year >= 1990 AND rating >= 7`.
+    """
+    clauses = []
+    if filters and filters.genres:
+        names = ", ".join(orjson.dumps(name).decode() for name in filters.genres)
+        clauses.append(f"genres IN [{names}]")
+    if filters and filters.year_from is not None:
+        clauses.append(f"release_year >= {filters.year_from}")
+    if filters and filters.year_to is not None:
+        clauses.append(f"release_year <= {filters.year_to}")
+    if min_rating is not None:
+        clauses.append(f"rating >= {min_rating}")
+    return " AND ".join(clauses) or None
+
+
+async def search_movies_in_meili(
+    query: str,
+    limit: int = 10,
+    offset: int = 0,
+    filters: str | None = None,
+    facets: bool = False,
+    record: bool = True,
+):
+    """
+    Searches MeiliSearch and returns a dictionary with IDs and Total count,
+    plus `facets` (shaped like `MovieFacets`) when asked for.
+    Results are cached per normalized query, page and filter expression.
+    Returns None when Meili is not configured or unreachable, so callers
+    can fall back to Postgres.
+
+    First-page listing searches count towards the popular searches that
+    `warm_popular_searches` keeps warm; other callers pass `record=False`.
+    """
+    if not get_search_client():
+        return None
+
+    normalized = normalize_query(query)
+    if record and offset == 0 and not filters:
+        async with get_redis_client() as redis:
+            await redis.zincrby(POPULAR_SEARCHES_KEY, 1, f"{limit}:{normalized}")
 
     try:
-        results = client.index(INDEX_NAME).search(
-            query,
-            {
-                "limit": limit,
-                "offset": offset,
-                "attributesToRetrieve": ["id"],
-            },
-        )
+        cached = await _cached_search(normalized, limit, offset, filters, facets)
+    except SearchError as e:
+        print(f"⚠️ Search failed: {e}")
+        return None
+
+    return orjson.loads(cached.body)
+
+
+async def _cached_search(
+    normalized: str,
+    limit: int,
+    offset: int,
+    filters: str | None,
+    facets: bool = False,
+    warm: bool = False,
+):
+    client = get_search_client()
+    params = {"limit": limit, "offset": offset, "attributesToRetrieve": ["id"]}
+    if filters:
+        params["filter"] = filters
+    if facets:
+        params["facets"] = FACET_ATTRIBUTES
 
+    async def load(_):
+        results = await client.search(INDEX_NAME, normalized, params)
         hits = results.get("hits", [])
         total = results.get("estimatedTotalHits", 0)
+        data = {"ids": [hit["id"] for hit in hits], "total": total}
+        if facets:
+            distribution = results.get("facetDistribution", {})
+            data["facets"] = {
+                "genres": distribution.get("genres", {}),
+                "release_year": distribution.get("release_year", {}),
+                "rating": results.get("facetStats", {}).get("rating"),
+            }
+        return orjson.dumps(data)
 
-        return {"ids": [hit["id"] for hit in hits], "total": total}
-    except Exception as e:
-        print(f"⚠️ Search failed: {e}")
-        return {"ids": [], "total": 0}
+    async with get_redis_client() as redis:
+        cache_key = await versioned_key(
+            redis,
+            "search",
+            [SEARCH],
+            limit,
+            offset,
+            filters or "-",
+            int(facets),
+            normalized,
+        )
+
+    if warm:
+        return await prime(cache_key, load, None, ttl=SEARCH_TTL)
+    return await get_or_load(cache_key, load, None, ttl=SEARCH_TTL)
+
+
+async def warm_popular_searches() -> int:
+    """
+    Re-runs the most frequent recent first-page searches so their cache
+    entries are fresh when users ask again, then decays and trims the
+    counters. Returns the number of searches warmed.
+    """
+    async with get_redis_client() as redis:
+        members = await redis.zrevrange(
+            POPULAR_SEARCHES_KEY, 0, POPULAR_SEARCHES_WARMED - 1
+        )
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.zunionstore(
+                POPULAR_SEARCHES_KEY, {POPULAR_SEARCHES_KEY: POPULAR_SEARCHES_DECAY}
+            )
+            pipe.zremrangebyrank(POPULAR_SEARCHES_KEY, 0, -POPULAR_SEARCHES_KEPT - 1)
+            await pipe.execute()
+
+    warmed = 0
+    for member in members:
+        limit, _, normalized = member.partition(":")
+        try:
+            await _cached_search(normalized, int(limit), 0, None, warm=True)
+            warmed += 1
+        except SearchError as e:
+            print(f"⚠️ Failed to warm search '{normalized}': {e}")
+    return warmed
 
 
-def index_movie(movie: Movie):
+async def queue_index_update(movie_id: int):
     """
-    Adds or Updates a SINGLE movie in MeiliSearch.
-    This is synchronous, intended to be run in a BackgroundTask.
+    Marks a movie for (re)indexing. The flush task reads its state from
+    Postgres when it runs, so any number of edits in between cost one
+    document upload.
+    """
+    await _queue_index_write(movie_id, "upsert")
+
+
+async def queue_index_removal(movie_id: int):
+    """Marks a deleted movie for removal from the search index."""
+    await _queue_index_write(movie_id, "delete")
+
+
+async def _queue_index_write(movie_id: int, operation: str):
+    await _queue_index_writes({movie_id: operation})
+
+
+async def _queue_index_writes(operations: dict[int, str]):
+    if not search_enabled() or not operations:
+        return
+
+    async with get_redis_client() as redis:
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.hset(
+                PENDING_INDEX_KEY,
+                mapping={str(movie_id): op for movie_id, op in operations.items()},
+            )
+            pipe.set(FLUSH_SCHEDULED_KEY, 1, nx=True, ex=FLUSH_SCHEDULED_TTL)
+            _, schedule = await pipe.execute()
+
+    # One flush per burst of writes; later writes join the pending hash.
+    if schedule:
+        celery_app.send_task("flush_search_index", countdown=FLUSH_DELAY_SECONDS)
+
+
+async def flush_index_queue(db: AsyncSession) -> tuple[int, int]:
+    """
+    Drains the pending index writes into MeiliSearch in batches: upserts
+    with the movie as it is now, deletes for movies that are gone.
+    Returns (documents upserted, documents deleted).
+
+    The queue is swapped out with RENAME before it is read, so writes that
+    arrive meanwhile wait for the next flush. If Meili fails, the swapped
+    out hash stays in place and the next attempt sends it again; every
+    operation is idempotent.
     """
     client = get_search_client()
     if not client:
-        return
+        return 0, 0
 
-    try:
-        doc = MovieSearchDoc(
-            id=movie.id,
-            title=movie.title,
-            description=movie.description,
-            release_year=movie.release_year,
-            rating=movie.average_rating or 0.0,
-            thumbnail_url=movie.thumbnail_url,
-            slug=movie.slug,
-            genres=[g.name for g in movie.genres],
+    async with get_redis_client() as redis:
+        await redis.delete(FLUSH_SCHEDULED_KEY)
+        if not await redis.exists(FLUSHING_INDEX_KEY):
+            try:
+                await redis.rename(PENDING_INDEX_KEY, FLUSHING_INDEX_KEY)
+            except ResponseError:
+                return 0, 0  # nothing queued
+        operations = await redis.hgetall(FLUSHING_INDEX_KEY)
+
+    upsert_ids = sorted(int(key) for key, op in operations.items() if op == "upsert")
+    delete_ids = {int(key) for key, op in operations.items() if op == "delete"}
+
+    documents = []
+    for start in range(0, len(upsert_ids), INDEX_BATCH_SIZE):
+        batch = upsert_ids[start : start + INDEX_BATCH_SIZE]
+        result = await db.execute(
+            select(Movie).options(selectinload(Movie.genres)).where(Movie.id.in_(batch))
         )
+        movies = result.scalars().all()
+        documents.extend(_search_document(movie) for movie in movies)
+        delete_ids.update(set(batch) - {movie.id for movie in movies})
+
+    for start in range(0, len(documents), INDEX_BATCH_SIZE):
+        await client.add_documents(
+            INDEX_NAME, documents[start : start + INDEX_BATCH_SIZE]
+        )
+    delete_ids = sorted(delete_ids)
+    for start in range(0, len(delete_ids), INDEX_BATCH_SIZE):
+        await client.delete_documents(
+            INDEX_NAME, delete_ids[start : start + INDEX_BATCH_SIZE]
+        )
+
+    await bump_generations(SEARCH)
+    async with get_redis_client() as redis:
+        await redis.delete(FLUSHING_INDEX_KEY)
+
+    return len(documents), len(delete_ids)
+
 
-        client.index(INDEX_NAME).add_documents([doc.model_dump()])
-        print(f"🔄 Search Index Updated: {movie.title}")
-    except Exception as e:
-        print(f"⚠️ Failed to index movie {movie.id}: {e}")
+async def _index_hashes(client, filter_expr: str | None) -> dict[int, str | None]:
+    """(id -> content_hash) of the indexed documents matching `filter_expr`."""
+    hashes, offset = {}, 0
+    while True:
+        params = {
+            "fields": ["id", "content_hash"],
+            "limit": CONSISTENCY_BATCH_SIZE,
+            "offset": offset,
+        }
+        if filter_expr:
+            params["filter"] = filter_expr
+        page = (await client.fetch_documents(INDEX_NAME, params)).get("results", [])
+        hashes.update((doc["id"], doc.get("content_hash")) for doc in page)
+        if len(page) < CONSISTENCY_BATCH_SIZE:
+            return hashes
+        offset += len(page)
 
 
-def remove_movie_from_index(movie_id: int):
+async def check_index_consistency(db: AsyncSession, repair: bool = True) -> dict:
     """
-    Removes a movie from the search index.
+    Compares the search index with Postgres without a reindex. Movies are
+    streamed in id order in CONSISTENCY_BATCH_SIZE batches; each batch is
+    an id window (after the previous batch, up to its last id) that is
+    fetched from Meili as (id, content_hash) only, and the two sides are
+    diffed:
+    - missing:  in Postgres, not in the index
+    - stale:    in both, with a different content hash
+    - orphaned: in the index, not in Postgres (including ids past the last
+                movie)
+
+    With `repair`, the divergent ids go through the index write buffer, so
+    the flush task sends them with their current state and a concurrent
+    edit is never overwritten by what this scan read. Repair costs follow
+    the drift, not the catalog size. Returns the counts, which are also
+    exported as metrics and kept in Redis.
+
+    The index settings are reapplied (and waited for) first: an index
+    created before `id` was filterable can't be paged by id window. On
+    such an index the documents also have no content hash yet, so the
+    first run reports every document as stale and queues one full
+    re-upsert; from then on only real drift is sent.
     """
     client = get_search_client()
     if not client:
-        return
+        print("⚠️ Search is not configured; nothing to check.")
+        return {}
 
-    try:
-        client.index(INDEX_NAME).delete_document(str(movie_id))
-        print(f"🗑️ Search Index Deleted: ID {movie_id}")
-    except Exception as e:
-        print(f"⚠️ Failed to remove movie {movie_id} from index: {e}")
+    task = await configure_search_index(INDEX_NAME)
+    await client.wait_for_task(task["taskUid"], timeout=CONSISTENCY_SETTINGS_TIMEOUT)
+
+    report = {"checked": 0, "missing": 0, "stale": 0, "orphaned": 0}
+    stmt = (
+        select(Movie)
+        .options(selectinload(Movie.genres))
+        .order_by(Movie.id)
+        .execution_options(yield_per=CONSISTENCY_BATCH_SIZE)
+    )
+
+    async def compare(expected: dict[int, str], window: str | None):
+        indexed = await _index_hashes(client, window)
+        operations = {}
+        for movie_id, digest in expected.items():
+            if movie_id not in indexed:
+                report["missing"] += 1
+                operations[movie_id] = "upsert"
+            elif indexed[movie_id] != digest:
+                report["stale"] += 1
+                operations[movie_id] = "upsert"
+        for movie_id in indexed.keys() - expected.keys():
+            report["orphaned"] += 1
+            operations[movie_id] = "delete"
+        report["checked"] += len(expected)
+        if repair:
+            await _queue_index_writes(operations)
+
+    last_id = None
+    result = await db.stream(stmt)
+    async for movies in result.scalars().partitions():
+        window = f"id <= {movies[-1].id}"
+        if last_id is not None:
+            window = f"id > {last_id} AND {window}"
+        await compare(
+            {movie.id: _search_document(movie)["content_hash"] for movie in movies},
+            window,
+        )
+        last_id = movies[-1].id
+
+    # Whatever is indexed past the last movie is left over from deletes.
+    await compare({}, f"id > {last_id}" if last_id is not None else None)
+
+    for kind in ("missing", "stale", "orphaned"):
+        SEARCH_DRIFT.labels(kind).set(report[kind])
+    async with get_redis_client() as redis:
+        await redis.set(
+            CONSISTENCY_REPORT_KEY,
+            orjson.dumps({**report, "checked_at": datetime.now(UTC).isoformat()}),
+        )
+    return report
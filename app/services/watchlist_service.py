@@ -1,6 +1,7 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.repositories.watchlist_repository import WatchlistRepository
 from app.repositories.movie_repository import MovieRepository
+from app.schemas.movie import movie_list_adapter, movie_projection
 from fastapi import HTTPException
 
 
@@ -22,8 +23,13 @@ async def toggle_watchlist_service(user_id: int, movie_id: int, db: AsyncSession
 
 
 async def get_user_watchlist_service(
-    user_id: int, page: int, size: int, db: AsyncSession
-):
+    user_id: int, page: int, size: int, db: AsyncSession, fields=None
+) -> bytes:
     repo = WatchlistRepository(db)
-    movies = await repo.get_user_watchlist(user_id, skip=(page - 1) * size, limit=size)
-    return movies
+    movies = await repo.get_user_watchlist(
+        user_id, skip=(page - 1) * size, limit=size, fields=fields
+    )
+    model = movie_projection(fields)
+    return movie_list_adapter(fields).dump_json(
+        [model.model_validate(movie) for movie in movies]
+    )
@@ -1,4 +1,4 @@
-import json
+import orjson
 import redis
 from app.core.celery_app import celery_app
 from app.core.config import settings
@@ -19,7 +19,7 @@ def broadcast_notification_task(message: str):
 
         payload = {"user_id": "ALL", "message": message}
 
-        r.publish("notifications", json.dumps(payload))
+        r.publish("notifications", orjson.dumps(payload))
         return f"Broadcast Sent: {message}"
 
     except Exception as e:
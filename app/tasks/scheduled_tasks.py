@@ -1,11 +1,22 @@
-import json
+import orjson
 import redis
 import asyncio
 from sqlalchemy import select, func
+from app.core.cache import GENERATION_PREFIX, INVALIDATION_CHANNEL, TRENDING
 from app.core.celery_app import celery_app
 from app.core.config import settings
+from app.core.redis import binary_redis_pool, redis_pool
+from app.core.search import SearchClient
 from app.db.session import AsyncSessionLocal, engine
 from app.models.movie import Movie
+from app.repositories.movie_repository import MovieRepository
+from app.services.catalog_index_service import rebuild_ordering_indexes
+from app.services.movie_service import reconcile_rating_aggregates_service
+from app.services.search_service import (
+    check_index_consistency,
+    flush_index_queue,
+    warm_popular_searches,
+)
 
 
 @celery_app.task(name="refresh_trending_cache")
@@ -43,7 +54,11 @@ def refresh_trending_cache_task():
             or f"redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}/0"
         )
         r = redis.from_url(redis_url, decode_responses=True)
-        r.set("trending_movies", json.dumps(payload), ex=3600)
+        r.set("trending_movies", orjson.dumps(payload), ex=3600)
+
+        # Invalidate cached trending responses in Redis and in every API worker.
+        r.incr(GENERATION_PREFIX + TRENDING)
+        r.publish(INVALIDATION_CHANNEL, orjson.dumps({"namespaces": [TRENDING]}))
 
         print(f"✅ [DONE] Trending Cache Updated with REAL IDs: {trending_ids}")
         return f"Cache Updated: {trending_ids}"
@@ -51,3 +66,172 @@ def refresh_trending_cache_task():
     except Exception as e:
         print(f"❌ Cache Update Failed: {e}")
         return f"Failed: {e}"
+
+
+@celery_app.task(name="reconcile_rating_aggregates")
+def reconcile_rating_aggregates_task():
+    """
+    Safety net for the incrementally maintained Movie.average_rating /
+    Movie.rating_count columns: recomputes them from the ratings table,
+    repairs any drift and refreshes the caches, orderings and search
+    documents of the repaired movies.
+    """
+    print("🔄 [START] Reconciling rating aggregates...")
+
+    async def reconcile():
+        try:
+            async with AsyncSessionLocal() as session:
+                return await reconcile_rating_aggregates_service(session)
+        finally:
+            await engine.dispose()
+            await redis_pool.disconnect()
+            await binary_redis_pool.disconnect()
+
+    try:
+        repaired = asyncio.run(reconcile())
+        print(f"✅ [DONE] Repaired rating aggregates for {repaired} movies")
+        return f"Repaired: {repaired}"
+
+    except Exception as e:
+        print(f"❌ Rating reconciliation failed: {e}")
+        return f"Failed: {e}"
+
+
+@celery_app.task(name="rebuild_ordering_indexes")
+def rebuild_ordering_indexes_task():
+    """
+    Rebuilds the Redis sorted sets behind catalog browsing from Postgres.
+    Repairs drift from writes that bypass the API and restores title order
+    after movies are added or renamed.
+    """
+    print("🔄 [START] Rebuilding catalog ordering indexes...")
+
+    async def rebuild():
+        try:
+            async with AsyncSessionLocal() as session:
+                return await rebuild_ordering_indexes(session)
+        finally:
+            await engine.dispose()
+            await redis_pool.disconnect()
+            await binary_redis_pool.disconnect()
+
+    try:
+        indexed = asyncio.run(rebuild())
+        print(f"✅ [DONE] Indexed {indexed} movies")
+        return f"Indexed: {indexed}"
+
+    except Exception as e:
+        print(f"❌ Ordering index rebuild failed: {e}")
+        return f"Failed: {e}"
+
+
+@celery_app.task(name="refresh_movie_catalog")
+def refresh_movie_catalog_task():
+    """
+    Refreshes the movie_catalog materialized view that listing pages read
+    when LISTINGS_FROM_CATALOG_VIEW is on. Readers are never blocked.
+    With the setting off nothing reads the view, so it is not refreshed.
+    """
+    if not settings.LISTINGS_FROM_CATALOG_VIEW:
+        print("⏭️ Movie catalog view is off, skipping refresh")
+        return "Skipped"
+
+    print("🔄 [START] Refreshing movie catalog view...")
+
+    async def refresh():
+        try:
+            async with AsyncSessionLocal() as session:
+                await MovieRepository(session).refresh_catalog_view()
+        finally:
+            await engine.dispose()
+
+    try:
+        asyncio.run(refresh())
+        print("✅ [DONE] Movie catalog view refreshed")
+        return "Refreshed"
+
+    except Exception as e:
+        print(f"❌ Movie catalog refresh failed: {e}")
+        return f"Failed: {e}"
+
+
+@celery_app.task(name="warm_popular_searches")
+def warm_popular_searches_task():
+    """
+    Keeps the result cache warm for the most searched queries of the last
+    few minutes, so popular searches rarely wait on MeiliSearch.
+    """
+    print("🔄 [START] Warming popular searches...")
+
+    async def warm():
+        try:
+            return await warm_popular_searches()
+        finally:
+            await SearchClient.close()
+            await redis_pool.disconnect()
+            await binary_redis_pool.disconnect()
+
+    try:
+        warmed = asyncio.run(warm())
+        print(f"✅ [DONE] Warmed {warmed} searches")
+        return f"Warmed: {warmed}"
+
+    except Exception as e:
+        print(f"❌ Search warming failed: {e}")
+        return f"Failed: {e}"
+
+
+@celery_app.task(name="flush_search_index", bind=True, max_retries=6)
+def flush_search_index_task(self):
+    """
+    Sends the buffered search index writes to MeiliSearch in batches.
+    Scheduled a couple of seconds after the first write of a burst, and
+    every minute as a safety net. Retries with exponential backoff while
+    Meili is unreachable; the buffered writes are kept until it succeeds.
+    """
+    print("🔄 [START] Flushing search index writes...")
+
+    async def flush():
+        try:
+            async with AsyncSessionLocal() as session:
+                return await flush_index_queue(session)
+        finally:
+            await engine.dispose()
+            await SearchClient.close()
+            await redis_pool.disconnect()
+
+    try:
+        upserted, deleted = asyncio.run(flush())
+    except Exception as e:
+        print(f"❌ Search index flush failed: {e}")
+        raise self.retry(exc=e, countdown=2**self.request.retries)
+
+    print(f"✅ [DONE] Indexed {upserted}, removed {deleted}")
+    return f"Indexed: {upserted}, Removed: {deleted}"
+
+
+@celery_app.task(name="check_search_index")
+def check_search_index_task():
+    """
+    Nightly safety net for the search index: diffs it against Postgres by
+    content hash and queues only the divergent documents for the flush.
+    """
+    print("🔄 [START] Checking search index consistency...")
+
+    async def check():
+        try:
+            async with AsyncSessionLocal() as session:
+                return await check_index_consistency(session)
+        finally:
+            await engine.dispose()
+            await SearchClient.close()
+            await redis_pool.disconnect()
+
+    try:
+        report = asyncio.run(check())
+        print(f"✅ [DONE] Search index drift: {report}")
+        return f"Drift: {report}"
+
+    except Exception as e:
+        print(f"❌ Search index check failed: {e}")
+        return f"Failed: {e}"
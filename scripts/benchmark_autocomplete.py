@@ -0,0 +1,60 @@
+import sys
+import os
+import random
+import string
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from app.services.autocomplete_service import TitleIndex
+
+TITLE_COUNT = 1_000_000
+LOOKUPS = 20_000
+LIMIT = 8
+
+
+def random_title(rng: random.Random) -> str:
+    words = [
+        "".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 9))).title()
+        for _ in range(rng.randint(1, 4))
+    ]
+    if rng.random() < 0.2:
+        words.insert(0, "The")
+    return " ".join(words)
+
+
+def benchmark():
+    rng = random.Random(42)
+    print(f"⏱️ Building a title index over {TITLE_COUNT:,} synthetic titles...")
+
+    start = time.perf_counter()
+    index = TitleIndex()
+    index.begin_load()
+    index.build((i, random_title(rng)) for i in range(TITLE_COUNT))
+    index.finish_load()
+    print(f"🔤 Built in {time.perf_counter() - start:.1f} s")
+
+    prefixes = [
+        "".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 5)))
+        for _ in range(LOOKUPS)
+    ]
+    timings = []
+    for prefix in prefixes:
+        start = time.perf_counter()
+        index.lookup(prefix, LIMIT)
+        timings.append((time.perf_counter() - start) * 1_000_000)
+
+    timings.sort()
+    p50 = timings[len(timings) // 2]
+    p99 = timings[int(len(timings) * 0.99)]
+    print(f"🚀 Lookup of 2-5 character prefixes: p50 {p50:.1f} µs, p99 {p99:.1f} µs")
+
+    start = time.perf_counter()
+    for i in range(1_000):
+        index.apply(TITLE_COUNT + i, random_title(rng))
+    per_write = (time.perf_counter() - start) * 1_000
+    print(f"✏️ Incremental insert: {per_write:.1f} µs per title")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,79 @@
+import sys
+import os
+import json
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from app.core.cache import _pack, _unpack
+from app.schemas.common import PageResponse
+from app.schemas.movie import MovieResponse
+
+PAGE_SIZE = 100
+ITERATIONS = 2_000
+
+
+def build_page() -> PageResponse[MovieResponse]:
+    items = [
+        MovieResponse(
+            id=i,
+            slug=f"movie-{i}",
+            title=f"Benchmark Movie {i}",
+            description="A synthetic movie used to measure the cache hit path. " * 3,
+            release_year=1990 + i % 30,
+            video_url=f"https://cdn.example.com/videos/{i}.mp4",
+            thumbnail_url=f"https://cdn.example.com/thumbs/{i}.jpg",
+            average_rating=round(1 + (i % 90) / 10, 1),
+            rating_count=i * 7,
+            is_published=True,
+            genres=[{"id": 1, "name": "Drama", "slug": "drama"}],
+        )
+        for i in range(1, PAGE_SIZE + 1)
+    ]
+    return PageResponse(items=items, total=10_000, page=1, size=PAGE_SIZE, pages=100)
+
+
+def old_hit(cached: str, adapter: TypeAdapter) -> bytes:
+    """What a hit used to cost: JSON parse, model build, FastAPI re-encode."""
+    page = PageResponse(**json.loads(cached))
+    validated = adapter.validate_python(page, from_attributes=True)
+    return JSONResponse(content=jsonable_encoder(validated)).body
+
+
+def new_hit(cached: bytes) -> bytes:
+    _, body = _unpack(cached)
+    return body.to_response().body
+
+
+def measure(fn, *args) -> float:
+    """Average CPU time per call in microseconds."""
+    start = time.process_time()
+    for _ in range(ITERATIONS):
+        fn(*args)
+    return (time.process_time() - start) / ITERATIONS * 1_000_000
+
+
+def benchmark():
+    print(f"⏱️ Benchmarking cache hits on a {PAGE_SIZE}-item page...")
+
+    page = build_page()
+    encoded = page.model_dump_json().encode()
+    adapter = TypeAdapter(PageResponse[MovieResponse])
+
+    old_cached = page.model_dump_json()
+    new_cached, _ = _pack(encoded, ttl=60, delta=0.01)
+
+    old_us = measure(old_hit, old_cached, adapter)
+    new_us = measure(new_hit, new_cached)
+
+    print(f"📦 Body: {len(encoded)} bytes, stored: {len(new_cached)} bytes")
+    print(f"🐢 JSON + Pydantic hit: {old_us:,.0f} µs CPU per request")
+    print(f"🚀 Pre-encoded hit:     {new_us:,.0f} µs CPU per request")
+    print(f"✅ {old_us / new_us:.1f}x less CPU per hit")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,84 @@
+import sys
+import os
+import json
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+from app.schemas.common import PageResponse
+from app.schemas.movie import MovieResponse
+
+PAGE_SIZE = 100
+ITERATIONS = 2_000
+
+
+def build_page() -> PageResponse[MovieResponse]:
+    items = [
+        MovieResponse(
+            id=i,
+            slug=f"movie-{i}",
+            title=f"Benchmark Movie {i}",
+            description="A synthetic movie used to measure response encoding. " * 3,
+            release_year=1990 + i % 30,
+            video_url=f"https://cdn.example.com/videos/{i}.mp4",
+            thumbnail_url=f"https://cdn.example.com/thumbs/{i}.jpg",
+            average_rating=round(1 + (i % 90) / 10, 1),
+            rating_count=i * 7,
+            is_published=True,
+            genres=[{"id": 1, "name": "Drama", "slug": "drama"}],
+        )
+        for i in range(1, PAGE_SIZE + 1)
+    ]
+    return PageResponse(items=items, total=10_000, page=1, size=PAGE_SIZE, pages=100)
+
+
+def stdlib_route(page: PageResponse) -> bytes:
+    """The old default: jsonable_encoder walk, then json.dumps."""
+    return JSONResponse(content=jsonable_encoder(page)).body
+
+
+def orjson_route(page: PageResponse) -> bytes:
+    """A response_model route now: Pydantic dumps to a dict, orjson renders it."""
+    return ORJSONResponse(content=page.model_dump(mode="json")).body
+
+
+def pydantic_bytes(page: PageResponse) -> bytes:
+    """What cache misses store: Pydantic's own encoder, straight to bytes."""
+    return page.model_dump_json().encode()
+
+
+def measure(fn, *args) -> float:
+    """Average CPU time per call in microseconds."""
+    start = time.process_time()
+    for _ in range(ITERATIONS):
+        fn(*args)
+    return (time.process_time() - start) / ITERATIONS * 1_000_000
+
+
+def benchmark():
+    print(f"⏱️ Benchmarking JSON encoding of a {PAGE_SIZE}-item page...")
+
+    page = build_page()
+    payload = {"user_id": 42, "message": "Your export is ready! 🎬"}
+
+    stdlib_us = measure(stdlib_route, page)
+    orjson_us = measure(orjson_route, page)
+    pydantic_us = measure(pydantic_bytes, page)
+    json_pubsub_us = measure(json.dumps, payload)
+    orjson_pubsub_us = measure(orjson.dumps, payload)
+
+    print(f"🐢 jsonable_encoder + json:   {stdlib_us:,.0f} µs CPU per page")
+    print(f"🚀 model_dump + orjson:       {orjson_us:,.0f} µs CPU per page")
+    print(f"🚀 model_dump_json (cached):  {pydantic_us:,.0f} µs CPU per page")
+    print(f"✅ {stdlib_us / orjson_us:.1f}x less CPU per routed page")
+    print(
+        f"📨 Pub/sub payload: json {json_pubsub_us:.2f} µs, "
+        f"orjson {orjson_pubsub_us:.2f} µs"
+    )
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,51 @@
+import argparse
+import asyncio
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from app.core.search import SearchClient
+from app.db.session import AsyncSessionLocal
+from app.models.rating import RatingModel  # noqa: F401
+from app.models.user import UserModel  # noqa: F401
+from app.models.rbac import RoleModel  # noqa: F401
+from app.models.watchlist import WatchlistModel  # noqa: F401
+from app.models.notification import NotificationModel  # noqa: F401
+from app.services.search_service import check_index_consistency
+
+
+async def check(repair: bool):
+    print("🔍 Comparing the search index with Postgres...")
+
+    async with AsyncSessionLocal() as db:
+        report = await check_index_consistency(db, repair=repair)
+
+    await SearchClient.close()
+    if not report:
+        return
+
+    drift = report["missing"] + report["stale"] + report["orphaned"]
+    print(
+        f"📊 {report['checked']} movies checked: {report['missing']} missing, "
+        f"{report['stale']} stale, {report['orphaned']} orphaned"
+    )
+    if drift and repair:
+        print(f"🛠️ Queued {drift} documents; the flush task will sync them.")
+    elif not drift:
+        print("✅ Search index is in sync.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Find (and repair) drift between MeiliSearch and Postgres.",
+        epilog="The first run against an index built before documents carried "
+        "a content_hash reports every document as stale and queues them all "
+        "once; later runs only queue real drift.",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Only report the drift; queue nothing.",
+    )
+    asyncio.run(check(repair=not parser.parse_args().dry_run))
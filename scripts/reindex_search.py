@@ -1,40 +1,36 @@
+import argparse
 import asyncio
 import sys
 import os
 
 sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
 
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from app.core.search import SearchClient
 from app.db.session import AsyncSessionLocal
-from app.models.movie import Movie
 from app.models.rating import RatingModel  # noqa: F401
 from app.models.user import UserModel  # noqa: F401
 from app.models.rbac import RoleModel  # noqa: F401
 from app.models.watchlist import WatchlistModel  # noqa: F401
 from app.models.notification import NotificationModel  # noqa: F401
-from app.services.search_service import configure_search_index, add_movies_to_search
+from app.services.search_service import reindex_movies
 
 
-async def reindex():
-    print("🔄 Starting Search Re-indexing...")
-
-    await configure_search_index()
+async def reindex(full: bool):
+    mode = "full rebuild" if full else "incremental"
+    print(f"🔄 Starting Search Re-indexing ({mode})...")
 
     async with AsyncSessionLocal() as db:
-        stmt = select(Movie).options(selectinload(Movie.genres))
-        result = await db.execute(stmt)
-        movies = result.scalars().all()
-
-        print(f"📦 Fetched {len(movies)} movies from Database.")
-
-        if movies:
-            await add_movies_to_search(movies)
-        else:
-            print("⚠️ No movies found in DB to sync.")
+        sent = await reindex_movies(db, full=full)
 
-    print("✅ Re-indexing complete!")
+    await SearchClient.close()
+    print(f"✅ Re-indexing complete! {sent} movies sent.")
 
 
 if __name__ == "__main__":
-    asyncio.run(reindex())
+    parser = argparse.ArgumentParser(description="Sync movies into MeiliSearch.")
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Rebuild everything into a shadow index and swap it in.",
+    )
+    asyncio.run(reindex(parser.parse_args().full))
@@ -2,8 +2,9 @@ import uuid
 import pytest
 import pytest_asyncio
 from typing import AsyncGenerator
-from unittest.mock import AsyncMock
 
+from fakeredis import FakeServer
+from fakeredis.aioredis import FakeConnection
 from httpx import AsyncClient, ASGITransport
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import (
@@ -15,10 +16,12 @@ from sqlalchemy.pool import NullPool
 
 from fastapi import Request, Response
 from fastapi_limiter.depends import RateLimiter
+from redis.asyncio import ConnectionPool
 
 from app.api.dependencies import get_db
 from app.db.base import Base
 from app.core.config import settings
+from app.core.limiter import limiter
 from app.core.security import create_access_token
 from app.main import app
 from app.models.user import UserModel
@@ -43,16 +46,38 @@ def mock_rate_limiter(monkeypatch):
     monkeypatch.setattr(RateLimiter, "__call__", mock_call)
 
 
-@pytest_asyncio.fixture(autouse=True)
-def mock_redis_client(monkeypatch):
-    from app.services import movie_service
+@pytest.fixture(autouse=True)
+def reset_slowapi_limits():
+    """slowapi counts hits per client IP; start every test with a clean slate."""
+    limiter.reset()
 
-    mock_redis = AsyncMock()
-    mock_redis.get.return_value = None
-    mock_redis.set.return_value = True
-    mock_redis.delete.return_value = True
 
-    monkeypatch.setattr(movie_service, "redis_client", mock_redis)
+@pytest_asyncio.fixture(autouse=True)
+def mock_redis_client(monkeypatch):
+    """
+    Point every get_redis_client() call at a fresh in-memory Redis.
+    The cache layer uses pipelines, MGET etc., so a real protocol
+    implementation (fakeredis) is simpler than mocking each call.
+    """
+    from app.core import redis as redis_module
+    from app.core.cache import local_cache, local_generations
+
+    server = FakeServer()
+    for attribute, decode_responses in (
+        ("redis_pool", True),
+        ("binary_redis_pool", False),
+    ):
+        fake_pool = ConnectionPool(
+            connection_class=FakeConnection,
+            server=server,
+            encoding="utf-8",
+            decode_responses=decode_responses,
+        )
+        monkeypatch.setattr(redis_module, attribute, fake_pool)
+
+    # The in-process tier would otherwise leak entries between tests.
+    local_cache.clear()
+    local_generations.clear()
 
 
 @pytest_asyncio.fixture
@@ -0,0 +1,108 @@
+import pytest
+import pytest_asyncio
+
+from app.db.session import engine
+from app.models.movie import Movie
+from app.services import autocomplete_service
+from app.services.autocomplete_service import TitleIndex, load_title_index
+
+TITLES = {1: "The Matrix", 2: "Matilda", 3: "Mad Max: Fury Road", 4: "Heat"}
+
+
+def build_index(titles: dict[int, str] = TITLES) -> TitleIndex:
+    index = TitleIndex()
+    index.begin_load()
+    index.build(titles.items())
+    index.finish_load()
+    return index
+
+
+def titles(matches: list[dict]) -> list[str]:
+    return [match["title"] for match in matches]
+
+
+def test_lookup_matches_prefix_case_and_punctuation_insensitively():
+    index = build_index()
+
+    assert titles(index.lookup("MA", 10)) == [
+        "Mad Max: Fury Road",
+        "Matilda",
+        "The Matrix",
+    ]
+    assert titles(index.lookup("mad max f", 10)) == ["Mad Max: Fury Road"]
+    assert titles(index.lookup("ma", 1)) == ["Mad Max: Fury Road"]
+    assert index.lookup("zz", 10) == []
+
+
+def test_lookup_skips_leading_article_without_duplicates():
+    index = build_index({1: "The Matrix", 2: "The The"})
+
+    assert titles(index.lookup("matr", 10)) == ["The Matrix"]
+    assert titles(index.lookup("the", 10)) == ["The The", "The Matrix"]
+
+
+def test_apply_renames_and_removes():
+    index = build_index()
+
+    index.apply(4, "Matchstick Men")
+    index.apply(2, None)
+    index.apply(5, "Heathers")
+
+    assert titles(index.lookup("mat", 10)) == ["Matchstick Men", "The Matrix"]
+    assert titles(index.lookup("hea", 10)) == ["Heathers"]
+    assert len(index) == 4
+
+
+def test_events_during_load_are_replayed():
+    index = TitleIndex()
+    index.begin_load()
+    index.apply(1, "Matrix Reloaded")
+    index.apply(2, None)
+
+    index.build(TITLES.items())
+    index.finish_load()
+
+    assert index.ready
+    assert titles(index.lookup("matr", 10)) == ["Matrix Reloaded"]
+    assert titles(index.lookup("mati", 10)) == []
+
+
+@pytest_asyncio.fixture
+async def movies(db_session, monkeypatch):
+    monkeypatch.setattr(autocomplete_service, "title_index", TitleIndex())
+    db_session.add_all(
+        Movie(
+            title=title,
+            slug=f"movie-{movie_id}",
+            description="",
+            video_url="",
+            thumbnail_url="",
+            release_year=2000,
+        )
+        for movie_id, title in TITLES.items()
+    )
+    await db_session.commit()
+    yield
+    # The index loader uses the app's pooled engine; its connections belong
+    # to this test's event loop.
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_autocomplete_falls_back_to_postgres_until_loaded(client, movies):
+    response = await client.get(
+        "/api/v1/movies/autocomplete", params={"prefix": "ma", "limit": 5}
+    )
+
+    assert response.status_code == 200
+    assert titles(response.json()) == ["Mad Max: Fury Road", "Matilda"]
+
+
+@pytest.mark.asyncio
+async def test_autocomplete_serves_from_loaded_index(client, movies):
+    await load_title_index()
+
+    response = await client.get("/api/v1/movies/autocomplete", params={"prefix": "ma"})
+
+    assert titles(response.json()) == ["Mad Max: Fury Road", "Matilda", "The Matrix"]
+    assert response.json()[0].keys() == {"id", "title"}
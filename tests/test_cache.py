@@ -0,0 +1,220 @@
+import asyncio
+
+import pytest
+from starlette.requests import Request
+
+from app.core import cache
+from app.core.cache import (
+    LocalCache,
+    bump_generations,
+    get_or_load,
+    invalidate_keys,
+    local_cache,
+    versioned_key,
+)
+from app.core.redis import get_redis_binary_client, get_redis_client
+
+
+def counting_loader(value, delay: float = 0):
+    calls = []
+
+    async def loader(db):
+        calls.append(db)
+        await asyncio.sleep(delay)
+        return value
+
+    return loader, calls
+
+
+@pytest.mark.asyncio
+async def test_bump_changes_versioned_key():
+    async with get_redis_client() as redis:
+        before = await versioned_key(redis, "movies:list", ["catalog"], 1, 10)
+        await bump_generations("catalog")
+        after = await versioned_key(redis, "movies:list", ["catalog"], 1, 10)
+
+    assert before == "movies:list:0:1:10"
+    assert after == "movies:list:1:1:10"
+
+
+@pytest.mark.asyncio
+async def test_get_or_load_caches_value():
+    loader, calls = counting_loader(b'{"items": [1, 2]}')
+
+    first = await get_or_load("test:key", loader, db=None, ttl=60, beta=0)
+    second = await get_or_load("test:key", loader, db=None, ttl=60, beta=0)
+
+    assert first.body == second.body == b'{"items": [1, 2]}'
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_load_once():
+    loader, calls = counting_loader(b'{"items": []}', delay=0.2)
+
+    results = await asyncio.gather(
+        *(get_or_load("test:hot", loader, db=None, ttl=60, beta=0) for _ in range(5))
+    )
+
+    assert all(result.body == b'{"items": []}' for result in results)
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_serves_last_good_value_when_loader_fails():
+    loader, _ = counting_loader(b'{"items": ["cached"]}')
+    await get_or_load("test:v1", loader, db=None, ttl=60, fallback_key="test:last")
+
+    async def failing_loader(db):
+        raise ConnectionError("database is down")
+
+    value = await get_or_load(
+        "test:v2", failing_loader, db=None, ttl=60, fallback_key="test:last"
+    )
+
+    assert value.body == b'{"items": ["cached"]}'
+
+
+@pytest.mark.asyncio
+async def test_missing_entities_are_cached_briefly():
+    loader, calls = counting_loader(None)
+
+    first = await get_or_load("test:gone", loader, db=None, ttl=60, negative_ttl=30)
+    second = await get_or_load("test:gone", loader, db=None, ttl=60, negative_ttl=30)
+
+    async with get_redis_binary_client() as redis:
+        ttl = await redis.ttl("test:gone")
+
+    assert first is None and second is None
+    assert len(calls) == 1
+    assert 0 < ttl <= 30
+
+
+@pytest.mark.asyncio
+async def test_invalidate_keys_drops_both_tiers():
+    loader, calls = counting_loader(b'{"id": 1}')
+    await get_or_load("test:entity", loader, db=None, ttl=60, beta=0)
+
+    await invalidate_keys("test:entity")
+    await get_or_load("test:entity", loader, db=None, ttl=60, beta=0)
+
+    assert len(calls) == 2
+
+
+def test_local_cache_evicts_least_recently_used():
+    cache = LocalCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.get("b") != 2
+
+
+@pytest.mark.asyncio
+async def test_local_tier_answers_repeated_reads():
+    loader, calls = counting_loader(b'{"items": [1]}')
+    await get_or_load("test:local", loader, db=None, ttl=60, beta=0)
+
+    async with get_redis_binary_client() as redis:
+        await redis.delete("test:local")
+
+    value = await get_or_load("test:local", loader, db=None, ttl=60, beta=0)
+
+    assert value.body == b'{"items": [1]}'
+    assert len(calls) == 1
+    assert local_cache.get("test:local") is value
+
+
+@pytest.mark.asyncio
+async def test_large_bodies_are_stored_compressed():
+    body = b"[" + b",".join(b'{"title": "Movie"}' for _ in range(500)) + b"]"
+    loader, _ = counting_loader(body)
+
+    cached = await get_or_load("test:big", loader, db=None, ttl=60)
+
+    async with get_redis_binary_client() as redis:
+        stored = await redis.get("test:big")
+
+    assert cached.encoding == "br"
+    assert cached.body == body
+    assert len(stored) < len(body) / 5
+
+
+@pytest.mark.asyncio
+async def test_cached_body_honours_validators():
+    loader, _ = counting_loader(b'{"items": []}')
+    cached = await get_or_load("test:etag", loader, db=None, ttl=60)
+
+    def request(**headers):
+        raw = [
+            (name.lower().encode(), value.encode()) for name, value in headers.items()
+        ]
+        return Request({"type": "http", "headers": raw})
+
+    later = "Fri, 01 Jan 2100 00:00:00 GMT"
+    earlier = "Thu, 01 Jan 1970 00:00:00 GMT"
+
+    assert (
+        cached.to_response(request(**{"If-None-Match": cached.etag})).status_code == 304
+    )
+    assert (
+        cached.to_response(request(**{"If-None-Match": '"other"'})).status_code == 200
+    )
+    assert (
+        cached.to_response(request(**{"If-Modified-Since": later})).status_code == 304
+    )
+    assert (
+        cached.to_response(request(**{"If-Modified-Since": earlier})).status_code == 200
+    )
+
+
+def test_xfetch_survives_zero_from_random(monkeypatch):
+    monkeypatch.setattr(cache.random, "random", lambda: 0.0)
+    entry = {"d": 0.5, "exp": 100.0}
+
+    assert cache._should_refresh(entry, now=50.0, beta=1.0) is False
+    assert cache._should_refresh(entry, now=100.0, beta=1.0) is True
+
+
+@pytest.mark.asyncio
+async def test_rebuilt_body_keeps_its_last_modified(monkeypatch):
+    body = {"value": b'{"items": [1]}'}
+
+    async def loader(db):
+        return body["value"]
+
+    clock = {"now": 1_000.0}
+    monkeypatch.setattr(cache.time, "time", lambda: clock["now"])
+
+    first = await get_or_load(
+        "test:gen1", loader, db=None, ttl=60, fallback_key="test:fb", beta=0
+    )
+    clock["now"] = 1_010.0
+    # A generation bump: new key, same bytes.
+    same = await get_or_load(
+        "test:gen2", loader, db=None, ttl=60, fallback_key="test:fb", beta=0
+    )
+    clock["now"] = 1_020.0
+    body["value"] = b'{"items": [2]}'
+    changed = await get_or_load(
+        "test:gen3", loader, db=None, ttl=60, fallback_key="test:fb", beta=0
+    )
+
+    assert first.last_modified == same.last_modified == 1_000.0
+    assert changed.last_modified == 1_020.0
+
+
+@pytest.mark.asyncio
+async def test_loader_supplied_last_modified_wins():
+    async def loader(db):
+        return b'{"id": 1}', 1_234.5
+
+    cached = await get_or_load("test:entity:lm", loader, db=None, ttl=60)
+
+    assert cached.last_modified == 1_234.5
+    assert cached.to_response().headers["Last-Modified"] == (
+        "Thu, 01 Jan 1970 00:20:34 GMT"
+    )
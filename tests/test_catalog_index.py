@@ -0,0 +1,75 @@
+import pytest
+
+from app.models.movie import Movie
+from app.repositories.movie_repository import MovieRepository
+from app.services.catalog_index_service import (
+    get_indexed_page,
+    rebuild_ordering_indexes,
+    update_ordering_indexes,
+)
+
+
+async def add_movies(db_session, ratings: list[float]) -> list[Movie]:
+    movies = [
+        Movie(
+            title=f"Movie {chr(ord('a') + i % 3)}",
+            slug=f"movie-{i}",
+            description="",
+            video_url="",
+            thumbnail_url="",
+            release_year=2000,
+            average_rating=rating,
+        )
+        for i, rating in enumerate(ratings)
+    ]
+    db_session.add_all(movies)
+    await db_session.commit()
+    return movies
+
+
+@pytest.mark.asyncio
+async def test_index_is_not_used_before_first_rebuild(db_session):
+    await add_movies(db_session, [5.0])
+
+    assert await get_indexed_page("id", "asc", None, 0, 10) is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("sort_by", ["id", "rating", "title"])
+@pytest.mark.parametrize("order", ["asc", "desc"])
+async def test_indexed_order_matches_postgres(db_session, sort_by, order):
+    await add_movies(db_session, [7.5, 9.0, 7.5, 3.0, 9.0, 7.5])
+    await rebuild_ordering_indexes(db_session)
+
+    expected, _, _ = await MovieRepository(db_session).get_all_movies(
+        skip=0, limit=10, sort_by=sort_by, order=order
+    )
+    ids, total = await get_indexed_page(sort_by, order, None, 0, 10)
+
+    assert ids == [movie.id for movie in expected]
+    assert total == 6
+
+
+@pytest.mark.asyncio
+async def test_rating_change_moves_movie_between_bands(db_session):
+    low, high = await add_movies(db_session, [4.0, 8.0])
+    await rebuild_ordering_indexes(db_session)
+
+    assert await get_indexed_page("id", "asc", 7.0, 0, 10) == ([high.id], 1)
+
+    await update_ordering_indexes(low.id, 9.5)
+
+    assert await get_indexed_page("id", "asc", 7.0, 0, 10) == ([low.id, high.id], 2)
+    ids, _ = await get_indexed_page("rating", "desc", None, 0, 1)
+    assert ids == [low.id]
+
+
+@pytest.mark.asyncio
+async def test_new_title_falls_back_until_rebuild(db_session):
+    (movie,) = await add_movies(db_session, [5.0])
+    await rebuild_ordering_indexes(db_session)
+
+    await update_ordering_indexes(movie.id, 5.0, title_changed=True)
+
+    assert await get_indexed_page("title", "asc", None, 0, 10) is None
+    assert await get_indexed_page("id", "asc", None, 0, 10) == ([movie.id], 1)
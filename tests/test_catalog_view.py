@@ -0,0 +1,106 @@
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.models.catalog import MOVIE_CATALOG_SELECT
+from app.models.movie import Genre, Movie
+from app.repositories.movie_repository import MovieRepository
+from app.schemas.movie import MovieFilters, MovieResponse
+from app.tasks.scheduled_tasks import refresh_movie_catalog_task
+
+
+@pytest_asyncio.fixture
+async def catalog_view(db_session):
+    # create_all only knows tables; build the view the way the migration does.
+    await db_session.execute(
+        text(f"CREATE MATERIALIZED VIEW movie_catalog AS {MOVIE_CATALOG_SELECT}")
+    )
+    await db_session.execute(
+        text("CREATE UNIQUE INDEX ix_movie_catalog_id ON movie_catalog (id)")
+    )
+    await db_session.commit()
+    yield
+    await db_session.execute(text("DROP MATERIALIZED VIEW movie_catalog"))
+    await db_session.commit()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("sort_by", ["id", "rating", "title"])
+async def test_catalog_pages_match_live_tables(db_session, catalog_view, sort_by):
+    drama, noir = Genre(name="Drama", slug="drama"), Genre(name="Noir", slug="noir")
+    db_session.add_all(
+        [
+            Movie(
+                title=f"Movie {i % 2}",
+                slug=f"movie-{i}",
+                description="",
+                video_url="",
+                thumbnail_url="",
+                release_year=2000 + i,
+                average_rating=float(i % 3),
+                genres=[drama, noir][: i % 3],
+            )
+            for i in range(6)
+        ]
+    )
+    await db_session.commit()
+
+    repo = MovieRepository(db_session)
+    await repo.refresh_catalog_view()
+
+    live, live_next, _ = await repo.get_all_movies(0, 4, sort_by, "desc")
+    catalog, catalog_next, _ = await repo.get_all_movies(
+        0, 4, sort_by, "desc", from_catalog=True
+    )
+
+    assert [MovieResponse.model_validate(row) for row in catalog] == [
+        MovieResponse.model_validate(movie) for movie in live
+    ]
+    assert catalog_next == live_next
+
+
+@pytest.mark.asyncio
+async def test_catalog_applies_facet_filters_like_live_tables(db_session, catalog_view):
+    drama, noir = Genre(name="Drama", slug="drama"), Genre(name="Noir", slug="noir")
+    db_session.add_all(
+        [
+            Movie(
+                title=f"Movie {i}",
+                slug=f"movie-{i}",
+                description="",
+                video_url="",
+                thumbnail_url="",
+                release_year=2000 + i,
+                genres=[[], [drama], [noir], [drama, noir]][i % 4],
+            )
+            for i in range(8)
+        ]
+    )
+    await db_session.commit()
+
+    repo = MovieRepository(db_session)
+    await repo.refresh_catalog_view()
+    filters = MovieFilters(genres=("Noir",), year_from=2002, year_to=2006)
+
+    live, _, _ = await repo.get_all_movies(0, 10, filters=filters)
+    catalog, _, _ = await repo.get_all_movies(0, 10, from_catalog=True, filters=filters)
+
+    assert [row.id for row in catalog] == [movie.id for movie in live]
+    assert sorted(movie.title for movie in live) == ["Movie 2", "Movie 3", "Movie 6"]
+
+
+@pytest.mark.parametrize("enabled, result", [(False, "Skipped"), (True, "Refreshed")])
+def test_catalog_refresh_only_runs_when_listings_read_the_view(
+    monkeypatch, enabled, result
+):
+    refreshed = []
+
+    async def refresh(self):
+        refreshed.append(True)
+
+    monkeypatch.setattr(settings, "LISTINGS_FROM_CATALOG_VIEW", enabled)
+    monkeypatch.setattr(MovieRepository, "refresh_catalog_view", refresh)
+
+    assert refresh_movie_catalog_task() == result
+    assert refreshed == ([True] if enabled else [])
@@ -0,0 +1,141 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+from httpx import ASGITransport, AsyncClient
+from starlette.types import Message
+
+from app.core.middleware import CompressionMiddleware, negotiate_encoding
+from app.models.movie import Movie
+
+BIG = "x" * 4096
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        (None, None),
+        ("gzip, deflate", "gzip"),
+        ("gzip, br", "br"),
+        ("br;q=0, gzip", "gzip"),
+        ("*", "br"),
+        ("identity", None),
+    ],
+)
+def test_negotiate_encoding(header, expected):
+    assert negotiate_encoding(header) == expected
+
+
+def small_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
+    @app.get("/big")
+    async def big():
+        return PlainTextResponse(BIG, headers={"ETag": '"abc"'})
+
+    @app.get("/small")
+    async def small():
+        return PlainTextResponse("tiny")
+
+    @app.get("/opt-out")
+    async def opt_out():
+        return PlainTextResponse(BIG, headers={"Cache-Control": "no-transform"})
+
+    return app
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("coding", ["br", "gzip"])
+async def test_middleware_compresses_large_text(coding):
+    transport = ASGITransport(app=small_app())
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/big", headers={"Accept-Encoding": coding})
+
+    assert response.headers["content-encoding"] == coding
+    assert int(response.headers["content-length"]) < len(BIG)
+    assert response.headers["etag"] == 'W/"abc"'
+    assert "accept-encoding" in response.headers["vary"].lower()
+    assert response.text == BIG
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path", ["/small", "/opt-out"])
+async def test_middleware_leaves_response_alone(path):
+    transport = ASGITransport(app=small_app())
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get(path, headers={"Accept-Encoding": "br, gzip"})
+
+    assert response.status_code == 200
+    assert "content-encoding" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_event_stream_goes_out_event_by_event():
+    sent: list[Message] = []
+    delivered = []
+
+    async def events(scope, receive, send):
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-type", b"text/event-stream")],
+            }
+        )
+        for tick in range(3):
+            body = f"data: {tick}\n\n".encode()
+            await send({"type": "http.response.body", "body": body, "more_body": True})
+            delivered.append(len(sent))
+        await send({"type": "http.response.body", "body": b""})
+
+    async def record(message: Message):
+        sent.append(message)
+
+    scope = {"type": "http", "headers": [(b"accept-encoding", b"br, gzip")]}
+    await CompressionMiddleware(events)(scope, None, record)
+
+    # Each tick reached the client before the next one was produced.
+    assert delivered == [2, 3, 4]
+    assert [message.get("body") for message in sent[1:4]] == [
+        b"data: 0\n\n",
+        b"data: 1\n\n",
+        b"data: 2\n\n",
+    ]
+    assert all(b"content-encoding" not in name for name, _ in sent[0]["headers"])
+
+
+@pytest.mark.asyncio
+async def test_cached_listing_is_served_precompressed(client, db_session):
+    """Bodies the cache stored as Brotli go out as stored, not recompressed."""
+    db_session.add_all(
+        Movie(
+            title=f"Movie {i}",
+            slug=f"movie-{i}",
+            description="A long enough description to pass the threshold. " * 4,
+            video_url="",
+            thumbnail_url="",
+            release_year=2000,
+        )
+        for i in range(20)
+    )
+    await db_session.commit()
+    params = {"size": 20, "sort_by": "id", "order": "asc"}
+
+    identity = await client.get(
+        "/api/v1/movies/", params=params, headers={"Accept-Encoding": "identity"}
+    )
+    compressed = await client.get(
+        "/api/v1/movies/", params=params, headers={"Accept-Encoding": "br"}
+    )
+
+    assert "content-encoding" not in identity.headers
+    assert compressed.headers["content-encoding"] == "br"
+    assert compressed.headers["etag"] == f"W/{identity.headers['etag']}"
+    assert compressed.json() == identity.json()
+
+    revalidated = await client.get(
+        "/api/v1/movies/",
+        params=params,
+        headers={"Accept-Encoding": "br", "If-None-Match": compressed.headers["etag"]},
+    )
+    assert revalidated.status_code == 304
@@ -0,0 +1,87 @@
+import pytest
+from sqlalchemy import text, update
+
+from app.core.cache import CATALOG, RATING_NAMESPACES, bump_generations
+from app.core.config import settings
+from app.models.movie import Movie
+from app.schemas.movie import MovieFilters
+from app.services.count_service import get_movie_total
+
+
+async def add_movies(db_session, ratings: list[float], start: int = 0) -> list[Movie]:
+    movies = [
+        Movie(
+            title=f"Movie {i}",
+            slug=f"movie-{i}",
+            description="",
+            video_url="",
+            thumbnail_url="",
+            release_year=2000,
+            average_rating=rating,
+        )
+        for i, rating in enumerate(ratings, start=start)
+    ]
+    db_session.add_all(movies)
+    await db_session.commit()
+    return movies
+
+
+@pytest.mark.asyncio
+async def test_listing_without_total_skips_the_count(client, db_session):
+    await add_movies(db_session, [7.0, 8.0])
+
+    response = await client.get(
+        "/api/v1/movies/", params={"include_total": False, "sort_by": "title"}
+    )
+
+    data = response.json()
+    assert len(data["items"]) == 2
+    assert data["total"] is None
+    assert data["pages"] is None
+    assert await get_movie_total(db_session, include_total=False) == (None, "none")
+
+
+@pytest.mark.asyncio
+async def test_second_count_is_served_from_cache(db_session):
+    await add_movies(db_session, [7.0, 8.0])
+
+    assert await get_movie_total(db_session) == (2, "exact")
+
+    # Not seen until the catalog generation moves.
+    await add_movies(db_session, [9.0], start=2)
+    assert await get_movie_total(db_session) == (2, "cached")
+
+    await bump_generations(CATALOG)
+    assert await get_movie_total(db_session) == (3, "exact")
+
+
+@pytest.mark.asyncio
+async def test_rating_writes_invalidate_rating_filtered_counts(db_session):
+    low, _ = await add_movies(db_session, [5.0, 8.0])
+
+    assert await get_movie_total(db_session, min_rating=7) == (1, "exact")
+
+    await db_session.execute(
+        update(Movie).where(Movie.id == low.id).values(average_rating=9.0)
+    )
+    await db_session.commit()
+    assert await get_movie_total(db_session, min_rating=7) == (1, "cached")
+
+    await bump_generations(*RATING_NAMESPACES)
+    assert await get_movie_total(db_session, min_rating=7) == (2, "exact")
+
+
+@pytest.mark.asyncio
+async def test_large_unfiltered_catalogs_use_the_planner_estimate(
+    db_session, monkeypatch
+):
+    await add_movies(db_session, [7.0, 8.0, 9.0])
+    await db_session.execute(text("ANALYZE movies"))
+    monkeypatch.setattr(settings, "COUNT_ESTIMATE_THRESHOLD", 2)
+
+    assert await get_movie_total(db_session) == (3, "estimated")
+
+    # Filtered counts are never estimated.
+    assert await get_movie_total(db_session, min_rating=8) == (2, "exact")
+    drama = MovieFilters(genres=["Drama"])
+    assert await get_movie_total(db_session, filters=drama) == (0, "exact")
@@ -0,0 +1,66 @@
+import pytest
+from sqlalchemy import event, select
+
+from app.models.movie import Movie
+from app.repositories.movie_repository import MovieRepository
+from app.repositories.watchlist_repository import WatchlistRepository
+
+
+@pytest.fixture
+def statements(db_session):
+    """Every SQL statement the test session sends to Postgres."""
+    seen = []
+    engine = db_session.bind.sync_engine
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        seen.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield seen
+    event.remove(engine, "before_cursor_execute", record)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("sort_by", ["id", "rating", "title"])
+async def test_listing_queries_never_select_embedding(db_session, statements, sort_by):
+    db_session.add(
+        Movie(
+            title="Vector",
+            slug="vector",
+            description="",
+            video_url="",
+            thumbnail_url="",
+            release_year=2000,
+            embedding=[0.1] * 384,
+        )
+    )
+    await db_session.commit()
+    statements.clear()
+
+    repo = MovieRepository(db_session)
+    (movie,), _, _ = await repo.get_all_movies(0, 10, sort_by, "desc")
+    await repo.get_by_id(movie.id)
+    await WatchlistRepository(db_session).get_user_watchlist(1, 0, 10)
+
+    assert statements
+    assert not any("embedding" in statement for statement in statements)
+
+
+@pytest.mark.asyncio
+async def test_embedding_loads_when_asked_for(db_session):
+    db_session.add(
+        Movie(
+            title="Vector",
+            slug="vector",
+            description="",
+            video_url="",
+            thumbnail_url="",
+            release_year=2000,
+            embedding=[0.1] * 384,
+        )
+    )
+    await db_session.commit()
+
+    embedding = await db_session.scalar(select(Movie.embedding))
+
+    assert len(embedding) == 384
@@ -0,0 +1,80 @@
+import pytest
+
+from app.models.movie import Genre, Movie
+from app.schemas.movie import MovieFilters
+from app.services.count_service import filters_key
+
+
+async def add_movies(db_session):
+    drama, noir = Genre(name="Drama", slug="drama"), Genre(name="Noir", slug="noir")
+    db_session.add_all(
+        Movie(
+            title=title,
+            slug=title.lower().replace(" ", "-"),
+            description="",
+            video_url="",
+            thumbnail_url="",
+            release_year=year,
+            average_rating=rating,
+            genres=genres,
+        )
+        for title, year, rating, genres in [
+            ("Chinatown", 1974, 9.0, [drama, noir]),
+            ("Heat", 1995, 8.0, [drama]),
+            ("Brick", 2005, 7.0, [noir]),
+            ("Up", 2009, 8.5, []),
+        ]
+    )
+    await db_session.commit()
+
+
+@pytest.mark.asyncio
+async def test_browsing_filters_by_genre_and_year(client, db_session):
+    await add_movies(db_session)
+
+    response = await client.get(
+        "/api/v1/movies/",
+        params={"genre": ["Noir", "Drama"], "year_from": 1990, "sort_by": "title"},
+    )
+
+    data = response.json()
+    assert [item["title"] for item in data["items"]] == ["Heat", "Brick"]
+    assert data["total"] == 2
+    assert data["facets"] is None
+
+
+@pytest.mark.asyncio
+async def test_browsing_facets_come_from_sql(client, db_session):
+    await add_movies(db_session)
+
+    response = await client.get(
+        "/api/v1/movies/",
+        params={"min_rating": 8, "include_facets": True},
+    )
+
+    assert response.json()["facets"] == {
+        "genres": {"Drama": 2, "Noir": 1},
+        "release_year": {"1974": 1, "1995": 1, "2009": 1},
+        "rating": {"min": 8.0, "max": 9.0},
+    }
+
+
+@pytest.mark.asyncio
+async def test_inverted_year_range_is_rejected(client):
+    response = await client.get(
+        "/api/v1/movies/", params={"year_from": 2000, "year_to": 1990}
+    )
+
+    assert response.status_code == 400
+
+
+def test_filter_keys_keep_genre_names_apart():
+    assert filters_key(MovieFilters(genres=("A,B",))) != filters_key(
+        MovieFilters(genres=("A", "B"))
+    )
+    assert filters_key(MovieFilters(genres=("A", "B"))) == filters_key(
+        MovieFilters(genres=("B", "A"))
+    )
+    assert filters_key(MovieFilters(year_from=1990)) != filters_key(
+        MovieFilters(year_to=1990)
+    )
@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+import pytest_asyncio
+
+from app.db.session import engine
+from app.models.movie import Movie
+from app.services import hybrid_search_service
+from app.services.hybrid_search_service import reciprocal_rank_fusion
+
+
+def test_rrf_favours_documents_both_retrievers_found():
+    fused = reciprocal_rank_fusion([([1, 2, 3], 1.0), ([3, 4], 1.0)])
+
+    assert fused == [3, 1, 2, 4]  # 2 and 4 tie; 2 was seen first
+
+
+def test_rrf_weights_tilt_the_blend():
+    rankings = [([1, 2], 1.0), ([2, 1], 3.0)]
+
+    assert reciprocal_rank_fusion(rankings) == [2, 1]
+    assert reciprocal_rank_fusion([([1, 2], 1.0), ([2, 1], 0.0)]) == [1, 2]
+
+
+@pytest_asyncio.fixture
+async def movies(db_session, monkeypatch):
+    """Two movies with hand-made embeddings; the query embeds next to 'Drift'."""
+    monkeypatch.setattr(
+        hybrid_search_service, "get_embedding", lambda text: [1.0] + [0.0] * 383
+    )
+    db_session.add_all(
+        [
+            Movie(
+                title="Robot Love",
+                slug="robot-love",
+                description="A robot story.",
+                video_url="",
+                thumbnail_url="",
+                release_year=2008,
+                embedding=[0.0, 1.0] + [0.0] * 382,
+            ),
+            Movie(
+                title="Drift",
+                slug="drift",
+                description="Alone at sea.",
+                video_url="",
+                thumbnail_url="",
+                release_year=2010,
+                embedding=[1.0] + [0.0] * 383,
+            ),
+        ]
+    )
+    await db_session.commit()
+    yield
+    # The retrievers use the app's pooled engine; its connections belong
+    # to this test's event loop.
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_hybrid_search_fuses_both_retrievers(client, movies):
+    response = await client.get(
+        "/api/v1/movies/search/hybrid", params={"query": "robot"}
+    )
+
+    # Lexical finds only Robot Love; semantic ranks Drift first.
+    assert [movie["title"] for movie in response.json()] == ["Robot Love", "Drift"]
+
+
+@pytest.mark.asyncio
+async def test_slow_retriever_is_dropped(client, movies, monkeypatch):
+    async def stalled(query, limit):
+        await asyncio.sleep(10)
+
+    monkeypatch.setattr(hybrid_search_service, "_semantic_ids", stalled)
+    monkeypatch.setattr(hybrid_search_service.settings, "HYBRID_SEMANTIC_TIMEOUT", 0.05)
+
+    response = await client.get(
+        "/api/v1/movies/search/hybrid", params={"query": "robot"}
+    )
+
+    assert [movie["title"] for movie in response.json()] == ["Robot Love"]
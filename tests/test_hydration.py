@@ -0,0 +1,47 @@
+import json
+
+import pytest
+from sqlalchemy import text
+
+from app.models.movie import Movie
+from app.services.hydration_service import encode_movie_list, hydrate_movies
+
+
+async def add_movies(db_session, count: int) -> list[Movie]:
+    movies = [
+        Movie(
+            title=f"Movie {i}",
+            slug=f"movie-{i}",
+            description="",
+            video_url="",
+            thumbnail_url="",
+            release_year=2000 + i,
+        )
+        for i in range(count)
+    ]
+    db_session.add_all(movies)
+    await db_session.commit()
+    return movies
+
+
+@pytest.mark.asyncio
+async def test_hydrate_preserves_order_and_drops_unknown_ids(db_session):
+    movies = await add_movies(db_session, 3)
+    ids = [movies[2].id, 999999, movies[0].id, movies[1].id]
+
+    hydrated = await hydrate_movies(db_session, ids)
+
+    titles = [movie["title"] for movie in json.loads(encode_movie_list(hydrated))]
+    assert titles == ["Movie 2", "Movie 0", "Movie 1"]
+
+
+@pytest.mark.asyncio
+async def test_hydrate_serves_repeat_lookups_from_cache(db_session):
+    movies = await add_movies(db_session, 2)
+    ids = [movie.id for movie in movies]
+    await hydrate_movies(db_session, ids)
+
+    await db_session.execute(text("DELETE FROM movies"))
+    await db_session.commit()
+
+    assert len(await hydrate_movies(db_session, ids)) == 2
@@ -1,4 +1,6 @@
 import pytest
+
+from app.services import movie_service
 from app.schemas.movie import MovieCreate, MovieUpdate
 from app.services.movie_service import (
     get_movie_by_id_service,
@@ -149,3 +151,38 @@ async def test_delete_movie_unauthorized(db_session, test_user):
 
     with pytest.raises(NotAuthorizedException):
         await delete_movie_service(movie.id, test_user.id, db_session)
+
+
+@pytest.fixture
+def fan_out(monkeypatch):
+    """Records what the after-write helpers send to search and autocomplete."""
+    sent = []
+
+    async def record(name, *args):
+        sent.append((name, *args))
+
+    monkeypatch.setattr(
+        movie_service, "queue_index_update", lambda i: record("index", i)
+    )
+    monkeypatch.setattr(
+        movie_service, "queue_index_removal", lambda i: record("unindex", i)
+    )
+    monkeypatch.setattr(
+        movie_service, "publish_title_change", lambda i, t: record("title", i, t)
+    )
+    return sent
+
+
+@pytest.mark.asyncio
+async def test_after_write_helpers_reach_search_and_autocomplete(fan_out):
+    await movie_service.after_movie_write(7, 8.0, "Recut", title_changed=False)
+    await movie_service.after_movie_write(7, 8.0, "New Title", title_changed=True)
+    await movie_service.after_movie_removal(7)
+
+    assert fan_out == [
+        ("index", 7),
+        ("index", 7),
+        ("title", 7, "New Title"),
+        ("unindex", 7),
+        ("title", 7, None),
+    ]
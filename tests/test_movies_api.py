@@ -1,5 +1,8 @@
+from email.utils import formatdate
+
 import pytest
 from app.core.security import create_access_token
+from app.models.movie import Movie
 
 
 @pytest.mark.asyncio
@@ -76,3 +79,77 @@ async def test_delete_movie_owner(authorized_client, test_user, db_session):
 
     del_res_again = await authorized_client.delete(f"/api/v1/movies/{movie_id}")
     assert del_res_again.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_read_movies_answers_conditional_request(client):
+    """A matching If-None-Match gets an empty 304 with the same validators."""
+    params = {"page": 1, "size": 10, "sort_by": "id", "order": "asc"}
+    first = await client.get("/api/v1/movies/", params=params)
+    etag = first.headers["etag"]
+
+    second = await client.get(
+        "/api/v1/movies/", params=params, headers={"If-None-Match": etag}
+    )
+
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["etag"] == etag
+    assert "must-revalidate" in second.headers["cache-control"]
+
+
+@pytest.mark.asyncio
+async def test_sparse_fieldsets(client, db_session):
+    """`fields` narrows listing and detail bodies; unknown names are rejected."""
+    movie = Movie(
+        title="Sparse",
+        slug="sparse",
+        description="",
+        video_url="",
+        thumbnail_url="",
+        release_year=2000,
+    )
+    db_session.add(movie)
+    await db_session.commit()
+    movie_id = movie.id
+
+    listing = await client.get(
+        "/api/v1/movies/", params={"fields": "title", "sort_by": "id"}
+    )
+    assert listing.json()["items"] == [{"id": movie_id, "title": "Sparse"}]
+
+    detail = await client.get(
+        f"/api/v1/movies/{movie_id}", params={"fields": "title,release_year"}
+    )
+    assert detail.json() == {"id": movie_id, "title": "Sparse", "release_year": 2000}
+    full = await client.get(f"/api/v1/movies/{movie_id}")
+    assert full.headers["etag"] != detail.headers["etag"]
+
+    bad = await client.get("/api/v1/movies/", params={"fields": "nope"})
+    assert bad.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_movie_detail_last_modified_is_updated_at(client, db_session):
+    movie = Movie(
+        title="Dated",
+        slug="dated",
+        description="",
+        video_url="",
+        thumbnail_url="",
+        release_year=2000,
+    )
+    db_session.add(movie)
+    await db_session.commit()
+    await db_session.refresh(movie)
+
+    response = await client.get(f"/api/v1/movies/{movie.id}")
+
+    assert response.headers["last-modified"] == formatdate(
+        movie.updated_at.timestamp(), usegmt=True
+    )
+    revalidated = await client.get(
+        f"/api/v1/movies/{movie.id}",
+        headers={"If-Modified-Since": response.headers["last-modified"]},
+    )
+    assert revalidated.status_code == 304
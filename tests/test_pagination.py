@@ -0,0 +1,37 @@
+import pytest
+from fastapi import HTTPException
+
+from app.core.pagination import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor("title", "asc", "Inception", 42, "next")
+
+    position = decode_cursor(cursor, "title", "asc")
+
+    assert position == {"value": "Inception", "id": 42, "direction": "next"}
+
+
+def test_cursor_keeps_float_sort_value_exact():
+    cursor = encode_cursor("rating", "desc", 7.333333333333333, 7, "prev")
+
+    position = decode_cursor(cursor, "rating", "desc")
+
+    assert position["value"] == 7.333333333333333
+    assert position["direction"] == "prev"
+
+
+def test_cursor_rejects_other_sort_order():
+    cursor = encode_cursor("title", "asc", "Inception", 42)
+
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor(cursor, "title", "desc")
+
+    assert exc.value.status_code == 400
+
+
+def test_cursor_rejects_garbage():
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor("not-a-cursor", "id", "asc")
+
+    assert exc.value.status_code == 400
@@ -0,0 +1,66 @@
+import pytest
+
+from app.models.movie import Movie
+
+
+async def add_movies(db_session, descriptions: dict[str, str]):
+    db_session.add_all(
+        Movie(
+            title=title,
+            slug=title.lower().replace(" ", "-"),
+            description=description,
+            video_url="",
+            thumbnail_url="",
+            release_year=2000,
+        )
+        for title, description in descriptions.items()
+    )
+    await db_session.commit()
+
+
+@pytest.mark.asyncio
+async def test_search_without_meili_ranks_in_postgres(client, db_session):
+    """With Meili unavailable, searches are answered by Postgres FTS."""
+    await add_movies(
+        db_session,
+        {
+            "Space Cowboys": "Old astronauts return to space for one last space job.",
+            "Desert Run": "A courier crosses the desert; space is mentioned once.",
+            "Kitchen Wars": "Two chefs feud over a restaurant.",
+        },
+    )
+
+    response = await client.get("/api/v1/movies/", params={"search_query": "space"})
+
+    data = response.json()
+    assert [item["title"] for item in data["items"]] == ["Space Cowboys", "Desert Run"]
+    assert data["total"] == 2
+    assert "<mark>space</mark>" in data["items"][0]["snippet"].lower()
+
+
+@pytest.mark.asyncio
+async def test_postgres_search_walks_relevance_cursor(client, db_session):
+    await add_movies(db_session, {f"Heist {i}": "heist " * (i + 1) for i in range(5)})
+    params = {"search_query": "heist", "size": 2}
+
+    titles, cursor = [], None
+    while True:
+        response = await client.get(
+            "/api/v1/movies/", params={**params, "cursor": cursor} if cursor else params
+        )
+        data = response.json()
+        titles += [item["title"] for item in data["items"]]
+        cursor = data["next_cursor"]
+        if not cursor:
+            break
+
+    assert titles == [f"Heist {i}" for i in reversed(range(5))]
+
+
+@pytest.mark.asyncio
+async def test_partial_words_fall_back_to_substring_match(client, db_session):
+    await add_movies(db_session, {"The Matrix": "A hacker learns the truth."})
+
+    response = await client.get("/api/v1/movies/", params={"search_query": "matr"})
+
+    assert [item["title"] for item in response.json()["items"]] == ["The Matrix"]
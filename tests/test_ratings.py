@@ -0,0 +1,165 @@
+import uuid
+
+import pytest
+from sqlalchemy import select, text
+
+from app.core.cache import RATING_NAMESPACES
+from app.models.movie import Movie
+from app.models.user import UserModel
+from app.repositories.rating_repository import RatingRepository
+from app.services import movie_service
+
+
+async def add_movie(db_session, slug: str = "movie") -> Movie:
+    movie = Movie(
+        title="Movie",
+        slug=slug,
+        description="",
+        video_url="",
+        thumbnail_url="",
+        release_year=2000,
+    )
+    db_session.add(movie)
+    await db_session.commit()
+    return movie
+
+
+async def add_users(db_session, count: int) -> list[UserModel]:
+    users = [
+        UserModel(
+            email=f"rater_{uuid.uuid4()}@example.com",
+            hashed_password="fakehashedpassword",
+            is_active=True,
+        )
+        for _ in range(count)
+    ]
+    db_session.add_all(users)
+    await db_session.commit()
+    return users
+
+
+async def stored_aggregates(db_session, movie_id: int) -> tuple[float, int]:
+    row = (
+        await db_session.execute(
+            select(Movie.average_rating, Movie.rating_count).where(Movie.id == movie_id)
+        )
+    ).one()
+    return row.average_rating, row.rating_count
+
+
+@pytest.mark.asyncio
+async def test_aggregates_follow_rate_rerate_and_delete(db_session):
+    movie = await add_movie(db_session)
+    alice, bob = await add_users(db_session, 2)
+    repo = RatingRepository(db_session)
+
+    await repo.create_rating(alice.id, movie.id, 8)
+    bobs = await repo.create_rating(bob.id, movie.id, 4)
+    assert await stored_aggregates(db_session, movie.id) == (6.0, 2)
+
+    await repo.update_rating(bobs, 10)
+    assert await stored_aggregates(db_session, movie.id) == (9.0, 2)
+
+    await repo.delete_rating(bobs)
+    assert await stored_aggregates(db_session, movie.id) == (8.0, 1)
+
+    await repo.delete_rating(await repo.get_rating(alice.id, movie.id))
+    assert await stored_aggregates(db_session, movie.id) == (0.0, 0)
+
+
+@pytest.mark.asyncio
+async def test_movie_loaded_in_session_sees_new_aggregates(db_session):
+    movie = await add_movie(db_session)
+    (user,) = await add_users(db_session, 1)
+    loaded = await db_session.get(Movie, movie.id)
+    assert (loaded.average_rating, loaded.rating_count) == (0.0, 0)
+
+    def aggregates(_):
+        # Plain attribute access; reloads only what the repository expired.
+        return loaded.average_rating, loaded.rating_count
+
+    repo = RatingRepository(db_session)
+    rating = await repo.create_rating(user.id, movie.id, 7)
+    assert await db_session.run_sync(aggregates) == (7.0, 1)
+
+    await repo.update_rating(rating, 3)
+    assert await db_session.run_sync(aggregates) == (3.0, 1)
+
+    await repo.delete_rating(rating)
+    assert await db_session.run_sync(aggregates) == (0.0, 0)
+
+
+@pytest.fixture
+def rating_fan_out(monkeypatch):
+    """Records the cache, ordering and search side effects of a rating fix."""
+    sent = []
+
+    async def record(name, *args):
+        sent.append((name, *args))
+
+    monkeypatch.setattr(
+        movie_service,
+        "invalidate_movie_cache",
+        lambda *namespaces: record("generations", *namespaces),
+    )
+    monkeypatch.setattr(
+        movie_service,
+        "invalidate_movie_entities",
+        lambda *ids: record("entities", *sorted(ids)),
+    )
+    monkeypatch.setattr(
+        movie_service,
+        "update_ordering_indexes",
+        lambda i, rating: record("ordering", i, rating),
+    )
+    monkeypatch.setattr(
+        movie_service, "queue_index_update", lambda i: record("index", i)
+    )
+    return sent
+
+
+@pytest.mark.asyncio
+async def test_reconcile_repairs_drift_and_refreshes_derived_state(
+    db_session, rating_fan_out
+):
+    drifted = await add_movie(db_session, "drifted")
+    phantom = await add_movie(db_session, "phantom")
+    intact = await add_movie(db_session, "intact")
+    alice, bob = await add_users(db_session, 2)
+    repo = RatingRepository(db_session)
+    await repo.create_rating(alice.id, drifted.id, 9)
+    await repo.create_rating(bob.id, drifted.id, 5)
+    await repo.create_rating(alice.id, intact.id, 6)
+
+    # Writes that bypassed the repository.
+    await db_session.execute(
+        text("UPDATE movies SET average_rating = 2.5, rating_count = 1 WHERE id = :id"),
+        {"id": drifted.id},
+    )
+    await db_session.execute(
+        text("UPDATE movies SET average_rating = 8.0, rating_count = 3 WHERE id = :id"),
+        {"id": phantom.id},
+    )
+    await db_session.commit()
+
+    repaired = await movie_service.reconcile_rating_aggregates_service(db_session)
+
+    assert repaired == 2
+    assert await stored_aggregates(db_session, drifted.id) == (7.0, 2)
+    assert await stored_aggregates(db_session, phantom.id) == (0.0, 0)
+    assert await stored_aggregates(db_session, intact.id) == (6.0, 1)
+
+    repaired_ids = sorted([drifted.id, phantom.id])
+    ratings = {drifted.id: 7.0, phantom.id: 0.0}
+    assert rating_fan_out[:2] == [
+        ("generations", *RATING_NAMESPACES),
+        ("entities", *repaired_ids),
+    ]
+    assert sorted(rating_fan_out[2:]) == sorted(
+        [("ordering", i, ratings[i]) for i in repaired_ids]
+        + [("index", i) for i in repaired_ids]
+    )
+
+    rating_fan_out.clear()
+    assert await movie_service.reconcile_rating_aggregates_service(db_session) == 0
+    assert rating_fan_out == []
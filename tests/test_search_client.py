@@ -0,0 +1,390 @@
+import httpx
+import orjson
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import selectinload
+
+from app.core import search
+from app.services import search_service
+from app.core.config import settings
+from app.core.search import SearchClient, SearchError
+from app.core.celery_app import celery_app
+from app.core.redis import get_redis_client
+from app.models.movie import Movie
+from app.services.hybrid_search_service import _lexical_ids
+from app.services.search_service import (
+    CONSISTENCY_REPORT_KEY,
+    FLUSHING_INDEX_KEY,
+    PENDING_INDEX_KEY,
+    POPULAR_SEARCHES_KEY,
+    check_index_consistency,
+    flush_index_queue,
+    normalize_query,
+    queue_index_removal,
+    queue_index_update,
+    reindex_movies,
+    search_movies_in_meili,
+    warm_popular_searches,
+)
+
+
+@pytest.fixture
+def meili(monkeypatch):
+    """Points the search client at an in-process fake Meili."""
+    monkeypatch.setattr(settings, "MEILI_HOST", "http://meili.test")
+    monkeypatch.setattr(search, "RETRY_BACKOFF_SECONDS", 0)
+    monkeypatch.setattr(SearchClient, "_client", None)
+    monkeypatch.setattr(celery_app, "send_task", lambda *args, **kwargs: None)
+    calls = []
+
+    def use(handler):
+        def record(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            return handler(request)
+
+        client = SearchClient.get_client()
+        client._http = httpx.AsyncClient(
+            base_url="http://meili.test", transport=httpx.MockTransport(record)
+        )
+        return calls
+
+    return use
+
+
+@pytest.mark.asyncio
+async def test_search_retries_unavailable_meili(meili):
+    responses = iter(
+        [
+            httpx.Response(503),
+            httpx.Response(200, json={"hits": [{"id": 3}], "estimatedTotalHits": 1}),
+        ]
+    )
+    calls = meili(lambda request: next(responses))
+
+    assert await search_movies_in_meili("matrix") == {"ids": [3], "total": 1}
+    assert len(calls) == 2
+    assert calls[0].url.path == "/indexes/movies/search"
+
+
+@pytest.mark.asyncio
+async def test_search_gives_up_after_retries(meili):
+    def refuse(request):
+        raise httpx.ConnectError("connection refused", request=request)
+
+    calls = meili(refuse)
+
+    with pytest.raises(SearchError):
+        await SearchClient.get_client().search("movies", "matrix", {})
+    assert len(calls) == settings.MEILI_RETRIES + 1
+    assert await search_movies_in_meili("matrix") is None
+
+
+@pytest.mark.asyncio
+async def test_client_errors_are_not_retried(meili):
+    calls = meili(lambda request: httpx.Response(400, json={"code": "bad_filter"}))
+
+    with pytest.raises(SearchError):
+        await SearchClient.get_client().search("movies", "matrix", {})
+    assert len(calls) == 1
+
+
+def test_normalize_query():
+    assert normalize_query("  The  MATRIX!! ") == "the matrix"
+    assert normalize_query("Amélie, (2001)") == "amélie 2001"
+
+
+@pytest.mark.asyncio
+async def test_near_identical_searches_share_a_cache_entry(meili):
+    calls = meili(lambda request: httpx.Response(200, json={"hits": [{"id": 1}]}))
+
+    await search_movies_in_meili("The Matrix")
+    assert await search_movies_in_meili("  the matrix!") == {"ids": [1], "total": 0}
+
+    assert len(calls) == 1
+    assert orjson.loads(calls[0].content)["q"] == "the matrix"
+
+
+@pytest.mark.asyncio
+async def test_index_writes_invalidate_search_results(meili, db_session):
+    calls = meili(lambda request: httpx.Response(200, json={"hits": []}))
+
+    await search_movies_in_meili("matrix")
+    await queue_index_removal(1)
+    await flush_index_queue(db_session)
+    await search_movies_in_meili("matrix")
+
+    searches = [call for call in calls if call.url.path.endswith("/search")]
+    assert len(searches) == 2
+
+
+@pytest.mark.asyncio
+async def test_warmer_refreshes_popular_searches(meili):
+    calls = meili(lambda request: httpx.Response(200, json={"hits": []}))
+    for query in ["matrix", "Matrix", "alien"]:
+        await search_movies_in_meili(query)
+    calls.clear()
+
+    assert await warm_popular_searches() == 2
+    assert sorted(orjson.loads(call.content)["q"] for call in calls) == [
+        "alien",
+        "matrix",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_hybrid_lexical_leg_is_not_a_popular_search(meili):
+    meili(lambda request: httpx.Response(200, json={"hits": [{"id": 3}]}))
+
+    assert await _lexical_ids("matrix", 50) == [3]
+
+    async with get_redis_client() as redis:
+        assert not await redis.exists(POPULAR_SEARCHES_KEY)
+
+
+@pytest.mark.asyncio
+async def test_index_writes_are_coalesced_and_batched(meili, db_session, monkeypatch):
+    scheduled = []
+    monkeypatch.setattr(
+        celery_app, "send_task", lambda name, **kwargs: scheduled.append(name)
+    )
+    calls = meili(lambda request: httpx.Response(202, json={"taskUid": 1}))
+    movie = Movie(
+        title="Alien",
+        slug="alien",
+        description="",
+        video_url="",
+        thumbnail_url="",
+        release_year=1979,
+    )
+    db_session.add(movie)
+    await db_session.commit()
+
+    for _ in range(3):
+        await queue_index_update(movie.id)
+    await queue_index_update(999_999)  # deleted before the flush
+    await queue_index_removal(42)
+
+    assert scheduled == ["flush_search_index"]
+    assert await flush_index_queue(db_session) == (1, 2)
+
+    (upload,) = [call for call in calls if call.url.path.endswith("/documents")]
+    (removal,) = [call for call in calls if call.url.path.endswith("/delete-batch")]
+    assert [doc["title"] for doc in orjson.loads(upload.content)] == ["Alien"]
+    assert orjson.loads(removal.content) == [42, 999_999]
+    async with get_redis_client() as redis:
+        assert not await redis.exists(PENDING_INDEX_KEY, FLUSHING_INDEX_KEY)
+
+
+@pytest.mark.asyncio
+async def test_queueing_index_writes_opens_no_client(meili):
+    """Write paths run in Celery tasks too; only the flush talks to Meili."""
+    await queue_index_update(7)
+
+    assert SearchClient._client is None
+    async with get_redis_client() as redis:
+        assert await redis.hgetall(PENDING_INDEX_KEY) == {"7": "upsert"}
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_writes_for_the_retry(meili, db_session):
+    meili(lambda request: httpx.Response(400))
+    await queue_index_removal(7)
+
+    with pytest.raises(SearchError):
+        await flush_index_queue(db_session)
+
+    calls = meili(lambda request: httpx.Response(202, json={"taskUid": 1}))
+    assert await flush_index_queue(db_session) == (0, 1)
+    assert orjson.loads(calls[-1].content) == [7]
+
+
+def new_movie(i: int) -> Movie:
+    return Movie(
+        title=f"Movie {i}",
+        slug=f"movie-{i}",
+        description="",
+        video_url="",
+        thumbnail_url="",
+        release_year=2000,
+    )
+
+
+@pytest.mark.asyncio
+async def test_incremental_reindex_only_sends_changed_movies(
+    meili, db_session, monkeypatch
+):
+    monkeypatch.setattr(search_service, "REINDEX_BATCH_SIZE", 2)
+    calls = meili(lambda request: httpx.Response(202, json={"taskUid": 1}))
+    db_session.add_all(new_movie(i) for i in range(5))
+    await db_session.commit()
+
+    assert await reindex_movies(db_session) == 5
+    assert len(calls) == 3  # batches of 2, 2 and 1
+
+    # Everything is older than the watermark minus the overlap now.
+    await db_session.execute(
+        text("UPDATE movies SET updated_at = now() - interval '1 hour'")
+    )
+    await db_session.execute(
+        text("UPDATE movies SET updated_at = now() WHERE slug = 'movie-3'")
+    )
+    await db_session.commit()
+    calls.clear()
+
+    assert await reindex_movies(db_session) == 1
+    assert [doc["slug"] for doc in orjson.loads(calls[0].content)] == ["movie-3"]
+
+
+@pytest.mark.asyncio
+async def test_full_reindex_builds_a_shadow_index_and_swaps_it(meili, db_session):
+    calls = meili(lambda request: httpx.Response(202, json={"taskUid": 1}))
+    db_session.add_all(new_movie(i) for i in range(3))
+    await db_session.commit()
+
+    assert await reindex_movies(db_session, full=True) == 3
+
+    steps = [(call.method, call.url.path) for call in calls]
+    assert steps == [
+        ("DELETE", "/indexes/movies_rebuild"),
+        ("POST", "/indexes"),
+        ("PATCH", "/indexes/movies_rebuild/settings"),
+        ("POST", "/indexes/movies_rebuild/documents"),
+        ("POST", "/indexes"),
+        ("POST", "/swap-indexes"),
+        ("DELETE", "/indexes/movies_rebuild"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_listing_pushes_filters_and_facets_to_meili(meili, client):
+    calls = meili(
+        lambda request: httpx.Response(
+            200,
+            json={
+                "hits": [],
+                "estimatedTotalHits": 0,
+                "facetDistribution": {
+                    "genres": {"Drama": 4, "Noir": 1},
+                    "release_year": {"1999": 5},
+                    "rating": {"7.5": 5},
+                },
+                "facetStats": {"rating": {"min": 7.5, "max": 7.5}},
+            },
+        )
+    )
+
+    response = await client.get(
+        "/api/v1/movies/",
+        params={
+            "search_query": "heist",
+            "genre": ["Noir", 'Film "Noir"'],
+            "year_from": 1990,
+            "min_rating": 7,
+            "include_facets": True,
+        },
+    )
+
+    sent = orjson.loads(calls[0].content)
+    assert sent["filter"] == (
+        'genres IN ["Film \\"Noir\\"", "Noir"] AND release_year >= 1990 '
+        "AND rating >= 7.0"
+    )
+    assert sent["facets"] == ["genres", "release_year", "rating"]
+    assert response.json()["facets"] == {
+        "genres": {"Drama": 4, "Noir": 1},
+        "release_year": {"1999": 5},
+        "rating": {"min": 7.5, "max": 7.5},
+    }
+
+
+def fetch_from(index: dict[int, str | None]):
+    """
+    A fake documents/fetch over `index` (id -> content_hash). Settings
+    updates are accepted as task 1, which has already succeeded.
+    """
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/settings"):
+            return httpx.Response(202, json={"taskUid": 1})
+        if request.url.path == "/tasks/1":
+            return httpx.Response(200, json={"uid": 1, "status": "succeeded"})
+        params = orjson.loads(request.content)
+        ids = sorted(index)
+        for clause in filter(None, params.get("filter", "").split(" AND ")):
+            _, op, value = clause.split()
+            bound = int(value)
+            ids = [i for i in ids if (i > bound if op == ">" else i <= bound)]
+        page = ids[params["offset"] : params["offset"] + params["limit"]]
+        results = [{"id": i, "content_hash": index[i]} for i in page]
+        return httpx.Response(200, json={"results": results, "total": len(ids)})
+
+    return handler
+
+
+@pytest.mark.asyncio
+async def test_consistency_check_queues_only_the_drift(meili, db_session, monkeypatch):
+    monkeypatch.setattr(search_service, "CONSISTENCY_BATCH_SIZE", 2)
+    movies = [new_movie(i) for i in range(5)]
+    db_session.add_all(movies)
+    await db_session.commit()
+    await db_session.delete(movies[2])
+    await db_session.commit()
+    a, b, _, d, e = sorted(movie.id for movie in movies)
+    deleted = movies[2].id
+
+    async def hash_of(movie_id):
+        movie = await db_session.get(
+            Movie,
+            movie_id,
+            options=[selectinload(Movie.genres)],
+            populate_existing=True,
+        )
+        return search_service._search_document(movie)["content_hash"]
+
+    index = {
+        a: await hash_of(a),
+        b: "outdated",  # edited without reaching the index
+        deleted: "x",  # deleted without reaching the index
+        e: None,  # indexed before documents carried a hash
+        e + 100: "y",  # past the last movie
+    }  # d was never indexed
+    calls = meili(fetch_from(index))
+
+    report = await check_index_consistency(db_session, repair=False)
+
+    assert report == {"checked": 4, "missing": 1, "stale": 2, "orphaned": 2}
+    async with get_redis_client() as redis:
+        assert not await redis.exists(PENDING_INDEX_KEY)
+        assert orjson.loads(await redis.get(CONSISTENCY_REPORT_KEY))["stale"] == 2
+
+    calls.clear()
+    await check_index_consistency(db_session)
+
+    async with get_redis_client() as redis:
+        assert await redis.hgetall(PENDING_INDEX_KEY) == {
+            str(b): "upsert",
+            str(d): "upsert",
+            str(e): "upsert",
+            str(deleted): "delete",
+            str(e + 100): "delete",
+        }
+    assert [call.url.path for call in calls[:2]] == [
+        "/indexes/movies/settings",
+        "/tasks/1",
+    ]
+    assert "id" in orjson.loads(calls[0].content)["filterableAttributes"]
+    assert {call.url.path for call in calls[2:]} == {"/indexes/movies/documents/fetch"}
+
+
+@pytest.mark.asyncio
+async def test_consistency_check_stops_when_settings_fail(meili, db_session):
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/settings"):
+            return httpx.Response(202, json={"taskUid": 7})
+        return httpx.Response(200, json={"uid": 7, "status": "failed"})
+
+    calls = meili(handler)
+
+    with pytest.raises(SearchError):
+        await check_index_consistency(db_session)
+    assert not [call for call in calls if call.url.path.endswith("/fetch")]
@@ -0,0 +1,41 @@
+import orjson
+import pytest
+
+from app.models.movie import Movie
+from app.schemas.movie import MovieResponse
+from app.services.watchlist_service import (
+    get_user_watchlist_service,
+    toggle_watchlist_service,
+)
+
+
+@pytest.mark.asyncio
+async def test_watchlist_encodes_full_and_projected_movies(db_session, test_user):
+    movies = [
+        Movie(
+            title=f"Movie {i}",
+            slug=f"movie-{i}",
+            description="",
+            video_url="",
+            thumbnail_url="",
+            release_year=2000,
+        )
+        for i in range(2)
+    ]
+    db_session.add_all(movies)
+    await db_session.commit()
+    for movie in movies:
+        await toggle_watchlist_service(test_user.id, movie.id, db_session)
+
+    full = orjson.loads(
+        await get_user_watchlist_service(test_user.id, 1, 10, db_session)
+    )
+    projected = orjson.loads(
+        await get_user_watchlist_service(
+            test_user.id, 1, 10, db_session, fields=frozenset({"id", "title"})
+        )
+    )
+
+    assert len(full) == 2
+    assert all(movie.keys() == MovieResponse.model_fields.keys() for movie in full)
+    assert projected == [{"id": movie["id"], "title": movie["title"]} for movie in full]